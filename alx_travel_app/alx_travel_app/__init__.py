@@ -1,3 +1,13 @@
-from listings.celery import app as celery_app
+# The Celery app is created on first use rather than on import, so web
+# workers and management commands that never publish a task do not load
+# the broker stack. The celery CLI (-A alx_travel_app) imports
+# alx_travel_app.celery directly.
 
 __all__ = ("celery_app",)
+
+
+def __getattr__(name):
+    if name == "celery_app":
+        from .celery import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,5 @@
 import os
-from alx_travel_app.listings.celery import Celery
+from celery import Celery
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "alx_travel_app.settings")
 
@@ -0,0 +1,39 @@
+"""
+API documentation URLs: drf_yasg Swagger/ReDoc and the drf_spectacular schema.
+
+Included from the root URLconf only when settings.API_DOCS is on, so
+production workers never import either schema generator.
+"""
+from django.urls import path, re_path
+from rest_framework import permissions
+from drf_yasg.views import get_schema_view
+from drf_yasg import openapi
+from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+# Swagger/OpenAPI schema configuration
+schema_view = get_schema_view(
+    openapi.Info(
+        title="ALX Travel App API",
+        default_version='v1',
+        description="API documentation for ALX Travel App - A comprehensive travel listing platform",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="contact@alxtravelapp.com"),
+        license=openapi.License(name="MIT License"),
+    ),
+    public=True,
+    permission_classes=[permissions.AllowAny],
+)
+
+urlpatterns = [
+    # Swagger/OpenAPI Documentation
+    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+
+    # Alternative swagger paths
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+
+    # Swagger URLs
+    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+]
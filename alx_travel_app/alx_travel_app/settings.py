@@ -37,13 +37,18 @@ INSTALLED_APPS = [
     # Third-party apps
     'rest_framework',
     'corsheaders',
-    'drf_yasg',
-    'drf_spectacular',
     
     # Local apps
     'listings',
 ]
 
+# API documentation (drf_yasg Swagger/ReDoc and the drf_spectacular schema).
+# Off by default in production: both schema stacks add import time to every
+# worker cold start and are not needed to serve the API.
+API_DOCS = env.bool('API_DOCS', default=DEBUG)
+if API_DOCS:
+    INSTALLED_APPS += ['drf_yasg', 'drf_spectacular']
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -146,8 +151,9 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ],
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
+if API_DOCS:
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'drf_spectacular.openapi.AutoSchema'
 
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
@@ -200,6 +206,92 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Task queues: payment notifications never wait behind bulk email or
+# maintenance jobs. Run one worker per queue (see README) so each gets its
+# own concurrency and prefetch; unrouted tasks land on 'bulk'.
+CELERY_TASK_QUEUES = {
+    name: {'exchange': name, 'routing_key': name}
+    for name in ('critical', 'bulk', 'maintenance')
+}
+CELERY_TASK_DEFAULT_QUEUE = 'bulk'
+CELERY_TASK_ROUTES = {
+    'listings.tasks.send_payment_confirmation_email': {'queue': 'critical'},
+    'listings.tasks.process_payment_webhook': {'queue': 'critical'},
+    'listings.tasks.send_booking_confirmation_email': {'queue': 'bulk'},
+    'listings.tasks.flush_email_queue': {'queue': 'bulk'},
+    'listings.tasks.reconcile_pending_payments': {'queue': 'maintenance'},
+    'listings.tasks.flush_listing_view_counts': {'queue': 'maintenance'},
+}
+# Reserve one message per process by default; the bulk worker raises this
+# with --prefetch-multiplier since its tasks are short
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int('CELERY_WORKER_PREFETCH_MULTIPLIER', default=1)
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-pending-payments': {
+        'task': 'listings.tasks.reconcile_pending_payments',
+        'schedule': 300.0,
+    },
+    'flush-listing-view-counts': {
+        'task': 'listings.tasks.flush_listing_view_counts',
+        'schedule': 60.0,
+    },
+}
+
+# Cache: Redis when REDIS_CACHE_URL is set, otherwise a per-process
+# local-memory cache that is only suitable for development and tests
+REDIS_CACHE_URL = env('REDIS_CACHE_URL', default='')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'alx_travel',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Cached listing, category and location detail responses
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300)
+
+# Buffered listing view counts; without Redis every view is written straight
+# to the database
+VIEW_COUNTER_REDIS_URL = env('VIEW_COUNTER_REDIS_URL', default=REDIS_CACHE_URL)
+VIEW_COUNTER_FLUSH_BATCH_SIZE = env.int('VIEW_COUNTER_FLUSH_BATCH_SIZE', default=500)
+
+# Batched confirmation emails; without a Redis queue each email is sent
+# as soon as its task runs
+EMAIL_QUEUE_REDIS_URL = env('EMAIL_QUEUE_REDIS_URL', default=REDIS_CACHE_URL)
+EMAIL_BATCH_SIZE = env.int('EMAIL_BATCH_SIZE', default=100)
+EMAIL_BATCH_WINDOW = env.float('EMAIL_BATCH_WINDOW', default=5.0)
+CELERY_BEAT_SCHEDULE['flush-email-queue'] = {
+    'task': 'listings.tasks.flush_email_queue',
+    'schedule': EMAIL_BATCH_WINDOW,
+}
+
+# Transactional outbox relay (python manage.py relay_outbox)
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=100)
+OUTBOX_POLL_INTERVAL = env.float('OUTBOX_POLL_INTERVAL', default=1.0)
+OUTBOX_RETENTION = env.int('OUTBOX_RETENTION', default=86400)
+
+# Pending payment reconciliation
+PAYMENT_RECONCILE_BATCH_SIZE = env.int('PAYMENT_RECONCILE_BATCH_SIZE', default=200)
+PAYMENT_RECONCILE_CONCURRENCY = env.int('PAYMENT_RECONCILE_CONCURRENCY', default=10)
+PAYMENT_RECONCILE_MIN_AGE = env.int('PAYMENT_RECONCILE_MIN_AGE', default=120)
+
+# Chapa payment gateway
+CHAPA_SECRET_KEY = env('CHAPA_SECRET_KEY', default='')
+CHAPA_PUBLIC_KEY = env('CHAPA_PUBLIC_KEY', default='')
+CHAPA_BASE_URL = env('CHAPA_BASE_URL', default='https://api.chapa.co/v1/')
+CHAPA_CONNECT_TIMEOUT = env.float('CHAPA_CONNECT_TIMEOUT', default=3.05)
+CHAPA_READ_TIMEOUT = env.float('CHAPA_READ_TIMEOUT', default=30)
+CHAPA_POOL_MAXSIZE = env.int('CHAPA_POOL_MAXSIZE', default=20)
+CHAPA_MAX_RETRIES = env.int('CHAPA_MAX_RETRIES', default=3)
+CHAPA_RETRY_BACKOFF = env.float('CHAPA_RETRY_BACKOFF', default=0.3)
+
 # Logging configuration
 LOGGING = {
     'version': 1,
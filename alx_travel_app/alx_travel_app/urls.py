@@ -15,50 +15,32 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include, re_path
+from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from django.urls import path, include
-
-# Swagger/OpenAPI schema configuration
-schema_view = get_schema_view(
-    openapi.Info(
-        title="ALX Travel App API",
-        default_version='v1',
-        description="API documentation for ALX Travel App - A comprehensive travel listing platform",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@alxtravelapp.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
 
 def api_root(request):
     """
     API root endpoint that provides information about available endpoints
     """
-    return JsonResponse({
+    data = {
         'message': 'Welcome to ALX Travel App API',
         'version': 'v1',
         'endpoints': {
             'admin': '/admin/',
             'api': '/api/',
-            'swagger': '/swagger/',
-            'redoc': '/redoc/',
             'listings': '/api/listings/',
         },
-        'documentation': {
+    }
+    if settings.API_DOCS:
+        data['endpoints'].update(swagger='/swagger/', redoc='/redoc/')
+        data['documentation'] = {
             'swagger_ui': '/swagger/',
             'redoc': '/redoc/',
             'schema': '/swagger.json',
         }
-    })
+    return JsonResponse(data)
 
 urlpatterns = [
     # Admin interface
@@ -72,20 +54,13 @@ urlpatterns = [
     
     # Authentication endpoints (Django REST Framework)
     path('api-auth/', include('rest_framework.urls')),
-    
-    # Swagger/OpenAPI Documentation
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    
-    # Alternative swagger paths
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-
-    # Swagger URLs
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 ]
 
+# API documentation; off in production (settings.API_DOCS) so web workers
+# never import drf_yasg or drf_spectacular
+if settings.API_DOCS:
+    urlpatterns += [path('', include('alx_travel_app.docs_urls'))]
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,112 @@
+# benchmarks/_chapa_stub.py
+
+"""
+A local stand-in for the Chapa API used by the payment benchmarks.
+
+It speaks HTTP/1.1 with keep-alive, answers the initialize and verify
+endpoints with canned success payloads, can delay every response to
+simulate a slow gateway, and counts the TCP connections it accepts.
+"""
+
+import json
+import multiprocessing
+import socket
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ChapaStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; without NODELAY,
+        # Nagle plus delayed ACKs add ~40 ms to every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.stats_lock:
+            self.server.requests += 1
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        tx_ref = payload.get('tx_ref', '')
+        self.send_json({
+            'status': 'success',
+            'message': 'Hosted Link',
+            'data': {'checkout_url': f'https://checkout.chapa.test/{tx_ref}', 'reference': f'ref_{tx_ref}'},
+        })
+
+    def do_GET(self):
+        tx_ref = self.path.rstrip('/').rsplit('/', 1)[-1]
+        self.send_json({
+            'status': 'success',
+            'message': 'Payment details',
+            'data': {'status': 'success', 'tx_ref': tx_ref, 'method': 'card'},
+        })
+
+
+class ChapaStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, certfile=None, keyfile=None):
+        super().__init__((host, port), ChapaStubHandler)
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.stats_lock = threading.Lock()
+        self.scheme = 'http'
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+            self.scheme = 'https'
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'{self.scheme}://{host}:{port}/v1/'
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.connections = 0
+            self.requests = 0
+
+
+def _serve(queue, latency):
+    server = ChapaStubServer(latency=latency)
+    queue.put(server.base_url)
+    server.serve_forever()
+
+
+def start_in_subprocess(latency=0.0):
+    """
+    Run the stub in its own process so it does not compete with the
+    client under test for the GIL. Returns (process, base_url).
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(queue, latency), daemon=True)
+    process.start()
+    return process, queue.get(timeout=10)
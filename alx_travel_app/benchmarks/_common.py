@@ -0,0 +1,76 @@
+# benchmarks/_common.py
+
+"""
+Shared helpers for the benchmark scripts.
+
+Run every script from the project directory (the one containing
+``listings/``), e.g. ``python benchmarks/bench_search.py --help``.
+The scripts use whatever database ``DJANGO_SETTINGS_MODULE`` points at.
+"""
+
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Configure Django so benchmark scripts can use the ORM"""
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alx_travel_app.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """
+    Run the block against a throwaway test database, created and
+    destroyed the same way the test runner does it
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer(samples):
+    """Append the elapsed wall time of the block, in milliseconds, to samples"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(label, samples):
+    """Return a one-line latency summary for a list of millisecond samples"""
+    return (
+        f"{label}: n={len(samples)} "
+        f"mean={statistics.fmean(samples):.2f}ms "
+        f"p50={percentile(samples, 50):.2f}ms "
+        f"p95={percentile(samples, 95):.2f}ms "
+        f"p99={percentile(samples, 99):.2f}ms "
+        f"max={max(samples):.2f}ms"
+    )
@@ -0,0 +1,93 @@
+# benchmarks/bench_amenity_filter.py
+
+"""
+Compare multi-amenity filters on the amenities text and amenity_flags.
+
+    python benchmarks/bench_amenity_filter.py --listings 1000000
+
+Runs in a throwaway test database. Listings are bulk-inserted with 3-8
+amenities from Listing.AMENITIES (bulk_create skips save(), so flags
+start at zero), amenity_flags is then filled by AmenityService.backfill,
+and each filter is timed as a count and as a first page of 20 with both
+the legacy icontains chain and the bitmask filter.
+"""
+
+import argparse
+import random
+import sys
+import uuid
+
+from _common import setup_django, summarize, test_database, timer
+
+FILTERS = [
+    ['Pool'],
+    ['Pool', 'WiFi'],
+    ['Hot Tub', 'Beach Access', 'Pet Friendly'],
+]
+
+
+def create_listings(count, batch_size=10000):
+    from django.contrib.auth.models import User
+    from listings.models import Category, Listing, Location
+
+    rng = random.Random(42)
+    host = User.objects.create_user(username='bench')
+    category = Category.objects.create(name='Bench', slug='bench')
+    location = Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench')
+    for start in range(0, count, batch_size):
+        Listing.objects.bulk_create([
+            Listing(
+                id=uuid.UUID(int=rng.getrandbits(128)), title=f'Listing {index}', description='Benchmark',
+                listing_type='apartment', status='published', host=host, category=category,
+                location=location, price_per_night=100, slug=f'listing-{index}',
+                amenities=', '.join(rng.sample(Listing.AMENITIES, rng.randint(3, 8))),
+            )
+            for index in range(start, min(start + batch_size, count))
+        ])
+
+
+def legacy_filter(queryset, names):
+    for name in names:
+        queryset = queryset.filter(amenities__icontains=name)
+    return queryset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listings', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from listings.models import Listing
+    from listings.services.amenity_service import AmenityService
+
+    with test_database():
+        with timer(build := []):
+            create_listings(args.listings)
+        print(f"inserted {args.listings} listings in {build[0] / 1000:.1f}s")
+        with timer(backfill := []):
+            updated = AmenityService.backfill(batch_size=10000)
+        print(f"backfilled amenity flags for {updated} listings in {backfill[0] / 1000:.1f}s")
+
+        published = Listing.objects.filter(status='published')
+        for names in FILTERS:
+            variants = [
+                ('legacy icontains', lambda: legacy_filter(published, names)),
+                ('amenity flags', lambda: AmenityService.filter_listings(published, names)),
+            ]
+            print(f"\n{' + '.join(names)}")
+            for label, build_queryset in variants:
+                counts, pages = [], []
+                for _ in range(args.repeat):
+                    with timer(counts):
+                        matches = build_queryset().count()
+                    with timer(pages):
+                        list(build_queryset().order_by('-created_at')[:20])
+                print(summarize(f"  {label} count ({matches} rows)", counts))
+                print(summarize(f"  {label} first page", pages))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
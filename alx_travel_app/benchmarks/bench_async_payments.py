@@ -0,0 +1,100 @@
+# benchmarks/bench_async_payments.py
+
+"""
+Load test: sync vs async Chapa verification against a slow gateway.
+
+    python benchmarks/bench_async_payments.py --latency 0.5 --requests 400
+
+A local stub Chapa server delays every response by --latency seconds.
+The sync run models a WSGI deployment: --threads worker threads each
+block on ChapaPaymentService until the gateway answers. The async run
+models one ASGI worker: a single event loop serving --concurrency
+in-flight requests through AsyncChapaPaymentService.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _chapa_stub import start_in_subprocess
+from _common import PROJECT_DIR, summarize
+
+
+def configure(base_url, pool_size):
+    from django.conf import settings
+    settings.configure(
+        CHAPA_BASE_URL=base_url,
+        CHAPA_SECRET_KEY='bench-secret',
+        CHAPA_POOL_MAXSIZE=pool_size,
+        CHAPA_ASYNC_POOL_MAXSIZE=pool_size,
+    )
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+
+
+def run_sync(count, threads):
+    from listings.services.payment_service import ChapaPaymentService
+    samples = []
+
+    def one(index):
+        start = time.perf_counter()
+        assert ChapaPaymentService().verify_payment(f'sync_{index}')['success']
+        samples.append((time.perf_counter() - start) * 1000)
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(count)))
+    return samples, time.perf_counter() - began
+
+
+async def run_async(count, concurrency):
+    from listings.services.async_payment_service import AsyncChapaPaymentService, get_client
+    samples = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with limit:
+            start = time.perf_counter()
+            result = await AsyncChapaPaymentService().verify_payment(f'async_{index}')
+            assert result['success']
+            samples.append((time.perf_counter() - start) * 1000)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(count)))
+    elapsed = time.perf_counter() - began
+    await get_client().close()
+    return samples, elapsed
+
+
+def report(label, count, samples, elapsed):
+    print(summarize(label, samples))
+    print(f"  throughput {count / elapsed:.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=400, help='verify calls per run')
+    parser.add_argument('--latency', type=float, default=0.5, help='gateway delay in seconds')
+    parser.add_argument('--threads', type=int, default=8, help='sync worker threads')
+    parser.add_argument('--concurrency', type=int, default=200, help='in-flight async requests')
+    args = parser.parse_args()
+
+    stub, base_url = start_in_subprocess(latency=args.latency)
+    configure(base_url, max(args.threads, args.concurrency))
+    print(f"Stub Chapa at {base_url} with {args.latency * 1000:.0f}ms latency")
+
+    samples, sync_elapsed = run_sync(args.requests, args.threads)
+    report(f'sync ({args.threads} threads)', args.requests, samples, sync_elapsed)
+
+    samples, async_elapsed = asyncio.run(run_async(args.requests, args.concurrency))
+    report(f'async ({args.concurrency} in flight, 1 thread)', args.requests, samples, async_elapsed)
+
+    print(f"Async throughput is {sync_elapsed / async_elapsed:.1f}x the sync worker pool")
+    stub.terminate()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# benchmarks/bench_chapa_client.py
+
+"""
+Compare per-call connections with the pooled keep-alive Chapa session.
+
+    python benchmarks/bench_chapa_client.py --calls 500 --concurrency 8
+
+A local stub Chapa server is started automatically. Pass --certfile and
+--keyfile (e.g. a self-signed pair from ``openssl req -x509 ...``) to
+serve over TLS, where avoiding the handshake matters most.
+
+The baseline issues module-level ``requests.get``/``requests.post``
+calls exactly as the service did before pooling; the pooled run goes
+through ChapaPaymentService.
+"""
+
+import argparse
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import urllib3
+
+from _chapa_stub import ChapaStubServer
+from _common import PROJECT_DIR, summarize, timer
+
+
+def configure(base_url, verify):
+    from django.conf import settings
+    settings.configure(
+        CHAPA_BASE_URL=base_url,
+        CHAPA_SECRET_KEY='bench-secret',
+        CHAPA_POOL_MAXSIZE=64,
+    )
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    from listings.services.payment_service import get_session
+    session = get_session()
+    session.trust_env = False
+    session.verify = verify
+
+
+def payment_data():
+    tx_ref = f'bench_{uuid.uuid4().hex[:12]}'
+    return {
+        'amount': 100, 'currency': 'ETB', 'email': 'bench@example.com',
+        'first_name': 'Bench', 'last_name': 'User', 'tx_ref': tx_ref,
+        'callback_url': 'http://localhost/callback/', 'return_url': 'http://localhost/return/',
+    }
+
+
+def baseline_call(base_url, verify):
+    headers = {'Authorization': 'Bearer bench-secret', 'Content-Type': 'application/json'}
+    data = payment_data()
+    requests.post(f'{base_url}transaction/initialize', json=data, headers=headers, timeout=30, verify=verify).json()
+    requests.get(f'{base_url}transaction/verify/{data["tx_ref"]}', headers=headers, timeout=30, verify=verify).json()
+
+
+def pooled_call():
+    from listings.services.payment_service import ChapaPaymentService
+    service = ChapaPaymentService()
+    data = payment_data()
+    assert service.initiate_payment(data)['success']
+    assert service.verify_payment(data['tx_ref'])['success']
+
+
+def run(label, server, fn, calls, concurrency):
+    server.reset_stats()
+    samples = []
+
+    def one(_):
+        with timer(samples):
+            fn()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(calls)))
+    print(summarize(label, samples))
+    print(f"  {server.requests} HTTP requests over {server.connections} TCP connections")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=300, help='initialize+verify pairs per run')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--certfile')
+    parser.add_argument('--keyfile')
+    args = parser.parse_args()
+
+    server = ChapaStubServer(certfile=args.certfile, keyfile=args.keyfile).start()
+    verify = not args.certfile
+    if args.certfile:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    configure(server.base_url, verify)
+    print(f"Stub Chapa at {server.base_url}")
+
+    before = run('per-call connections', server, lambda: baseline_call(server.base_url, verify), args.calls, args.concurrency)
+    after = run('pooled session', server, pooled_call, args.calls, args.concurrency)
+
+    speedup = sum(before) / sum(after)
+    print(f"Pooled client is {speedup:.2f}x faster on mean latency")
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# benchmarks/bench_email.py
+
+"""
+Send confirmation emails to a local SMTP server, one by one and batched.
+
+    python benchmarks/bench_email.py --emails 2000 --batch-size 100
+
+A counting SMTP server (no TLS, no delivery) runs in a background
+thread. The legacy path renders the template and calls send_mail for
+every email, opening a connection each time; the batched path queues
+the same emails and flushes them over one connection per batch. Both
+report emails per second. A real relay adds a TLS handshake to every
+connection, so the gap there is wider than here.
+"""
+
+import argparse
+import asyncore
+import smtpd
+import socket
+import sys
+import threading
+import warnings
+
+from _common import setup_django, timer
+
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+
+class CountingServer(smtpd.SMTPServer):
+    received = 0
+
+    def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+        CountingServer.received += 1
+
+
+def start_server():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    CountingServer(('127.0.0.1', port), None)
+    threading.Thread(target=asyncore.loop, kwargs={'timeout': 0.1}, daemon=True).start()
+    return port
+
+
+def legacy_send(to, booking_id, amount):
+    """The pre-batching task body: render and send_mail per email"""
+    from django.conf import settings
+    from django.core.mail import send_mail
+    from django.template.loader import render_to_string
+    from django.utils.html import strip_tags
+
+    html_message = render_to_string('emails/payment_confirmation.html', {'booking_id': booking_id, 'amount': amount})
+    send_mail(
+        'Payment Confirmation - Booking Confirmed', strip_tags(html_message),
+        settings.EMAIL_HOST_USER, [to], html_message=html_message, fail_silently=False,
+    )
+
+
+def report(label, count, elapsed):
+    seconds = elapsed[0] / 1000
+    print(f"{label}: {count} emails in {seconds:.2f}s ({count / seconds:,.0f} emails/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--emails', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from listings.services.email_service import ConfirmationEmails, MemoryEmailQueue
+
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST = '127.0.0.1'
+    settings.EMAIL_PORT = start_server()
+    settings.EMAIL_USE_TLS = False
+    recipients = [(f'guest{index}@example.com', f'booking-{index}', '150.00') for index in range(args.emails)]
+
+    with timer(elapsed := []):
+        for to, booking_id, amount in recipients:
+            legacy_send(to, booking_id, amount)
+    report('send_mail per email', args.emails, elapsed)
+
+    emails = ConfirmationEmails(queue=MemoryEmailQueue(), batch_size=args.batch_size)
+    with timer(elapsed := []):
+        for recipient in recipients:
+            emails.send(emails.payment_confirmation(*recipient))
+        sent = emails.flush()
+    report(f'batched ({args.batch_size} per connection)', sent, elapsed)
+
+    print(f"server received {CountingServer.received} of {2 * args.emails}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
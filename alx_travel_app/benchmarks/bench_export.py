@@ -0,0 +1,111 @@
+# benchmarks/bench_export.py
+
+"""
+Stream a bookings + payments export and track process memory while it runs.
+
+    python benchmarks/bench_export.py --bookings 10000000
+
+Runs in a throwaway test database. Bookings are bulk-inserted (every
+other one with a payment), then ExportBookingsView is called as finance
+would call it and the StreamingHttpResponse is drained into /dev/null.
+Resident memory is sampled ten times during the export; a flat series
+means memory does not grow with the number of rows exported.
+"""
+
+import argparse
+import os
+import random
+import sys
+import uuid
+from datetime import date, timedelta
+
+from _common import setup_django, test_database, timer
+
+
+def rss_mib():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def create_bookings(count, batch_size=20000):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from listings.models import Booking, Category, Listing, Location, Payment
+
+    rng = random.Random(42)
+    user = User.objects.create_user(username='bench')
+    category = Category.objects.create(name='Bench', slug='bench')
+    location = Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench')
+    listing = Listing.objects.create(
+        title='Bench', description='Benchmark', listing_type='apartment', status='published', host=user,
+        category=category, location=location, price_per_night=100, slug='bench',
+    )
+    start_time = timezone.now() - timedelta(seconds=count)
+    statuses = ['pending', 'confirmed', 'cancelled', 'completed']
+    for start in range(0, count, batch_size):
+        bookings = [
+            Booking(
+                id=uuid.UUID(int=rng.getrandbits(128)), listing=listing, user=user,
+                check_in_date=date(2030, 1, 1), check_out_date=date(2030, 1, 3), guests=2,
+                total_price=200, status=rng.choice(statuses),
+                created_at=start_time + timedelta(seconds=index),
+            )
+            for index in range(start, min(start + batch_size, count))
+        ]
+        Booking.objects.bulk_create(bookings)
+        Payment.objects.bulk_create([
+            Payment(
+                id=uuid.UUID(int=rng.getrandbits(128)), booking=booking, amount=200, status='completed',
+                transaction_id=f'tx-{booking.id.hex}', payment_method='telebirr',
+            )
+            for booking in bookings[::2]
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bookings', type=int, default=10000000)
+    parser.add_argument('--output', choices=['csv', 'ndjson'], default='csv')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from listings.views import ExportBookingsView
+
+    with test_database():
+        with timer(build := []):
+            create_bookings(args.bookings)
+        print(f"inserted {args.bookings} bookings in {build[0] / 1000:.1f}s")
+
+        staff = User.objects.create_user(username='finance', is_staff=True)
+        request = APIRequestFactory().get('/api/exports/bookings/', {'output': args.output})
+        force_authenticate(request, user=staff)
+
+        baseline = rss_mib()
+        samples = []
+        step = max(1, args.bookings // 10)
+        written = lines = 0
+        with timer(elapsed := []), open(os.devnull, 'w') as sink:
+            response = ExportBookingsView.as_view()(request)
+            for chunk in response.streaming_content:
+                sink.write(chunk.decode())
+                written += len(chunk)
+                lines += chunk.count(b'\n')
+                if lines >= step * (len(samples) + 1):
+                    samples.append((lines, rss_mib()))
+
+        seconds = elapsed[0] / 1000
+        print(f"exported {args.bookings} bookings as {args.output}: {written / 2 ** 20:.0f} MiB "
+              f"in {seconds:.1f}s ({args.bookings / seconds:,.0f} rows/s)")
+        print(f"RSS before export: {baseline:.1f} MiB")
+        for exported, rss in samples:
+            print(f"  after {exported:>10,} rows: {rss:.1f} MiB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
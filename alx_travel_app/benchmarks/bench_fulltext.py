@@ -0,0 +1,115 @@
+# benchmarks/bench_fulltext.py
+
+"""
+Measure full-text index build time and ranked search latency.
+
+    python benchmarks/bench_fulltext.py --listings 200000
+
+Runs in a throwaway test database. Listings get titles and descriptions
+drawn from a travel vocabulary with a Zipf-like word distribution, so
+queries cover common and rare terms. They are bulk-inserted (no
+signals) and the index is then built with the backend's rebuild(). Each
+query is timed as a count plus a first page of 20 serialized with
+highlights, for the legacy icontains filter and the full-text backend.
+"""
+
+import argparse
+import random
+import sys
+import uuid
+
+from _common import setup_django, summarize, test_database, timer
+
+VOCABULARY = (
+    'room stay night view city beach sea ocean mountain lake river garden pool terrace balcony '
+    'kitchen bathroom bedroom living quiet cozy bright modern rustic charming spacious luxury '
+    'family friendly walk minutes station airport centre downtown market restaurant cafe bar '
+    'shop museum park forest trail hiking cycling ski slope sunset sunrise breakfast dinner '
+    'coffee wine fireplace wood stone glass loft villa cabin cottage apartment studio house '
+    'hostel hotel resort suite penthouse courtyard rooftop harbour island bay cliff valley '
+    'vineyard farm village historic old town square bridge castle cathedral gallery theatre '
+    'festival concert beachfront waterfront seaside lakeside riverside hillside countryside '
+    'private shared parking wifi washer dryer heating air conditioning gym sauna spa jacuzzi '
+    'barbecue grill patio deck hammock library piano workspace desk crib pets welcome'
+).split()
+
+QUERIES = ['beach', 'quiet garden', 'mountain cabin fireplace', 'jacuzzi penthouse', 'castle vineyard sauna']
+
+
+def words(rng, count):
+    # Low indexes are far more likely, giving a long tail of rare words
+    return ' '.join(VOCABULARY[min(int(rng.paretovariate(1.2)) - 1, len(VOCABULARY) - 1)]
+                    if rng.random() < 0.5 else rng.choice(VOCABULARY)
+                    for _ in range(count))
+
+
+def create_listings(count, batch_size=5000):
+    from django.contrib.auth.models import User
+    from listings.models import Category, Listing, Location
+
+    rng = random.Random(42)
+    host = User.objects.create_user(username='bench')
+    category = Category.objects.create(name='Bench', slug='bench')
+    location = Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench')
+    for start in range(0, count, batch_size):
+        Listing.objects.bulk_create([
+            Listing(
+                id=uuid.UUID(int=rng.getrandbits(128)), title=words(rng, rng.randint(3, 6)).capitalize(),
+                description=words(rng, rng.randint(30, 80)), listing_type='apartment', status='published',
+                host=host, category=category, location=location, price_per_night=100, slug=f'listing-{index}',
+            )
+            for index in range(start, min(start + batch_size, count))
+        ])
+
+
+def legacy_search(queryset, query):
+    from django.db.models import Q
+    for term in query.split():
+        queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+    return queryset.order_by('-created_at')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listings', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from listings.models import Listing
+    from listings.serializers import ListingSearchResultSerializer, ListingSerializer
+    from listings.services.fulltext_service import get_search_backend, search_terms
+    from listings.services.search_service import ListingSearchService
+
+    with test_database():
+        with timer(build := []):
+            create_listings(args.listings)
+        print(f"inserted {args.listings} listings in {build[0] / 1000:.1f}s")
+
+        backend = get_search_backend()
+        with timer(index := []):
+            indexed = backend.rebuild(batch_size=5000)
+        print(f"{type(backend).__name__}: indexed {indexed} listings in {index[0] / 1000:.1f}s")
+
+        published = Listing.objects.filter(status='published')
+        for query in QUERIES:
+            context = {'search_terms': search_terms(query)}
+            variants = [
+                ('legacy icontains', lambda: legacy_search(published, query), ListingSerializer),
+                ('full-text', lambda: ListingSearchService({'q': query}).search(), ListingSearchResultSerializer),
+            ]
+            print(f"\n{query!r}")
+            for label, build_queryset, serializer_class in variants:
+                counts, pages = [], []
+                for _ in range(args.repeat):
+                    with timer(counts):
+                        matches = build_queryset().count()
+                    with timer(pages):
+                        serializer_class(build_queryset()[:20], many=True, context=context).data
+                print(summarize(f"  {label} count ({matches} rows)", counts))
+                print(summarize(f"  {label} first page", pages))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# benchmarks/bench_geo_search.py
+
+"""
+Compare radius and map-viewport searches with and without geohash pruning.
+
+    python benchmarks/bench_geo_search.py --locations 300000
+
+Runs in a throwaway test database. Locations are bulk-inserted around a
+few hundred random city centres (bulk_create skips save(), so geohashes
+are filled by GeoService.backfill), with one published listing each.
+Every query goes through ListingSearchService and is timed as a count
+and a first page of 20; the legacy variant filters the same
+latitude/longitude bounds and haversine distance without the geohash
+ranges, which is all the unindexed coordinates allow.
+"""
+
+import argparse
+import random
+import sys
+import uuid
+
+from _common import setup_django, summarize, test_database, timer
+
+RADII_KM = [2, 10, 50]
+VIEWPORTS_DEG = [0.1, 0.5]
+
+
+def create_listings(count, cities, batch_size=10000):
+    from django.contrib.auth.models import User
+    from listings.models import Category, Listing, Location
+
+    rng = random.Random(42)
+    centres = [(rng.uniform(-55, 65), rng.uniform(-180, 180)) for _ in range(cities)]
+    host = User.objects.create_user(username='bench')
+    category = Category.objects.create(name='Bench', slug='bench')
+    for start in range(0, count, batch_size):
+        indexes = range(start, min(start + batch_size, count))
+        locations = []
+        for index in indexes:
+            latitude, longitude = rng.choice(centres)
+            locations.append(Location(
+                name=f'Location {index}', city='Bench', state='Bench', country='Bench',
+                latitude=round(max(-89, min(89, rng.gauss(latitude, 0.1))), 6),
+                longitude=round((rng.gauss(longitude, 0.1) + 180) % 360 - 180, 6),
+            ))
+        locations = Location.objects.bulk_create(locations)
+        Listing.objects.bulk_create([
+            Listing(
+                id=uuid.UUID(int=rng.getrandbits(128)), title=f'Listing {index}', description='Benchmark',
+                listing_type='apartment', status='published', host=host, category=category,
+                location=location, price_per_night=100, slug=f'listing-{index}',
+            )
+            for index, location in zip(indexes, locations)
+        ])
+    return centres
+
+
+class LegacySearchService:
+    """ListingSearchService with the geohash ranges left out of the box filter"""
+
+    def __init__(self, params):
+        from listings.services import geo_service, search_service
+        self.service = search_service.ListingSearchService(params)
+        self.module = geo_service
+
+    def search(self):
+        cover = self.module.cover
+        self.module.cover = lambda *args, **kwargs: None
+        try:
+            return self.service.search()
+        finally:
+            self.module.cover = cover
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--locations', type=int, default=300000)
+    parser.add_argument('--cities', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from listings.services.geo_service import GeoService
+    from listings.services.search_service import ListingSearchService
+
+    with test_database():
+        with timer(build := []):
+            centres = create_listings(args.locations, args.cities)
+        print(f"inserted {args.locations} locations and listings in {build[0] / 1000:.1f}s")
+        with timer(backfill := []):
+            updated = GeoService.backfill(batch_size=10000)
+        print(f"backfilled geohashes for {updated} locations in {backfill[0] / 1000:.1f}s")
+
+        queries = [
+            (f'radius {radius} km', lambda latitude, longitude, radius=radius: {
+                'lat': latitude, 'lng': longitude, 'radius_km': radius, 'sort': 'distance'
+            })
+            for radius in RADII_KM
+        ] + [
+            (f'viewport {size} deg', lambda latitude, longitude, size=size: {
+                'bbox': f'{latitude - size / 2},{longitude - size / 2},{latitude + size / 2},{longitude + size / 2}'
+            })
+            for size in VIEWPORTS_DEG
+        ]
+        rng = random.Random(7)
+        for label, build_params in queries:
+            print(f"\n{label}")
+            seed = rng.random()
+            for variant, service_class in [('legacy bounds', LegacySearchService),
+                                           ('geohash', ListingSearchService)]:
+                counts, pages, matches = [], [], []
+                points = random.Random(seed)
+                for _ in range(args.repeat):
+                    latitude, longitude = points.choice(centres)
+                    params = build_params(latitude, longitude)
+                    with timer(counts):
+                        matches.append(service_class(params).search().count())
+                    with timer(pages):
+                        list(service_class(params).search()[:20])
+                print(summarize(f"  {variant} count (avg {sum(matches) / len(matches):.0f} rows)", counts))
+                print(summarize(f"  {variant} first page", pages))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
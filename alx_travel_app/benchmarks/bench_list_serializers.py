@@ -0,0 +1,100 @@
+# benchmarks/bench_list_serializers.py
+
+"""
+Compare full ModelSerializer output with the compact values() row serializers.
+
+    python benchmarks/bench_list_serializers.py --rows 1000
+
+Runs in a throwaway test database with --rows listings (descriptions and
+house rules a few hundred characters long, like real ones) and one
+booking each. For each model it times serialization alone, on rows that
+are already loaded, and the full fetch + serialize + JSON render of the
+list: ListingSerializer over instances loaded with select_related versus
+ListingListSerializer over QuerySet.values() rows, and the same for
+bookings.
+"""
+
+import argparse
+import random
+import sys
+import uuid
+from datetime import date, timedelta
+
+from _common import setup_django, summarize, test_database, timer
+
+
+def create_rows(count):
+    from django.contrib.auth.models import User
+    from listings.models import Booking, Category, Listing, Location
+
+    rng = random.Random(42)
+    host = User.objects.create_user(username='bench')
+    category = Category.objects.create(name='Bench', slug='bench')
+    location = Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench')
+    listings = Listing.objects.bulk_create([
+        Listing(
+            id=uuid.UUID(int=rng.getrandbits(128)), title=f'Listing {index}', description='Lovely place. ' * 40,
+            house_rules='No parties. ' * 20, listing_type='apartment', status='published', host=host,
+            category=category, location=location, price_per_night=rng.randint(20, 500), slug=f'listing-{index}',
+            amenities='WiFi, Kitchen, Pool', main_image=f'listings/{index}.jpg',
+        )
+        for index in range(count)
+    ])
+    Booking.objects.bulk_create([
+        Booking(
+            listing=listing, user=host, check_in_date=date(2030, 1, 1) + timedelta(days=index),
+            check_out_date=date(2030, 1, 3) + timedelta(days=index), guests=2, total_price=200,
+        )
+        for index, listing in enumerate(listings)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory
+    from listings.models import Booking, Listing
+    from listings.serializers import (
+        BookingListSerializer, BookingSerializer, ListingListSerializer, ListingSerializer
+    )
+
+    context = {'request': APIRequestFactory().get('/api/listings/')}
+    renderer = JSONRenderer()
+
+    with test_database():
+        create_rows(args.rows)
+        cases = [
+            ('listings', Listing.objects.select_related('category', 'location'),
+             ListingSerializer, ListingListSerializer),
+            ('bookings', Booking.objects.all(), BookingSerializer, BookingListSerializer),
+        ]
+        for label, queryset, full_class, compact_class in cases:
+            instances = list(queryset)
+            rows = list(compact_class.rows(queryset))
+            variants = [
+                ('full serializer', lambda: full_class(instances, many=True, context=context).data,
+                 lambda: renderer.render(full_class(queryset.all(), many=True, context=context).data)),
+                ('compact rows', lambda: compact_class(rows, many=True, context=context).data,
+                 lambda: renderer.render(compact_class(compact_class.rows(queryset), many=True,
+                                                       context=context).data)),
+            ]
+            print(f"\n{args.rows} {label}")
+            for variant, serialize, end_to_end in variants:
+                serialize_samples, total_samples = [], []
+                for _ in range(args.repeat):
+                    with timer(serialize_samples):
+                        serialize()
+                    with timer(total_samples):
+                        size = len(end_to_end())
+                print(summarize(f"  {variant} serialize", serialize_samples))
+                print(summarize(f"  {variant} fetch + serialize + render ({size // 1024} KiB)", total_samples))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
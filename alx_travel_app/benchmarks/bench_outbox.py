@@ -0,0 +1,92 @@
+# benchmarks/bench_outbox.py
+
+"""
+Booking latency with a slow broker, inline .delay() versus the outbox.
+
+    python benchmarks/bench_outbox.py --bookings 500 --broker-delay 50
+
+Runs in a throwaway test database. Publishing is simulated by
+Task.apply_async sleeping --broker-delay milliseconds. The legacy path
+creates the booking and publishes its confirmation email inline, as
+the views used to; the outbox path only inserts the outbox message.
+The relay then drains the outbox with the same slow broker, reporting
+depth and lag before the drain and messages per second.
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from _common import setup_django, summarize, test_database, timer
+
+
+def create_listing():
+    from django.contrib.auth.models import User
+    from listings.models import Category, Listing, Location
+
+    return Listing.objects.create(
+        title='Bench Flat', description='Benchmark listing', listing_type='apartment',
+        status='published', host=User.objects.create_user(username='bench-host'),
+        price_per_night=100, slug='bench-flat',
+        category=Category.objects.create(name='Bench', slug='bench'),
+        location=Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench'),
+    )
+
+
+def book(listing, user, index):
+    from listings.services.booking_service import BookingService
+
+    check_in = date.today() + timedelta(days=2 * index)
+    return BookingService.create_booking(
+        listing_id=listing.pk, user=user, check_in_date=check_in,
+        check_out_date=check_in + timedelta(days=1), guests=1
+    )
+
+
+def legacy_book(listing, user, index):
+    """The pre-outbox view: create the booking, then publish inline"""
+    from listings.tasks import send_booking_confirmation_email
+
+    with patch('listings.services.booking_service.Outbox.enqueue'):
+        booking = book(listing, user, index)
+    send_booking_confirmation_email.delay(str(booking.id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bookings', type=int, default=500)
+    parser.add_argument('--broker-delay', type=float, default=50.0, help='milliseconds per publish')
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from listings.services.outbox_service import OutboxRelay
+
+    def slow_publish(*_args, **_kwargs):
+        time.sleep(args.broker_delay / 1000)
+
+    with test_database(), patch('celery.app.task.Task.apply_async', slow_publish):
+        listing = create_listing()
+        user = User.objects.create_user(username='bench-guest', email='guest@example.com')
+
+        for label, create, offset in (('inline .delay()', legacy_book, 0), ('outbox', book, args.bookings)):
+            samples = []
+            for index in range(args.bookings):
+                with timer(samples):
+                    create(listing, user, offset + index)
+            print(summarize(f'{label} booking', samples))
+
+        print(f"outbox before relay: {OutboxRelay.stats()}")
+        with timer(elapsed := []):
+            relayed = OutboxRelay(batch_size=args.batch_size).drain()
+        seconds = elapsed[0] / 1000
+        print(f"relay: {relayed} messages in {seconds:.2f}s ({relayed / seconds:,.0f} messages/s)")
+        print(f"outbox after relay: {OutboxRelay.stats()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
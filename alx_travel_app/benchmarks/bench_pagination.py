@@ -0,0 +1,107 @@
+# benchmarks/bench_pagination.py
+
+"""
+Compare OFFSET page-number pagination with keyset cursors at depth.
+
+    python benchmarks/bench_pagination.py --listings 200000
+
+Runs in a throwaway test database. Listings are bulk-inserted with
+distinct created_at values, then the published-listing list is paged
+the way ListingViewSet does it: with DRF's PageNumberPagination (OFFSET
+plus COUNT(*) on every request) and with KeysetPagination, with and
+without the count. Keyset cursors for deep pages are built from the row
+the page continues from, as a client following next links would have.
+"""
+
+import argparse
+import random
+import sys
+import uuid
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from _common import setup_django, summarize, test_database, timer
+
+PAGES = [1, 100, 5000]
+
+
+def create_listings(count, batch_size=10000):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from listings.models import Category, Listing, Location
+
+    rng = random.Random(42)
+    host = User.objects.create_user(username='bench')
+    category = Category.objects.create(name='Bench', slug='bench')
+    location = Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench')
+    start_time = timezone.now() - timedelta(seconds=count)
+    for start in range(0, count, batch_size):
+        Listing.objects.bulk_create([
+            Listing(
+                id=uuid.UUID(int=rng.getrandbits(128)), title=f'Listing {index}', description='Benchmark',
+                listing_type='apartment', status='published', host=host, category=category,
+                location=location, price_per_night=100, slug=f'listing-{index}',
+                created_at=start_time + timedelta(seconds=index),
+            )
+            for index in range(start, min(start + batch_size, count))
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listings', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.pagination import PageNumberPagination
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from listings.models import Listing
+    from listings.pagination import KeysetPagination
+    from listings.serializers import ListingSerializer
+
+    factory = APIRequestFactory()
+
+    def fetch(paginator_class, params):
+        request = Request(factory.get('/api/listings/', params))
+        queryset = Listing.objects.filter(status='published').select_related('category', 'location')
+        paginator = paginator_class()
+        page = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(ListingSerializer(page, many=True).data)
+
+    with test_database():
+        with timer(build := []):
+            create_listings(args.listings)
+        print(f"inserted {args.listings} listings in {build[0] / 1000:.1f}s")
+
+        for page in PAGES:
+            cursor_params = {}
+            if page > 1:
+                # The last row of the previous page, as its next link encodes it
+                anchor = Listing.objects.filter(status='published').order_by('-created_at', '-pk')[
+                    (page - 1) * 20 - 1
+                ]
+                request = Request(factory.get('/api/listings/'))
+                paginator = KeysetPagination()
+                paginator.base_url = request.build_absolute_uri()
+                next_link = paginator.encode_cursor(anchor, reverse=False)
+                cursor_params = {'cursor': parse_qs(urlsplit(next_link).query)['cursor'][0]}
+
+            variants = [
+                ('page number (offset + count)', PageNumberPagination, {'page': page}),
+                ('keyset + count', KeysetPagination, cursor_params),
+                ('keyset, count=false', KeysetPagination, {**cursor_params, 'count': 'false'}),
+            ]
+            print(f"\npage {page}")
+            for label, paginator_class, params in variants:
+                samples = []
+                for _ in range(args.repeat):
+                    with timer(samples):
+                        fetch(paginator_class, params)
+                print(summarize(f"  {label}", samples))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# benchmarks/bench_search.py
+
+"""
+Latency benchmark for the availability search behind SearchListingsView.
+
+Seed a large dataset first, e.g.
+    python manage.py seed --listings 500000 --bookings 10000000
+then run
+    python benchmarks/bench_search.py --queries 2000
+
+The script replays random "city + dates + guests" searches through
+ListingSearchService, fetching one page of results per query, and fails
+with a non-zero exit code when p95 latency exceeds --p95-budget.
+"""
+
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+
+from _common import setup_django, summarize, percentile, timer
+
+
+def build_queries(cities, count, seed):
+    rng = random.Random(seed)
+    today = date.today()
+    queries = []
+    for _ in range(count):
+        check_in = today + timedelta(days=rng.randint(-30, 180))
+        check_out = check_in + timedelta(days=rng.randint(1, 10))
+        queries.append({
+            'city': rng.choice(cities),
+            'check_in': check_in.isoformat(),
+            'check_out': check_out.isoformat(),
+            'guests': str(rng.randint(1, 4)),
+        })
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--queries', type=int, default=1000, help='Number of timed searches')
+    parser.add_argument('--warmup', type=int, default=50, help='Untimed searches run first')
+    parser.add_argument('--page-size', type=int, default=20, help='Rows fetched per search')
+    parser.add_argument('--p95-budget', type=float, default=50.0, help='Fail above this p95 (ms)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--explain', action='store_true', help='Print the query plan of one search')
+    args = parser.parse_args()
+
+    setup_django()
+    from listings.models import Booking, Listing, Location
+    from listings.services.search_service import ListingSearchService
+
+    cities = list(Location.objects.values_list('city', flat=True).distinct())
+    if not cities:
+        print('No locations found - seed the database first.')
+        return 2
+
+    print(f"Dataset: {Listing.objects.count()} listings, {Booking.objects.count()} bookings, {len(cities)} cities")
+
+    queries = build_queries(cities, args.warmup + args.queries, args.seed)
+    warmup, timed = queries[:args.warmup], queries[args.warmup:]
+
+    if args.explain:
+        print(ListingSearchService(timed[0]).search()[:args.page_size].explain())
+
+    for params in warmup:
+        list(ListingSearchService(params).search()[:args.page_size])
+
+    samples = []
+    for params in timed:
+        with timer(samples):
+            list(ListingSearchService(params).search()[:args.page_size])
+
+    print(summarize('search', samples))
+    p95 = percentile(samples, 95)
+    if p95 > args.p95_budget:
+        print(f"FAIL: p95 {p95:.2f}ms exceeds budget of {args.p95_budget:.2f}ms")
+        return 1
+    print(f"OK: p95 within {args.p95_budget:.2f}ms budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
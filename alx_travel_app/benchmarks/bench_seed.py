@@ -0,0 +1,64 @@
+# benchmarks/bench_seed.py
+
+"""
+Time the seed command row by row and with --fast.
+
+    python benchmarks/bench_seed.py --users 100000 --listings 200000 \\
+        --reviews 1000000 --bookings 1000000 --workers 1 4
+
+Each run gets its own throwaway test database. The row-by-row seed is
+timed at SLOW_COUNTS with the en_US locale (it is far too slow at full
+size, and its title-based slugs collide quickly with mixed locales);
+--fast is timed at the given counts once for each --workers value. Each
+run reports seconds and rows inserted per second, counted across users,
+listings, reviews, bookings and favorites.
+"""
+
+import argparse
+import sys
+from io import StringIO
+
+from _common import setup_django, test_database, timer
+
+SLOW_COUNTS = {'users': 200, 'listings': 100, 'reviews': 1000, 'bookings': 1000}
+
+
+def row_count():
+    from django.contrib.auth.models import User
+    from listings.models import Booking, Favorite, Listing, Review
+    return sum(model.objects.count() for model in (User, Listing, Review, Booking, Favorite))
+
+
+def run(label, **options):
+    from django.core.management import call_command
+
+    before = row_count()
+    with timer(elapsed := []):
+        call_command('seed', stdout=StringIO(), **options)
+    rows = row_count() - before
+    seconds = elapsed[0] / 1000
+    print(f"{label}: {rows:,} rows in {seconds:.1f}s ({rows / seconds:,.0f} rows/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--listings', type=int, default=200000)
+    parser.add_argument('--reviews', type=int, default=1000000)
+    parser.add_argument('--bookings', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    args = parser.parse_args()
+
+    setup_django()
+    counts = {name: getattr(args, name) for name in ('users', 'listings', 'reviews', 'bookings')}
+    with test_database():
+        run('row by row', locale='en_US', **SLOW_COUNTS)
+    for workers in args.workers:
+        with test_database():
+            run(f'--fast --workers {workers}', fast=True, batch_size=args.batch_size, workers=workers, **counts)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# benchmarks/bench_startup.py
+
+"""
+Cold-start time of manage.py and a WSGI worker.
+
+    python benchmarks/bench_startup.py --runs 10
+
+Each run is a fresh interpreter. "manage.py check" runs the system checks
+(which load the URLconf); "wsgi first request" imports the WSGI module
+and serves GET /api/ through it, which is what a web worker does before
+it can answer anything. Reports the median and best CPU time from the
+first statement to the end of the target (interpreter start-up and disk
+waits excluded, which keeps runs comparable), the number of loaded
+modules and whether Celery, kombu and the API doc stacks were imported.
+--eager imports alx_travel_app.celery first, which is what the package
+__init__ used to do on every start; --lean starts with API_DOCS off, as
+production does. For a per-module breakdown use manage.py profile_startup.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from _common import PROJECT_DIR
+
+PROBE = '''
+import time
+start = time.process_time()
+import json, sys
+sys.path.insert(0, {project_dir!r})
+{body}
+print(json.dumps({{
+    'ms': (time.process_time() - start) * 1000,
+    'modules': len(sys.modules),
+    'celery': 'celery.app' in sys.modules,
+    'kombu': 'kombu' in sys.modules,
+    'docs': 'drf_yasg' in sys.modules or 'drf_spectacular' in sys.modules,
+}}))
+'''
+
+TARGETS = {
+    'manage.py check': '''
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alx_travel_app.settings')
+from django.core.management import execute_from_command_line
+execute_from_command_line(['manage.py', 'check'])
+''',
+    'wsgi first request': '''
+from wsgiref.util import setup_testing_defaults
+from alx_travel_app.wsgi import application
+environ = {'PATH_INFO': '/api/', 'HTTP_HOST': 'localhost'}
+setup_testing_defaults(environ)
+b''.join(application(environ, lambda status, headers: None))
+''',
+}
+
+
+def measure(project_dir, body, runs, eager=False, lean=False):
+    if eager:
+        body = 'import alx_travel_app.celery\n' + body
+    code = PROBE.format(project_dir=str(project_dir), body=body)
+    env = os.environ.copy()
+    if lean:
+        env['API_DOCS'] = 'False'
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-c', code],
+            cwd=project_dir, env=env, capture_output=True, text=True, check=True,
+        )
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append(loaded['ms'])
+    return samples, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--eager', action='store_true', help='create the Celery app at import, as before')
+    parser.add_argument('--lean', action='store_true', help='start with API_DOCS off')
+    args = parser.parse_args()
+
+    for label, body in TARGETS.items():
+        samples, loaded = measure(PROJECT_DIR, body, args.runs, args.eager, args.lean)
+        print(
+            f"{label}: median={statistics.median(samples):.0f}ms best={min(samples):.0f}ms "
+            f"modules={loaded['modules']} celery={loaded['celery']} kombu={loaded['kombu']} docs={loaded['docs']}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
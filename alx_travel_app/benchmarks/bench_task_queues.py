@@ -0,0 +1,121 @@
+# benchmarks/bench_task_queues.py
+
+"""
+Critical task latency while a bulk backlog drains, one queue versus routed queues.
+
+    python benchmarks/bench_task_queues.py --bulk 400 --bulk-ms 20 --critical 100
+
+Runs real Celery workers in this process over the in-memory transport,
+with the queues from Django settings. The bulk task is routed like
+send_booking_confirmation_email and sleeps --bulk-ms; the critical one
+is routed like send_payment_confirmation_email and does no work. The
+in-memory transport's synchronous consumer loop only tops up the
+prefetch allowance every two seconds, so prefetch is left unlimited
+here: this measures queue isolation, not prefetch tuning. A backlog of bulk tasks is published, then critical tasks
+arrive every --interval ms. Both layouts use --concurrency threads in
+total: the shared layout runs them all on one default queue; the routed
+layout gives one thread to the critical queue and the rest to bulk.
+Reports the wait from publish to start for critical tasks and the total
+time to drain the bulk backlog.
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+
+from _common import setup_django, summarize
+
+PAYMENT_TASK = 'listings.tasks.send_payment_confirmation_email'
+BOOKING_TASK = 'listings.tasks.send_booking_confirmation_email'
+ROUTED_LIKE = {'bench.critical': PAYMENT_TASK, 'bench.bulk': BOOKING_TASK}
+
+
+def make_app(settings, routed, bulk_ms, waits, done):
+    from celery import Celery
+
+    app = Celery('bench_task_queues', broker='memory://', set_as_current=False)
+    app.conf.update(
+        task_queues=settings.CELERY_TASK_QUEUES if routed else None,
+        task_default_queue=settings.CELERY_TASK_DEFAULT_QUEUE if routed else 'celery',
+        task_routes={
+            name: settings.CELERY_TASK_ROUTES[real] for name, real in ROUTED_LIKE.items()
+        } if routed else {},
+        worker_prefetch_multiplier=0,
+        broker_transport_options={'polling_interval': 0.005},
+        worker_hijack_root_logger=False,
+    )
+
+    @app.task(name='bench.critical', acks_late=True)
+    def critical(sent_at):
+        waits.append((time.time() - sent_at) * 1000)
+        done['critical'] += 1
+
+    @app.task(name='bench.bulk')
+    def bulk(sent_at):
+        time.sleep(bulk_ms / 1000)
+        done['bulk'] += 1
+
+    return app, critical, bulk
+
+
+def run(label, settings, routed, args):
+    from celery.contrib.testing.worker import start_worker
+
+    waits = []
+    done = {'critical': 0, 'bulk': 0}
+    app, critical, bulk = make_app(settings, routed, args.bulk_ms, waits, done)
+    if routed:
+        layout = [(['critical'], 1), (['bulk'], args.concurrency - 1)]
+    else:
+        layout = [(['celery'], args.concurrency)]
+
+    for _ in range(args.bulk):
+        bulk.delay(time.time())
+
+    workers = [
+        start_worker(app, pool='threads', concurrency=concurrency, queues=queues,
+                     perform_ping_check=False, loglevel='ERROR', shutdown_timeout=60)
+        for queues, concurrency in layout
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.__enter__()
+    try:
+        for _ in range(args.critical):
+            critical.delay(time.time())
+            time.sleep(args.interval / 1000)
+        while done['bulk'] < args.bulk or done['critical'] < args.critical:
+            time.sleep(0.01)
+        drained = time.perf_counter() - start
+    finally:
+        for worker in reversed(workers):
+            worker.__exit__(None, None, None)
+
+    print(summarize(f'{label} critical wait', waits))
+    print(f"{label}: {args.bulk} bulk tasks drained in {drained:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bulk', type=int, default=400)
+    parser.add_argument('--bulk-ms', type=float, default=20.0)
+    parser.add_argument('--critical', type=int, default=100)
+    parser.add_argument('--interval', type=float, default=20.0, help='milliseconds between critical tasks')
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    # The in-memory broker keeps process-wide state, so each layout gets a fresh process
+    context = multiprocessing.get_context('fork')
+    for label, routed in (('one shared queue', False), ('routed queues', True)):
+        process = context.Process(target=run, args=(label, settings, routed, args))
+        process.start()
+        process.join()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
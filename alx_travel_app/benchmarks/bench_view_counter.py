@@ -0,0 +1,92 @@
+# benchmarks/bench_view_counter.py
+
+"""
+Hammer one listing with concurrent detail views.
+
+    python benchmarks/bench_view_counter.py --views 2000 --threads 16
+
+Runs in a throwaway test database. The legacy counter (load the listing,
+add one, save view_count) is compared with the buffered counter (one
+buffer increment per view, then a single flush). Lost increments are
+reported for both. The buffer is Redis when VIEW_COUNTER_REDIS_URL is
+set, otherwise the in-process test buffer.
+"""
+
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import setup_django, summarize, test_database, timer
+
+
+def create_listing():
+    from django.contrib.auth.models import User
+    from listings.models import Category, Listing, Location
+
+    return Listing.objects.create(
+        title='Bench Flat', description='Benchmark listing', listing_type='apartment',
+        status='published', host=User.objects.create_user(username='bench'),
+        price_per_night=100, slug='bench-flat',
+        category=Category.objects.create(name='Bench', slug='bench'),
+        location=Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench'),
+    )
+
+
+def legacy_view(listing_id):
+    """The pre-buffer increment: read-modify-write of view_count"""
+    from listings.models import Listing
+    listing = Listing.objects.get(pk=listing_id)
+    listing.view_count += 1
+    listing.save(update_fields=['view_count'])
+
+
+def hammer(label, views, threads, record):
+    from django.db import connection
+    samples = []
+    errors = []
+
+    def view(_):
+        try:
+            with timer(samples):
+                record()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    with timer(elapsed := []):
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(view, range(views)))
+    print(summarize(label, samples))
+    print(f"  {views / (elapsed[0] / 1000):.0f} views/s, {len(errors)} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--views', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=16)
+    args = parser.parse_args()
+
+    setup_django()
+    from listings.models import Listing
+    from listings.services.view_counter import MemoryViewBuffer, ViewCounter, get_buffer
+
+    with test_database():
+        listing = create_listing()
+
+        hammer('legacy read-modify-write', args.views, args.threads, lambda: legacy_view(listing.pk))
+        listing.refresh_from_db()
+        print(f"  stored {listing.view_count}, lost {args.views - listing.view_count}")
+
+        Listing.objects.filter(pk=listing.pk).update(view_count=0)
+        counter = ViewCounter(buffer=get_buffer() or MemoryViewBuffer())
+        hammer('buffered', args.views, args.threads, lambda: counter.record(listing.pk))
+        with timer(flush := []):
+            counter.flush()
+        listing.refresh_from_db()
+        print(f"  flush took {flush[0]:.2f}ms, stored {listing.view_count}, lost {args.views - listing.view_count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# benchmarks/bench_webhook_burst.py
+
+"""
+Replay a burst of duplicated Chapa webhooks against payment_callback.
+
+    python benchmarks/bench_webhook_burst.py --payments 200 --duplicates 10
+
+Runs in a throwaway test database. Every payment receives --duplicates
+identical deliveries in random order from --threads concurrent senders.
+The legacy handler (load payment, save, enqueue email on every delivery)
+is replayed on the same burst for comparison. Celery publishing is
+counted instead of sent.
+"""
+
+import argparse
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import setup_django, summarize, test_database, timer
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            self.value += 1
+
+
+def create_payments(count):
+    from django.contrib.auth.models import User
+    from listings.models import Booking, Category, Listing, Location, Payment
+
+    user = User.objects.create_user(username='bench', email='bench@example.com')
+    listing = Listing.objects.create(
+        title='Bench Flat', description='Benchmark listing', listing_type='apartment',
+        status='published', host=user, price_per_night=100, slug='bench-flat',
+        category=Category.objects.create(name='Bench', slug='bench'),
+        location=Location.objects.create(name='Bench', city='Bench', state='Bench', country='Bench'),
+    )
+    bookings = Booking.objects.bulk_create([
+        Booking(listing=listing, user=user, check_in_date='2030-01-01', check_out_date='2030-01-02',
+                guests=1, total_price=100)
+        for _ in range(count)
+    ])
+    Payment.objects.bulk_create([
+        Payment(booking=booking, transaction_id=f'tx_bench_{index}', amount=100)
+        for index, booking in enumerate(bookings)
+    ])
+
+
+def legacy_callback(payload, enqueued):
+    """The pre-event-log handler: every delivery re-saves and re-enqueues"""
+    from listings.models import Payment
+    payment = Payment.objects.get(transaction_id=payload['tx_ref'])
+    payment.status = 'completed'
+    payment.save()
+    enqueued(payment.booking.user.email, payment.booking.id, str(payment.amount))
+
+
+def replay(label, deliveries, handler, threads):
+    from django.db import connection
+    samples = []
+
+    def send(payload):
+        try:
+            with timer(samples):
+                handler(payload)
+        finally:
+            connection.close()
+
+    with timer(elapsed := []):
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(send, deliveries))
+    print(summarize(label, samples))
+    print(f"  {len(deliveries) / (elapsed[0] / 1000):.0f} deliveries/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--payments', type=int, default=200)
+    parser.add_argument('--duplicates', type=int, default=10, help='deliveries per payment')
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    setup_django()
+    from unittest.mock import patch
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory
+    from listings.models import PaymentWebhookEvent
+    from listings.views import payment_callback
+
+    with test_database():
+        create_payments(args.payments)
+        deliveries = [
+            {'event': 'charge.success', 'status': 'success', 'tx_ref': f'tx_bench_{index}'}
+            for index in range(args.payments)
+            for _ in range(args.duplicates)
+        ]
+        random.Random(42).shuffle(deliveries)
+        factory = APIRequestFactory()
+
+        def event_log_callback(payload):
+            response = payment_callback(factory.post('/api/payments/callback/', payload, format='json'))
+            assert response.status_code == 200
+
+        legacy_emails = Counter()
+        replay('legacy handler', deliveries, lambda payload: legacy_callback(payload, legacy_emails), args.threads)
+        print(f"  confirmation emails enqueued: {legacy_emails.value}")
+
+        tasks = Counter()
+        with patch('listings.views.process_payment_webhook.delay', tasks):
+            replay('event log', deliveries, event_log_callback, args.threads)
+            print(f"  processing tasks enqueued: {tasks.value}, events stored: {PaymentWebhookEvent.objects.count()}")
+
+            with CaptureQueriesContext(connection) as queries:
+                event_log_callback(deliveries[0])
+            print(f"  queries per duplicate delivery: {len(queries)}")
+            for query in queries.captured_queries:
+                print(f"    {query['sql'][:80]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from listings.services.amenity_service import AmenityService
+
+
+class Command(BaseCommand):
+    help = 'Populate Listing.amenity_flags from the comma-separated amenities text'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Listings updated per batch (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        updated = AmenityService.backfill(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Backfilled amenity flags ({updated} listings updated)')
+        )
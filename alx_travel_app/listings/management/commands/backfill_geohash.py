@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from listings.services.geo_service import GeoService
+
+
+class Command(BaseCommand):
+    help = 'Populate Location.geohash from the stored latitude and longitude'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Locations updated per batch (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        updated = GeoService.backfill(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Backfilled geohashes ({updated} locations updated)')
+        )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from listings.services.export_service import BookingExportService, ExportParamsError
+
+
+class Command(BaseCommand):
+    help = 'Stream bookings joined to their payments as CSV or NDJSON'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            choices=list(BookingExportService.FORMATS),
+            default='csv',
+            help='Export format (default: csv)'
+        )
+        parser.add_argument(
+            '--file',
+            help='Write to this path instead of stdout'
+        )
+        parser.add_argument('--date-from', help='First booking creation date, YYYY-MM-DD')
+        parser.add_argument('--date-to', help='Last booking creation date, YYYY-MM-DD')
+        parser.add_argument('--status', help='Comma-separated booking statuses')
+        parser.add_argument('--payment-status', help='Comma-separated payment statuses')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Bookings read per query (default: 2000)'
+        )
+    
+    def handle(self, *args, **options):
+        params = {
+            'date_from': options['date_from'],
+            'date_to': options['date_to'],
+            'status': options['status'],
+            'payment_status': options['payment_status'],
+        }
+        try:
+            export = BookingExportService.from_params(params, batch_size=options['batch_size'])
+        except ExportParamsError as e:
+            raise CommandError(str(e))
+        
+        if options['file']:
+            with open(options['file'], 'w', newline='', encoding='utf-8') as target:
+                target.writelines(export.stream(options['output']))
+            self.stdout.write(self.style.SUCCESS(f"Exported bookings to {options['file']}"))
+        else:
+            for chunk in export.stream(options['output']):
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DOC_PACKAGES = ('drf_yasg', 'drf_spectacular')
+
+# Runs in a fresh interpreter under -X importtime; each phase is what a web
+# worker does before it can serve its first request
+PROBE = '''
+import json, sys, time
+phases = {}
+start = mark = time.perf_counter()
+def lap(name):
+    global mark
+    now = time.perf_counter()
+    phases[name] = (now - mark) * 1000
+    mark = now
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+lap('settings')
+django.setup(set_prefix=False)
+lap('app registry')
+from django.core.handlers.wsgi import WSGIHandler
+WSGIHandler()
+lap('middleware')
+from django.urls import get_resolver
+get_resolver().url_patterns
+lap('urls')
+print(json.dumps({
+    'phases': phases,
+    'total_ms': (time.perf_counter() - start) * 1000,
+    'module_count': len(sys.modules),
+}))
+'''
+
+
+def parse_importtime(output):
+    """
+    Parse -X importtime output into (module, self_us, cumulative_us, depth)
+    tuples, in import order
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def package_totals(imports):
+    """Self import time and module count per top-level package, slowest first"""
+    totals = defaultdict(lambda: [0, 0])
+    for name, self_us, _, _ in imports:
+        package = totals[name.split('.')[0]]
+        package[0] += self_us
+        package[1] += 1
+    return sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+
+
+class Command(BaseCommand):
+    help = 'Profile a cold start: import cost per module and time spent loading settings, apps, middleware and URLs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=15,
+            help='Number of packages and modules to list (default: 15)'
+        )
+        parser.add_argument(
+            '--sort',
+            choices=('self', 'cumulative'),
+            default='cumulative',
+            help='Order modules by their own import time or including what they import'
+        )
+        parser.add_argument(
+            '--api-docs',
+            choices=('on', 'off'),
+            default=None,
+            help='Override API_DOCS for the profiled start (default: current setting)'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the full profile as JSON'
+        )
+
+    def profile(self, api_docs=None):
+        env = os.environ.copy()
+        env.setdefault('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+        if api_docs:
+            env['API_DOCS'] = 'True' if api_docs == 'on' else 'False'
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', PROBE],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Profiled start failed:\n{result.stderr[-2000:]}')
+        profile = json.loads(result.stdout.strip().splitlines()[-1])
+        profile['imports'] = parse_importtime(result.stderr)
+        return profile
+
+    def handle(self, *args, **options):
+        profile = self.profile(options['api_docs'])
+        imports = profile.pop('imports')
+        packages = package_totals(imports)
+        key = 1 if options['sort'] == 'self' else 2
+        slowest = sorted(imports, key=lambda entry: entry[key], reverse=True)
+        doc_stacks = [name for name in DOC_PACKAGES if name in dict(packages)]
+
+        if options['json']:
+            profile['packages'] = {
+                name: {'self_ms': self_us / 1000, 'modules': count} for name, (self_us, count) in packages
+            }
+            profile['imports'] = [
+                {'module': name, 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000, 'depth': depth}
+                for name, self_us, cumulative_us, depth in imports
+            ]
+            profile['doc_stacks'] = doc_stacks
+            self.stdout.write(json.dumps(profile))
+            return
+
+        self.stdout.write('Startup phases:')
+        for phase, ms in profile['phases'].items():
+            self.stdout.write(f'  {phase:<14} {ms:8.1f}ms')
+        self.stdout.write(f"  {'total':<14} {profile['total_ms']:8.1f}ms ({profile['module_count']} modules)")
+        self.stdout.write(f"API doc stacks loaded: {', '.join(doc_stacks) or 'none'}")
+
+        self.stdout.write("\nSlowest packages (self import time of all their modules):")
+        for name, (self_us, count) in packages[:options['top']]:
+            self.stdout.write(f'  {name:<30} {self_us / 1000:8.1f}ms  {count:4} modules')
+
+        self.stdout.write(f"\nSlowest modules ({options['sort']} import time):")
+        for name, self_us, cumulative_us, _ in slowest[:options['top']]:
+            self.stdout.write(f'  {name:<50} self {self_us / 1000:7.1f}ms  cumulative {cumulative_us / 1000:7.1f}ms')
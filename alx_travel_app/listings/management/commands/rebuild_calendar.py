@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from listings.services.availability_service import AvailabilityCalendar
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-night availability calendar from existing bookings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--listing',
+            action='append',
+            dest='listings',
+            help='Only rebuild the given listing id (can be repeated)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Calendar rows inserted per batch (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        nights = AvailabilityCalendar.rebuild(
+            listing_ids=options['listings'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt availability calendar ({nights} booked nights)')
+        )
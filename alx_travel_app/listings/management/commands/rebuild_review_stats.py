@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from listings.services.review_stats import ReviewStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized listing review aggregates from the reviews table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--listing',
+            action='append',
+            dest='listings',
+            help='Only rebuild the given listing id (can be repeated)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Listings updated per batch (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        corrected = ReviewStats.rebuild(
+            listing_ids=options['listings'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt review aggregates ({corrected} listings corrected)')
+        )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from listings.services.fulltext_service import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the listing full-text search index'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Listings indexed per batch where the backend indexes in batches (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = backend.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {type(backend).__name__} index ({indexed} listings)')
+        )
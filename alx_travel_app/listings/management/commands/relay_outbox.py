@@ -0,0 +1,48 @@
+import json
+from django.core.management.base import BaseCommand
+from listings.services.outbox_service import OutboxRelay
+
+
+class Command(BaseCommand):
+    help = 'Publish outbox messages to Celery in batches'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Messages published per batch (default: OUTBOX_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Seconds to wait when the outbox is empty (default: OUTBOX_POLL_INTERVAL)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the outbox once and exit instead of polling'
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print outbox depth, lag and throughput as JSON and exit'
+        )
+    
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(OutboxRelay.stats()))
+            return
+        
+        relay = OutboxRelay(batch_size=options['batch_size'], interval=options['interval'])
+        if options['once']:
+            published = relay.drain()
+            pruned = relay.prune()
+            self.stdout.write(
+                self.style.SUCCESS(f'Relayed {published} outbox messages, pruned {pruned}')
+            )
+            return
+        
+        self.stdout.write(f'Relaying outbox every {relay.interval}s (batch size {relay.batch_size})')
+        relay.run()
@@ -2,6 +2,7 @@ import random
 import uuid
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
 from django.utils.text import slugify
@@ -11,6 +12,8 @@ from listings.models import (
     Category, Location, Listing, ListingImage, 
     Review, Booking, Favorite
 )
+from listings.services.availability_service import AvailabilityCalendar
+from listings.services.seed_service import BulkSeeder
 
 
 class Command(BaseCommand):
@@ -57,11 +60,33 @@ class Command(BaseCommand):
             default='mixed',
             help='Locale for fake data (en_US, en_GB, es_ES, fr_FR, de_DE, it_IT, ja_JP, or mixed)'
         )
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='Bulk-insert rows, checking uniqueness and overlaps in memory (for large load-test datasets)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows inserted per batch in --fast mode (default: 5000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Processes generating reviews, bookings and favorites in --fast mode (default: 1)'
+        )
     
     def handle(self, *args, **options):
         if options['locale'] != 'mixed':
             self.fake = Faker(options['locale'])
         
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+        if options['workers'] > 1 and not options['fast']:
+            raise CommandError('--workers requires --fast')
+        
         if options['clear']:
             self.stdout.write(
                 self.style.WARNING('Clearing existing data...')
@@ -72,21 +97,51 @@ class Command(BaseCommand):
             with transaction.atomic():
                 self.create_categories()
                 self.create_locations()
-                self.create_users(options['users'])
-                self.create_listings(options['listings'])
-                self.create_reviews(options['reviews'])
-                self.create_bookings(options['bookings'])
-                self.create_favorites()
-                
-                self.stdout.write(
-                    self.style.SUCCESS('Successfully seeded the database!')
-                )
+                if options['fast']:
+                    self.seed_fast(options)
+                else:
+                    self.create_users(options['users'])
+                    self.create_listings(options['listings'])
+                    self.create_reviews(options['reviews'])
+                    self.create_bookings(options['bookings'])
+                    self.create_favorites()
+            
+            if options['fast']:
+                # Raw inserts skip the signal that indexes listing text
+                call_command('rebuild_search_index', batch_size=options['batch_size'], stdout=self.stdout)
+            
+            self.stdout.write(
+                self.style.SUCCESS('Successfully seeded the database!')
+            )
         except Exception as e:
             self.stdout.write(
                 self.style.ERROR(f'Error seeding database: {str(e)}')
             )
             raise CommandError(f'Failed to seed database: {str(e)}')
     
+    def seed_fast(self, options):
+        """Seed users, listings, reviews, bookings and favorites with batched raw inserts"""
+        seeder = BulkSeeder(self.fake, batch_size=options['batch_size'], workers=options['workers'])
+        
+        count = seeder.create_users(options['users'])
+        self.stdout.write(f'Created {count} users')
+        
+        categories = list(Category.objects.order_by('pk').values_list('id', flat=True))
+        locations = list(Location.objects.order_by('pk').values_list('id', flat=True))
+        users = list(User.objects.order_by('pk').values_list('id', flat=True))
+        if not categories or not locations or not users:
+            raise CommandError("Need categories, locations, and users before creating listings")
+        count = seeder.create_listings(options['listings'], categories, locations, users)
+        self.stdout.write(f'Created {count} listings')
+        
+        seeder.published_listings()
+        count = seeder.create_reviews(options['reviews'], users)
+        self.stdout.write(f'Created {count} reviews')
+        count = seeder.create_bookings(options['bookings'], users)
+        self.stdout.write(f'Created {count} bookings')
+        count = seeder.create_favorites(users)
+        self.stdout.write(f'Created {count} favorites')
+    
     def clear_data(self):
         """Clear existing data"""
         models_to_clear = [
@@ -283,15 +338,8 @@ class Command(BaseCommand):
                 bathrooms = random.randint(1, 3)
             
             # Generate amenities
-            all_amenities = [
-                'WiFi', 'Kitchen', 'Parking', 'Pool', 'Air Conditioning', 'Heating',
-                'Washer', 'Dryer', 'TV', 'Fireplace', 'Balcony', 'Garden', 'Gym',
-                'Hot Tub', 'BBQ Grill', 'Beach Access', 'Mountain View', 'City View',
-                'Pet Friendly', 'Wheelchair Accessible', 'Smoking Allowed',
-                'Family Friendly', 'Business Center', 'Concierge', 'Room Service'
-            ]
             selected_amenities = self.fake.random_elements(
-                elements=all_amenities, 
+                elements=Listing.AMENITIES, 
                 length=random.randint(3, 8), 
                 unique=True
             )
@@ -429,13 +477,8 @@ class Command(BaseCommand):
             duration = self.fake.random_int(min=min_stay, max=min(max_stay, 14))
             end_date = start_date + timedelta(days=duration)
             
-            # Check for overlapping bookings
-            if Booking.objects.filter(
-                listing=listing,
-                check_in_date__lt=end_date,
-                check_out_date__gt=start_date,
-                status__in=['confirmed', 'pending']
-            ).exists():
+            # Check the availability calendar for overlapping bookings
+            if not AvailabilityCalendar.is_available(listing.id, start_date, end_date):
                 continue
             
             guests = self.fake.random_int(min=1, max=min(listing.max_guests, 6))
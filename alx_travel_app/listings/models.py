@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.urls import reverse
 import uuid
@@ -44,13 +45,36 @@ class Location(TimestampedModel):
     country = models.CharField(max_length=100)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    geohash = models.CharField(
+        max_length=12, blank=True, editable=False,
+        help_text="Geohash of latitude/longitude, kept in sync on save"
+    )
     
     class Meta:
         unique_together = ['name', 'city', 'state', 'country']
         ordering = ['country', 'state', 'city', 'name']
+        indexes = [
+            models.Index(fields=['city']),
+            models.Index(fields=['geohash']),
+        ]
     
     def __str__(self):
         return f"{self.name}, {self.city}, {self.state}, {self.country}"
+    
+    def save(self, *args, **kwargs):
+        self.geohash = self.compute_geohash(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+    
+    @staticmethod
+    def compute_geohash(latitude, longitude):
+        """Return the geohash of the coordinates, or '' when either is missing"""
+        if latitude is None or longitude is None:
+            return ''
+        from .services.geo_service import encode
+        return encode(latitude, longitude)
 
 class Listing(TimestampedModel):
     """
@@ -74,6 +98,16 @@ class Listing(TimestampedModel):
         ('archived', 'Archived'),
     ]
     
+    # Amenity vocabulary backing amenity_flags; bit i is AMENITIES[i],
+    # so only ever append to this list
+    AMENITIES = [
+        'WiFi', 'Kitchen', 'Parking', 'Pool', 'Air Conditioning', 'Heating',
+        'Washer', 'Dryer', 'TV', 'Fireplace', 'Balcony', 'Garden', 'Gym',
+        'Hot Tub', 'BBQ Grill', 'Beach Access', 'Mountain View', 'City View',
+        'Pet Friendly', 'Wheelchair Accessible', 'Smoking Allowed',
+        'Family Friendly', 'Business Center', 'Concierge', 'Room Service'
+    ]
+    
     # Basic Information
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=200)
@@ -97,6 +131,10 @@ class Listing(TimestampedModel):
     
     # Features
     amenities = models.TextField(blank=True, help_text="Comma-separated list of amenities")
+    amenity_flags = models.BigIntegerField(
+        default=0, editable=False,
+        help_text="Bitmask of the known AMENITIES listed in amenities, kept in sync on save"
+    )
     house_rules = models.TextField(blank=True)
     
     # Availability
@@ -113,6 +151,16 @@ class Listing(TimestampedModel):
     # Stats
     view_count = models.PositiveIntegerField(default=0)
     
+    # Review aggregates, maintained from Review signals by ReviewStats
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_average = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -120,6 +168,11 @@ class Listing(TimestampedModel):
             models.Index(fields=['category', 'location']),
             models.Index(fields=['price_per_night']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['location', 'status', 'is_available', 'max_guests']),
+            models.Index(fields=['status', 'is_available', 'rating_average']),
+            # Keyset pagination of the public and per-host listing lists
+            models.Index(fields=['status', 'created_at', 'id']),
+            models.Index(fields=['host', 'created_at', 'id']),
         ]
     
     def __str__(self):
@@ -128,16 +181,36 @@ class Listing(TimestampedModel):
     def get_absolute_url(self):
         return reverse('listing-detail', kwargs={'slug': self.slug})
     
+    def save(self, *args, **kwargs):
+        self.amenity_flags = self.amenity_mask(self.get_amenities_list())
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'amenities' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'amenity_flags'}
+        super().save(*args, **kwargs)
+    
     def get_amenities_list(self):
         """Return amenities as a list"""
         if self.amenities:
             return [amenity.strip() for amenity in self.amenities.split(',')]
         return []
     
+    @classmethod
+    def amenity_mask(cls, names):
+        """Return the bitmask for names; names outside AMENITIES are ignored"""
+        bits = {amenity.lower(): 1 << index for index, amenity in enumerate(cls.AMENITIES)}
+        mask = 0
+        for name in names:
+            mask |= bits.get(name.strip().lower(), 0)
+        return mask
+    
+    def get_rating_histogram(self):
+        """Return {rating: review count} for ratings 1-5"""
+        return {rating: getattr(self, f'rating_{rating}_count') for rating in range(1, 6)}
+    
     def increment_view_count(self):
-        """Increment view count"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """Record a view; buffered counts are flushed to view_count periodically"""
+        from .services.view_counter import ViewCounter
+        ViewCounter().record(self.pk)
 
 class ListingImage(TimestampedModel):
     """
@@ -168,10 +241,30 @@ class Review(TimestampedModel):
     class Meta:
         unique_together = ['listing', 'user']
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of all reviews and of one listing's reviews
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['listing', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"Review by {self.user.username} for {self.listing.title}"
 
+class BookingQuerySet(models.QuerySet):
+    # Fields that decide which calendar nights a booking holds
+    CALENDAR_FIELDS = {'listing', 'listing_id', 'check_in_date', 'check_out_date', 'status'}
+    
+    def update(self, **kwargs):
+        """Update bookings, re-syncing the calendar when their held nights may change"""
+        if not self.CALENDAR_FIELDS & set(kwargs):
+            return super().update(**kwargs)
+        from .services.availability_service import AvailabilityCalendar
+        with transaction.atomic(using=self.db):
+            booking_ids = list(self.values_list('pk', flat=True))
+            updated = super().update(**kwargs)
+            AvailabilityCalendar.sync_bookings(booking_ids)
+        return updated
+
 class Booking(TimestampedModel):
     """
     Booking model for reservations
@@ -197,12 +290,30 @@ class Booking(TimestampedModel):
     # Additional info
     special_requests = models.TextField(blank=True)
     
+    # Statuses that hold the listing's nights
+    ACTIVE_STATUSES = ['pending', 'confirmed']
+    
+    objects = BookingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Backs the overlap anti-join used by availability search
+            models.Index(fields=['listing', 'status', 'check_in_date', 'check_out_date']),
+            # Keyset pagination of all bookings and of a user's bookings
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['user', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"Booking {self.id} - {self.listing.title}"
     
+    def save(self, *args, **kwargs):
+        # The post_save calendar sync fails on nights held by another
+        # booking; one transaction rolls the booking back with it
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+    
     @property
     def duration(self):
         """Return booking duration in days"""
@@ -214,6 +325,23 @@ class Booking(TimestampedModel):
         if self.check_in_date >= self.check_out_date:
             raise ValidationError("Check-out date must be after check-in date")
 
+class CalendarNight(models.Model):
+    """
+    Per-night availability calendar: one row for every night held by an
+    active booking. The unique (listing, night) pair doubles as the index
+    used for date-range availability lookups.
+    """
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='calendar_nights')
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='calendar_nights')
+    night = models.DateField()
+    
+    class Meta:
+        unique_together = ['listing', 'night']
+        ordering = ['listing', 'night']
+    
+    def __str__(self):
+        return f"{self.listing_id} booked on {self.night}"
+
 class Favorite(TimestampedModel):
     """
     User favorites/wishlist
@@ -223,10 +351,41 @@ class Favorite(TimestampedModel):
     
     class Meta:
         unique_together = ['user', 'listing']
+        indexes = [
+            # Keyset pagination of a user's favorites
+            models.Index(fields=['user', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.listing.title}"
 
+class PaymentQuerySet(models.QuerySet):
+    """
+    Payment querysets shaped for the payment endpoints: each loads the
+    payment and the related rows the endpoint touches in one query,
+    restricted to the columns it reads.
+    """
+    
+    def for_verification(self):
+        """Payment with its booking and the booking owner's email"""
+        return self.select_related('booking__user').only(
+            'id', 'transaction_id', 'amount', 'currency', 'status', 'payment_method',
+            'booking__id', 'booking__user__id', 'booking__user__email',
+        )
+    
+    def for_confirmation(self):
+        """Payment amount plus the booking id and owner's email, for workers"""
+        return self.select_related('booking__user').only(
+            'id', 'amount', 'booking__id', 'booking__user__id', 'booking__user__email',
+        )
+    
+    def for_status(self):
+        """Payment status fields plus the owning user's id"""
+        return self.select_related('booking').only(
+            'id', 'status', 'amount', 'currency', 'transaction_id', 'created_at', 'updated_at',
+            'booking__id', 'booking__user_id',
+        )
+
 class Payment(models.Model):
     PAYMENT_STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -246,8 +405,55 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PaymentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset scans over pending payments during reconciliation
+            models.Index(fields=['status', 'id']),
+        ]
     
     def __str__(self):
         return f"Payment {self.id} - {self.status}"
+
+class PaymentWebhookEvent(models.Model):
+    """
+    Log of Chapa webhook deliveries. The unique (tx_ref, event) pair makes
+    retried deliveries a single rejected insert.
+    """
+    tx_ref = models.CharField(max_length=255)
+    event = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['tx_ref', 'event']
+        ordering = ['-received_at']
+    
+    def __str__(self):
+        return f"Webhook {self.event} for {self.tx_ref}"
+
+class OutboxMessage(models.Model):
+    """
+    Celery task calls recorded in the same transaction as the rows they
+    concern. The outbox relay publishes them after commit, so a rollback
+    never sends anything and a slow broker never holds up a request.
+    """
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Pending messages in order, and dispatched messages by age
+            models.Index(fields=['dispatched_at', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task} ({'dispatched' if self.dispatched_at else 'pending'})"
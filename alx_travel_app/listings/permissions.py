@@ -0,0 +1,16 @@
+# alx_travel_app/listings/permissions.py
+
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+
+class IsAdminOrReadOnly(BasePermission):
+    """
+    Anyone may read; only staff may write. For shared reference data such
+    as categories and locations, whose deletion cascades to every listing
+    that uses them.
+    """
+
+    def has_permission(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        return bool(request.user and request.user.is_staff)
@@ -1,12 +1,244 @@
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
-from .models import Listing, Booking
+from .models import Category, Favorite, Location, Listing, Booking, Review
+from .services.fulltext_service import highlight
+from .services.review_stats import AGGREGATE_FIELDS
+
+class CategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = '__all__'
+
+class LocationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Location
+        fields = '__all__'
 
 class ListingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Listing
         fields = '__all__'
+        read_only_fields = ['host', 'view_count', *AGGREGATE_FIELDS]
+
+class ValuesRowSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for list endpoints and sparse detail reads.
+
+    Renders the dicts of ``QuerySet.values()`` with one plain converter
+    per column, picked once from the model field type, instead of
+    building a model instance per row and running every DRF field's
+    to_representation. Output matches the ModelSerializer for the same
+    fields. Views pass their queryset through ``rows()`` first.
+
+    ``fields`` narrows the output to any of Meta.sparse_fields (Meta.fields
+    by default) and ``include`` embeds the Meta.includes columns of a
+    related row in place of its id, so only the requested columns and
+    joins are read.
+    """
+    # Always selected: the id is always returned and cursors need both
+    key_fields = ('id', 'created_at')
+
+    class Meta:
+        model = None
+        fields = ()
+        sparse_fields = ()
+        includes = {}
+
+    def __init__(self, *args, fields=None, include=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.field_names = self.output_fields(fields, include)
+        self.include = tuple(include)
+
+    @classmethod
+    def output_fields(cls, fields=None, include=()):
+        names = ['id', *(name for name in fields or cls.Meta.fields if name != 'id')]
+        return tuple(names + [relation for relation in include if relation not in names])
+
+    @classmethod
+    def parse_fieldset(cls, fields=None, include=None):
+        """
+        Validate comma-separated ``fields`` and ``include`` query values.
+
+        Returns (field names or None for the default set, relation names);
+        raises ValueError naming anything unknown.
+        """
+        names = [name.strip() for name in (fields or '').split(',') if name.strip()]
+        relations = [name.strip() for name in (include or '').split(',') if name.strip()]
+        unknown = [name for name in names if name not in cls.Meta.sparse_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        unknown = [name for name in relations if name not in cls.Meta.includes]
+        if unknown:
+            raise ValueError(
+                f"Unknown include: {', '.join(unknown)}; choose from {', '.join(cls.Meta.includes)}"
+            )
+        return names or None, relations
+
+    @classmethod
+    def rows(cls, queryset, fields=None, include=()):
+        columns = {*cls.key_fields, *cls.output_fields(fields, include)} - set(include)
+        for relation in include:
+            columns.update(f'{relation}__{column}' for column in cls.Meta.includes[relation])
+        return queryset.values(*columns)
+
+    @property
+    def converters(self):
+        if not hasattr(self, '_converters'):
+            meta = self.Meta.model._meta
+            self._converters = [
+                (name, self.get_converter(meta.get_field(name)))
+                for name in self.field_names if name not in self.include
+            ]
+            self._include_converters = [
+                (relation, [
+                    (column, self.get_converter(meta.get_field(relation).related_model._meta.get_field(column)))
+                    for column in self.Meta.includes[relation]
+                ])
+                for relation in self.include
+            ]
+        return self._converters
+
+    def get_converter(self, field):
+        """Callable rendering a non-null value of field, or None to pass it through"""
+        if field.is_relation:
+            # Like PrimaryKeyRelatedField, the raw pk is left to the renderer
+            return None
+        if isinstance(field, (models.UUIDField, models.DecimalField)):
+            return str
+        if isinstance(field, models.DateTimeField):
+            return self.datetime_converter()
+        if isinstance(field, models.DateField):
+            return lambda value: value.isoformat()
+        if isinstance(field, models.FileField):
+            return self.file_url_converter(field.storage)
+        return None
+
+    @staticmethod
+    def datetime_converter():
+        current = timezone.get_current_timezone()
+
+        def convert(value):
+            if timezone.is_aware(value):
+                value = value.astimezone(current)
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return convert
+
+    def file_url_converter(self, storage):
+        # Empty file fields are stored as ''
+        request = self.context.get('request')
+        if isinstance(storage, FileSystemStorage):
+            # Resolve the absolute media URL once rather than per row
+            base_url = storage.url('')
+            if request is not None:
+                base_url = request.build_absolute_uri(base_url)
+            return lambda value: base_url + filepath_to_uri(value).lstrip('/') if value else None
+        if request is not None:
+            return lambda value: request.build_absolute_uri(storage.url(value)) if value else None
+        return lambda value: storage.url(value) if value else None
+
+    @staticmethod
+    def convert_row(row, converters, prefix=''):
+        data = {}
+        for name, convert in converters:
+            value = row[prefix + name]
+            if value is not None and convert is not None:
+                value = convert(value)
+            data[name] = value
+        return data
+
+    def to_representation(self, row):
+        data = self.convert_row(row, self.converters)
+        for relation, converters in self._include_converters:
+            if row[f'{relation}__id'] is None:
+                data[relation] = None
+            else:
+                data[relation] = self.convert_row(row, converters, prefix=f'{relation}__')
+        return data
+
+# Columns embedded by ?include=; users only ever expose public profile fields
+LOCATION_COLUMNS = ('id', 'name', 'city', 'state', 'country', 'latitude', 'longitude')
+CATEGORY_COLUMNS = ('id', 'name', 'slug')
+USER_COLUMNS = ('id', 'username', 'first_name', 'last_name')
+
+class ListingListSerializer(ValuesRowSerializer):
+    """Compact listing rows for list endpoints; detail views keep ListingSerializer"""
+
+    class Meta:
+        model = Listing
+        fields = (
+            'id', 'slug', 'title', 'listing_type', 'status', 'category', 'location',
+            'price_per_night', 'currency', 'max_guests', 'bedrooms', 'bathrooms', 'main_image',
+            'is_available', 'rating_average', 'review_count', 'created_at',
+        )
+        sparse_fields = tuple(field.name for field in Listing._meta.concrete_fields)
+        includes = {'location': LOCATION_COLUMNS, 'category': CATEGORY_COLUMNS, 'host': USER_COLUMNS}
+
+class ListingDetailSerializer(ListingSerializer):
+    category = CategorySerializer(read_only=True)
+    location = LocationSerializer(read_only=True)
+    rating_histogram = serializers.DictField(source='get_rating_histogram', read_only=True)
+
+class ListingSearchResultSerializer(ListingSerializer):
+    """Listing with its full-text rank, highlighted matches and distance"""
+    search_rank = serializers.FloatField(read_only=True)
+    distance_km = serializers.FloatField(read_only=True)
+    highlights = serializers.SerializerMethodField()
+
+    def get_highlights(self, obj):
+        terms = self.context.get('search_terms', [])
+        if not terms:
+            return None
+        return {
+            'title': highlight(obj.title, terms),
+            'description': highlight(obj.description, terms, max_length=200),
+        }
+
+class ReviewSerializer(serializers.ModelSerializer):
+    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = Review
+        fields = '__all__'
+        read_only_fields = ['is_verified']
 
 class BookingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Booking
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        # Bookings belong to the requesting user and start out pending
+        read_only_fields = ['user', 'status', 'total_price']
+
+class FavoriteSerializer(serializers.ModelSerializer):
+    listing = ListingSerializer(read_only=True)
+
+    class Meta:
+        model = Favorite
+        fields = ['id', 'listing', 'created_at']
+
+class BookingListSerializer(ValuesRowSerializer):
+    """Compact booking rows for list endpoints"""
+
+    class Meta:
+        model = Booking
+        fields = (
+            'id', 'listing', 'user', 'check_in_date', 'check_out_date', 'guests',
+            'total_price', 'status', 'created_at',
+        )
+        sparse_fields = tuple(field.name for field in Booking._meta.concrete_fields)
+        includes = {
+            'listing': ('id', 'slug', 'title', 'main_image', 'price_per_night', 'currency'),
+            'user': USER_COLUMNS,
+        }
+
+class BookingRequestSerializer(serializers.Serializer):
+    check_in_date = serializers.DateField()
+    check_out_date = serializers.DateField()
+    guests = serializers.IntegerField(min_value=1)
+    special_requests = serializers.CharField(required=False, allow_blank=True, default='')
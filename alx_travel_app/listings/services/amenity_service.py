@@ -0,0 +1,62 @@
+# listings/services/amenity_service.py
+
+import logging
+from django.db.models import F
+from ..models import Listing
+from .backfill import backfill_column
+
+logger = logging.getLogger(__name__)
+
+
+class AmenityService:
+    """
+    Amenity filters on Listing.amenity_flags.
+
+    Each amenity of the fixed Listing.AMENITIES vocabulary is one bit, so
+    "has Pool and WiFi" is a single ``flags & mask = mask`` test instead of
+    one LIKE over the amenities text per amenity. No B-tree index can answer
+    a bitwise test: it is still evaluated row by row over whatever the other
+    filters (e.g. the (status, is_available) index) leave, just far more
+    cheaply than the LIKE chain. An (amenity, listing) link table was
+    measured and was slower, as each amenity matches about a fifth of all
+    listings and no single-amenity index is selective. So was a
+    ``flags >= mask`` range prefilter on a (status, amenity_flags) index:
+    it sped up counts but led the planner away from the created_at index,
+    making first pages 10-50x slower.
+    """
+
+    @staticmethod
+    def parse_filter(value):
+        """Split an ``amenities=Pool,WiFi`` query value into names"""
+        return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+    @staticmethod
+    def filter_listings(queryset, names):
+        """Restrict queryset to listings that have every amenity in names"""
+        if not names:
+            return queryset
+        mask = 0
+        for name in names:
+            bit = Listing.amenity_mask([name])
+            if not bit:
+                # Amenities outside the vocabulary are never flagged
+                return queryset.none()
+            mask |= bit
+        return queryset.alias(matched_amenities=F('amenity_flags').bitand(mask)).filter(
+            matched_amenities=mask
+        )
+
+    @staticmethod
+    def backfill(batch_size=1000):
+        """
+        Recompute amenity_flags from the amenities text of every listing.
+
+        Returns the number of listings whose flags changed.
+        """
+        updated = backfill_column(
+            Listing, 'amenity_flags', ('amenities',),
+            lambda amenities: Listing.amenity_mask(amenities.split(',')) if amenities else 0,
+            batch_size
+        )
+        logger.info(f"Backfilled amenity flags for {updated} listings")
+        return updated
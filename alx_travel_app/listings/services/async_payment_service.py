@@ -0,0 +1,142 @@
+# listings/services/async_payment_service.py
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+import aiohttp
+from django.conf import settings
+from .payment_service import BaseChapaPaymentService
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def build_client():
+    """
+    Build a pooled keep-alive aiohttp session for the Chapa API
+    """
+    connect_timeout = getattr(settings, 'CHAPA_CONNECT_TIMEOUT', 3.05)
+    read_timeout = getattr(settings, 'CHAPA_READ_TIMEOUT', 30)
+    pool_size = getattr(settings, 'CHAPA_ASYNC_POOL_MAXSIZE', 100)
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=30),
+        timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+    )
+
+
+def get_client():
+    """
+    Return the Chapa client bound to the running event loop.
+
+    aiohttp sessions cannot be shared between event loops, so one session
+    is kept per loop; an ASGI worker runs a single loop and therefore reuses
+    one connection pool for every request.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.closed:
+        client = _clients[loop] = build_client()
+    return client
+
+
+@asynccontextmanager
+async def chapa_client(shared=True):
+    """
+    Yield a Chapa client for one call.
+
+    shared=True yields the pooled session of the running loop, for ASGI
+    workers whose loop lives as long as the process. Under WSGI Django
+    runs each async view in a fresh event loop that is thrown away after
+    the request, so a pooled session would never be closed; pass
+    shared=False there to open a session for the call and close it on
+    exit.
+    """
+    if shared:
+        yield get_client()
+        return
+    client = build_client()
+    try:
+        yield client
+    finally:
+        await client.close()
+
+
+class AsyncChapaPaymentService(BaseChapaPaymentService):
+    """
+    Non-blocking Chapa client for async views.
+
+    While a request waits on the gateway the event loop keeps serving
+    other requests, so a slow gateway no longer pins a worker thread.
+    """
+    def __init__(self, client=None):
+        super().__init__()
+        self.client = client
+        self.max_retries = getattr(settings, 'CHAPA_MAX_RETRIES', 3)
+        self.retry_backoff = getattr(settings, 'CHAPA_RETRY_BACKOFF', 0.3)
+
+    def get_client(self):
+        return self.client or get_client()
+
+    async def initiate_payment(self, payment_data):
+        """
+        Initiate payment with Chapa API
+        """
+        try:
+            async with self.get_client().post(
+                self.initialize_url(),
+                json=self.build_payload(payment_data),
+                headers=self.headers
+            ) as response:
+                response.raise_for_status()
+                return self.parse_initiate_response(await response.json())
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Network error during payment initiation: {str(e)}")
+            return {
+                'success': False,
+                'error': 'Network error occurred. Please try again.'
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error during payment initiation: {str(e)}")
+            return {
+                'success': False,
+                'error': 'An unexpected error occurred. Please try again.'
+            }
+
+    async def verify_payment(self, tx_ref):
+        """
+        Verify payment status with Chapa API, retrying with backoff
+        """
+        try:
+            data = await self._get_json_with_retries(self.verify_url(tx_ref))
+            return self.parse_verify_response(data)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Network error during payment verification: {str(e)}")
+            return {
+                'success': False,
+                'error': 'Network error occurred during verification.'
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error during payment verification: {str(e)}")
+            return {
+                'success': False,
+                'error': 'An unexpected error occurred during verification.'
+            }
+
+    async def _get_json_with_retries(self, url):
+        client = self.get_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with client.get(url, headers=self.headers) as response:
+                    if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                        response.raise_for_status()
+                        return await response.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+            await asyncio.sleep(self.retry_backoff * (2 ** attempt))
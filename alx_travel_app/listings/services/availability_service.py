@@ -0,0 +1,123 @@
+# listings/services/availability_service.py
+
+import logging
+from datetime import date, timedelta
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from ..models import Booking, CalendarNight
+
+logger = logging.getLogger(__name__)
+
+
+class AvailabilityCalendar:
+    """
+    Keeps the CalendarNight table in step with bookings and answers
+    date-range availability questions from it.
+
+    Ranges are half-open: a booking from check_in to check_out holds the
+    nights check_in .. check_out - 1, so a new stay may start on another
+    stay's check-out day.
+    """
+
+    @staticmethod
+    def nights(check_in, check_out):
+        """Return the list of nights covered by [check_in, check_out)"""
+        # Instances created with ISO strings keep them until reloaded
+        if not isinstance(check_in, date):
+            check_in = parse_date(check_in)
+        if not isinstance(check_out, date):
+            check_out = parse_date(check_out)
+        return [check_in + timedelta(days=offset) for offset in range((check_out - check_in).days)]
+
+    @classmethod
+    def sync_booking(cls, booking):
+        """
+        Make the calendar reflect a single booking.
+
+        Active bookings hold their nights; any other status releases them.
+        A night already held by another booking raises IntegrityError from
+        the unique (listing, night) key, which rolls back the save that
+        triggered the sync. BookingService checks availability first so
+        callers get a BookingUnavailableError instead.
+        """
+        with transaction.atomic():
+            CalendarNight.objects.filter(booking=booking).delete()
+            if booking.status not in Booking.ACTIVE_STATUSES:
+                return
+            CalendarNight.objects.bulk_create([
+                CalendarNight(listing_id=booking.listing_id, booking=booking, night=night)
+                for night in cls.nights(booking.check_in_date, booking.check_out_date)
+            ])
+
+    @classmethod
+    def sync_bookings(cls, booking_ids):
+        """sync_booking for many bookings at once, e.g. after a queryset update"""
+        with transaction.atomic():
+            CalendarNight.objects.filter(booking_id__in=booking_ids).delete()
+            rows = Booking.objects.filter(pk__in=booking_ids, status__in=Booking.ACTIVE_STATUSES).values_list(
+                'id', 'listing_id', 'check_in_date', 'check_out_date'
+            )
+            CalendarNight.objects.bulk_create([
+                CalendarNight(listing_id=listing_id, booking_id=booking_id, night=night)
+                for booking_id, listing_id, check_in, check_out in rows
+                for night in cls.nights(check_in, check_out)
+            ])
+
+    @staticmethod
+    def held_nights(listing_ids, check_in, check_out):
+        """Calendar rows of the given listings inside [check_in, check_out)"""
+        return CalendarNight.objects.filter(
+            listing_id__in=listing_ids,
+            night__gte=check_in,
+            night__lt=check_out,
+        )
+
+    @classmethod
+    def unavailable_listing_ids(cls, listing_ids, check_in, check_out):
+        """Return the subset of listing_ids with at least one held night in range"""
+        return set(
+            cls.held_nights(listing_ids, check_in, check_out)
+            .values_list('listing_id', flat=True)
+            .distinct()
+        )
+
+    @classmethod
+    def is_available(cls, listing_id, check_in, check_out):
+        return not cls.held_nights([listing_id], check_in, check_out).exists()
+
+    @classmethod
+    def rebuild(cls, listing_ids=None, batch_size=1000):
+        """
+        Rebuild the calendar from active bookings.
+
+        Returns the number of booked nights processed. When listing_ids
+        is given only those listings are rebuilt.
+        """
+        nights = CalendarNight.objects.all()
+        bookings = Booking.objects.filter(status__in=Booking.ACTIVE_STATUSES)
+        if listing_ids is not None:
+            nights = nights.filter(listing_id__in=listing_ids)
+            bookings = bookings.filter(listing_id__in=listing_ids)
+
+        written = 0
+        with transaction.atomic():
+            nights.delete()
+            pending = []
+            rows = bookings.order_by('created_at').values_list(
+                'id', 'listing_id', 'check_in_date', 'check_out_date'
+            )
+            for booking_id, listing_id, check_in, check_out in rows.iterator(chunk_size=batch_size):
+                pending.extend(
+                    CalendarNight(listing_id=listing_id, booking_id=booking_id, night=night)
+                    for night in cls.nights(check_in, check_out)
+                )
+                if len(pending) >= batch_size:
+                    CalendarNight.objects.bulk_create(pending, ignore_conflicts=True)
+                    written += len(pending)
+                    pending = []
+            if pending:
+                CalendarNight.objects.bulk_create(pending, ignore_conflicts=True)
+                written += len(pending)
+
+        logger.info(f"Rebuilt availability calendar with {written} nights")
+        return written
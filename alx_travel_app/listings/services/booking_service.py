@@ -0,0 +1,156 @@
+# listings/services/booking_service.py
+
+import logging
+import time
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, transaction
+from ..models import Booking, Listing
+from .availability_service import AvailabilityCalendar
+from .outbox_service import Outbox
+
+logger = logging.getLogger(__name__)
+
+
+class BookingUnavailableError(ValidationError):
+    """Raised when the requested nights are already held by another booking"""
+
+
+class BookingService:
+    """
+    Race-free booking creation.
+
+    Each attempt runs in a short transaction that locks the listing row
+    with SELECT ... FOR UPDATE, checks the availability calendar and
+    inserts the booking, along with the outbox message for its
+    confirmation email. Concurrent requests for the same listing queue
+    on that single row lock, so they cannot interleave between the check
+    and the insert. Only one lock is taken per transaction, which keeps
+    lock ordering trivial and avoids deadlocks between listings.
+    """
+
+    max_attempts = 3
+    retry_delay = 0.05
+
+    @classmethod
+    def create_booking(cls, listing_id, user, check_in_date, check_out_date, guests,
+                       special_requests='', status='pending'):
+        """
+        Create a booking if the listing is free for [check_in_date, check_out_date).
+
+        Raises ValidationError for invalid input and BookingUnavailableError
+        when the nights are taken.
+        """
+        cls._validate_input(check_in_date, check_out_date, guests)
+        return cls._retry(
+            listing_id, cls._create_locked,
+            listing_id, user, check_in_date, check_out_date, guests, special_requests, status
+        )
+
+    @classmethod
+    def update_booking(cls, booking, **changes):
+        """
+        Apply changes to a booking under the same listing lock as creation.
+
+        When the changed booking holds nights it did not hold before (new
+        dates or guests, or a cancelled booking made active again) they
+        are checked like a new booking; total_price follows the dates.
+        Raises ValidationError and BookingUnavailableError like
+        create_booking, leaving the stored booking unchanged.
+        """
+        held = cls._holding(booking)
+        stay = (booking.listing_id, booking.check_in_date, booking.check_out_date)
+        for field, value in changes.items():
+            setattr(booking, field, value)
+        cls._validate_input(booking.check_in_date, booking.check_out_date, booking.guests)
+        return cls._retry(booking.listing_id, cls._update_locked, booking, held, stay)
+
+    @classmethod
+    def _retry(cls, listing_id, locked, *args):
+        for attempt in range(1, cls.max_attempts + 1):
+            try:
+                return locked(*args)
+            except OperationalError as e:
+                # Lock wait timeouts and deadlock victims are safe to retry
+                if attempt == cls.max_attempts:
+                    raise
+                logger.warning(f"Retrying booking for listing {listing_id} after lock error: {str(e)}")
+                time.sleep(cls.retry_delay * attempt)
+
+    @staticmethod
+    def _validate_input(check_in_date, check_out_date, guests):
+        if check_in_date >= check_out_date:
+            raise ValidationError("Check-out date must be after check-in date")
+        if guests < 1:
+            raise ValidationError("At least one guest is required")
+
+    @staticmethod
+    def _holding(booking):
+        """What the booking holds: (listing, dates, guests), or None when inactive"""
+        if booking.status not in Booking.ACTIVE_STATUSES:
+            return None
+        return (booking.listing_id, booking.check_in_date, booking.check_out_date, booking.guests)
+
+    @staticmethod
+    def _lock_listing(listing_id):
+        return (
+            Listing.objects.select_for_update()
+            .only('id', 'status', 'is_available', 'price_per_night', 'max_guests',
+                  'minimum_stay', 'maximum_stay')
+            .get(pk=listing_id)
+        )
+
+    @staticmethod
+    def _check_stay(listing, check_in_date, check_out_date, guests, exclude=None):
+        """Listing rules and calendar availability; call with the listing locked"""
+        nights = (check_out_date - check_in_date).days
+        if listing.status != 'published' or not listing.is_available:
+            raise BookingUnavailableError("Listing is not available for booking")
+        if guests > listing.max_guests:
+            raise ValidationError(f"Listing accepts at most {listing.max_guests} guests")
+        if nights < listing.minimum_stay:
+            raise ValidationError(f"Minimum stay is {listing.minimum_stay} nights")
+        if listing.maximum_stay and nights > listing.maximum_stay:
+            raise ValidationError(f"Maximum stay is {listing.maximum_stay} nights")
+
+        held = AvailabilityCalendar.held_nights([listing.id], check_in_date, check_out_date)
+        if exclude is not None:
+            held = held.exclude(booking=exclude)
+        if held.exists():
+            raise BookingUnavailableError("Listing is already booked for the selected dates")
+
+    @classmethod
+    def _create_locked(cls, listing_id, user, check_in_date, check_out_date, guests,
+                       special_requests, status):
+        nights = (check_out_date - check_in_date).days
+
+        with transaction.atomic():
+            listing = cls._lock_listing(listing_id)
+            cls._check_stay(listing, check_in_date, check_out_date, guests)
+
+            booking = Booking.objects.create(
+                listing=listing,
+                user=user,
+                check_in_date=check_in_date,
+                check_out_date=check_out_date,
+                guests=guests,
+                total_price=listing.price_per_night * nights,
+                status=status,
+                special_requests=special_requests,
+            )
+            if user and user.email:
+                Outbox.enqueue('listings.tasks.send_booking_confirmation_email', booking.id)
+            return booking
+
+    @classmethod
+    def _update_locked(cls, booking, held, stay):
+        holding = cls._holding(booking)
+
+        with transaction.atomic():
+            listing = cls._lock_listing(booking.listing_id)
+            if holding is not None and holding != held:
+                cls._check_stay(listing, booking.check_in_date, booking.check_out_date, booking.guests,
+                                exclude=booking)
+            if (booking.listing_id, booking.check_in_date, booking.check_out_date) != stay:
+                booking.total_price = listing.price_per_night * booking.duration
+            booking.save()
+            return booking
@@ -0,0 +1,85 @@
+# listings/services/cache_service.py
+
+import hashlib
+import json
+import logging
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import quote_etag
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(data):
+    """Strong ETag for a serialized representation"""
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return quote_etag(hashlib.md5(body.encode()).hexdigest())
+
+
+class ResponseCache:
+    """
+    Versioned cache of serialized detail responses.
+
+    Every object has a version counter next to its cached entries, and an
+    entry is stored under the version read *before* the database was
+    queried. Invalidation only bumps the counter, so a reader that raced
+    a write can never publish its stale copy under the current version.
+    Counters start from a timestamp, which keeps an evicted counter from
+    wrapping back onto an old entry. Variants (e.g. sparse fieldsets) of
+    an object share its counter, so one bump invalidates all of them.
+    """
+
+    def __init__(self, namespace, timeout=None):
+        self.namespace = namespace
+        self._timeout = timeout
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+    def version_key(self, lookup):
+        return f'response:{self.namespace}:{lookup}:version'
+
+    def entry_key(self, lookup, version, variant=''):
+        key = f'response:{self.namespace}:{lookup}:{version}'
+        if variant:
+            key = f'{key}:{hashlib.md5(variant.encode()).hexdigest()}'
+        return key
+
+    def version(self, lookup):
+        key = self.version_key(lookup)
+        version = cache.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        return version
+
+    def get(self, lookup, variant=''):
+        """Return (version, entry); entry is None on a miss"""
+        version = self.version(lookup)
+        return version, cache.get(self.entry_key(lookup, version, variant))
+
+    def set(self, lookup, version, data, variant=''):
+        entry = {'etag': make_etag(data), 'data': data}
+        cache.set(self.entry_key(lookup, version, variant), entry, self.timeout)
+        return entry
+
+    def invalidate(self, *lookups):
+        for lookup in lookups:
+            key = self.version_key(lookup)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+        if lookups:
+            logger.debug(f"Invalidated {len(lookups)} cached {self.namespace} responses")
+
+
+listing_cache = ResponseCache('listing')
+category_cache = ResponseCache('category')
+location_cache = ResponseCache('location')
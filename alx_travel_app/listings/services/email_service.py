@@ -0,0 +1,239 @@
+# listings/services/email_service.py
+
+import json
+import logging
+import smtplib
+import threading
+from collections import deque
+from functools import lru_cache
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+# Server refusals that concern one message; other SMTP and socket errors
+# (a dropped or refused connection) stop the flush and leave the rest
+# queued for the next one
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+CONNECTION_ERRORS = (smtplib.SMTPException, OSError)
+
+
+class EmailDeliveryError(Exception):
+    """An email sent without a queue could not reach the mail server"""
+
+
+class RedisEmailQueue:
+    """
+    Queued emails in a Redis list shared by every worker.
+
+    A flush renames the live list to a flushing list in one atomic step,
+    so emails queued while it runs land in a fresh list. Messages are
+    trimmed from the front of the flushing list as they are handled; a
+    flush that dies half-way is resumed by the next one.
+    """
+    pending_key = 'email_queue:pending'
+    flushing_key = 'email_queue:flushing'
+    lock_key = 'email_queue:flush_lock'
+
+    def __init__(self, url):
+        import redis
+        self.redis = redis
+        self.client = redis.Redis.from_url(url)
+
+    def add(self, message):
+        self.client.rpush(self.pending_key, json.dumps(message))
+
+    def lock(self, timeout):
+        return self.client.lock(self.lock_key, timeout=timeout, blocking=False)
+
+    def drain(self):
+        if not self.client.exists(self.flushing_key):
+            try:
+                self.client.rename(self.pending_key, self.flushing_key)
+            except self.redis.ResponseError:
+                # Nothing has been queued since the last flush
+                return []
+        return [json.loads(message) for message in self.client.lrange(self.flushing_key, 0, -1)]
+
+    def acknowledge(self, count):
+        if count:
+            self.client.ltrim(self.flushing_key, count, -1)
+
+
+class MemoryEmailQueue:
+    """
+    Per-process queue for tests and benchmarks.
+
+    Only the process that queued a message can flush it, so it is never
+    picked automatically; without EMAIL_QUEUE_REDIS_URL emails are sent
+    as soon as their task runs.
+    """
+
+    def __init__(self):
+        self.mutex = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.pending = deque()
+        self.flushing = deque()
+
+    def add(self, message):
+        with self.mutex:
+            self.pending.append(message)
+
+    def lock(self, timeout):
+        return self.flush_lock
+
+    def drain(self):
+        with self.mutex:
+            if not self.flushing:
+                self.flushing, self.pending = self.pending, deque()
+            return list(self.flushing)
+
+    def acknowledge(self, count):
+        with self.mutex:
+            for _ in range(count):
+                self.flushing.popleft()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """Return the process-wide email queue, or None when emails are sent straight away"""
+    global _queue
+    url = getattr(settings, 'EMAIL_QUEUE_REDIS_URL', '')
+    if not url:
+        return None
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = RedisEmailQueue(url)
+    return _queue
+
+
+@lru_cache(maxsize=None)
+def _template(name):
+    # Loaded and compiled once per process rather than on every render
+    return get_template(name)
+
+
+class ConfirmationEmails:
+    """
+    Payment and booking confirmation emails, batched.
+
+    Tasks queue a small JSON message instead of talking to SMTP. A
+    periodic flush renders the queued messages with templates compiled
+    once per process and sends them over a single SMTP connection,
+    batch_size at a time, instead of one connection (and TLS handshake)
+    per email. Without a queue a message is sent when it is queued.
+    """
+
+    def __init__(self, queue=None, batch_size=None):
+        self.queue = queue if queue is not None else get_queue()
+        self.batch_size = batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 100)
+
+    @staticmethod
+    def payment_confirmation(to, booking_id, amount):
+        return {'kind': 'payment_confirmation', 'to': to, 'booking_id': str(booking_id), 'amount': str(amount)}
+
+    @staticmethod
+    def booking_confirmation(to, booking_id):
+        return {'kind': 'booking_confirmation', 'to': to, 'booking_id': str(booking_id)}
+
+    @staticmethod
+    def build(message):
+        """Return the EmailMessage for a queued message"""
+        if message['kind'] == 'payment_confirmation':
+            html_message = _template('emails/payment_confirmation.html').render({
+                'booking_id': message['booking_id'],
+                'amount': message['amount'],
+            })
+            email = EmailMultiAlternatives(
+                'Payment Confirmation - Booking Confirmed',
+                strip_tags(html_message),
+                settings.EMAIL_HOST_USER,
+                [message['to']],
+            )
+            email.attach_alternative(html_message, 'text/html')
+            return email
+        if message['kind'] == 'booking_confirmation':
+            return EmailMessage(
+                'Booking Confirmation',
+                f"Your booking with ID {message['booking_id']} has been confirmed!",
+                settings.DEFAULT_FROM_EMAIL,
+                [message['to']],
+            )
+        raise ValueError(f"Unknown email kind: {message['kind']}")
+
+    def send(self, message):
+        """
+        Queue message for the next flush, or send it now when there is no
+        queue. Raises EmailDeliveryError if it was sent now and the mail
+        server could not be reached, so the caller can retry.
+        """
+        if self.queue is None:
+            if self.deliver([message]) < 1:
+                raise EmailDeliveryError(f"Could not deliver {message['kind']} email to {message['to']}")
+            return True
+        self.queue.add(message)
+        return True
+
+    def deliver(self, messages):
+        """
+        Send messages over one connection; returns how many were handled.
+
+        A message refused by the server, or one that cannot be built (an
+        unknown kind, a header with a newline), is logged and dropped:
+        retrying would fail the same way and hold up everything queued
+        after it. A connection error stops delivery; the messages not yet
+        handled are the ones after the returned count.
+        """
+        handled = 0
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for message in messages:
+                try:
+                    # One message per call so a refusal only costs that message
+                    connection.send_messages([self.build(message)])
+                    logger.debug(f"{message['kind']} email sent to {message['to']}")
+                except MESSAGE_ERRORS as e:
+                    logger.error(f"Failed to send {message['kind']} email to {message['to']}: {str(e)}")
+                except CONNECTION_ERRORS:
+                    raise
+                except Exception as e:
+                    logger.error(f"Dropping unsendable email {message!r}: {str(e)}")
+                handled += 1
+        except Exception as e:
+            logger.error(f"Email delivery stopped after {handled} of {len(messages)} messages: {str(e)}")
+        finally:
+            connection.close()
+        return handled
+
+    def flush(self):
+        """Send queued emails and return the number handled"""
+        if self.queue is None:
+            return 0
+        lock = self.queue.lock(timeout=300)
+        if not lock.acquire(blocking=False):
+            logger.info("Email flush already running, skipping")
+            return 0
+
+        handled = 0
+        try:
+            messages = self.queue.drain()
+            for start in range(0, len(messages), self.batch_size):
+                batch = messages[start:start + self.batch_size]
+                done = self.deliver(batch)
+                self.queue.acknowledge(done)
+                handled += done
+                if done < len(batch):
+                    break
+        finally:
+            lock.release()
+
+        if handled:
+            logger.info(f"Flushed {handled} queued emails")
+        return handled
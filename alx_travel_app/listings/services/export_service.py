@@ -0,0 +1,154 @@
+# listings/services/export_service.py
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime, time, timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from ..models import Booking, Payment
+
+logger = logging.getLogger(__name__)
+
+
+class ExportParamsError(ValueError):
+    """Raised when export filters are invalid"""
+
+
+class BookingExportService:
+    """
+    Bookings joined to their payment, streamed as CSV or NDJSON.
+
+    Rows are read in keyset batches ordered by (created_at, id), each one
+    an index range read on Booking(created_at, id) that starts after the
+    last row of the previous batch. Only one batch is held at a time, so
+    memory stays flat however many rows are exported. Batches are used
+    rather than a single iterator() because the MySQL drivers buffer the
+    whole result set client-side.
+    """
+    # (output column, values() lookup)
+    COLUMNS = [
+        ('booking_id', 'id'),
+        ('booking_created_at', 'created_at'),
+        ('booking_status', 'status'),
+        ('listing_id', 'listing_id'),
+        ('user_id', 'user_id'),
+        ('check_in_date', 'check_in_date'),
+        ('check_out_date', 'check_out_date'),
+        ('guests', 'guests'),
+        ('total_price', 'total_price'),
+        ('payment_id', 'payment__id'),
+        ('payment_status', 'payment__status'),
+        ('payment_amount', 'payment__amount'),
+        ('payment_currency', 'payment__currency'),
+        ('payment_method', 'payment__payment_method'),
+        ('transaction_id', 'payment__transaction_id'),
+        ('payment_created_at', 'payment__created_at'),
+    ]
+    FORMATS = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def __init__(self, date_from=None, date_to=None, statuses=(), payment_statuses=(), batch_size=2000):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.statuses = list(statuses)
+        self.payment_statuses = list(payment_statuses)
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_params(cls, params, **kwargs):
+        """Build an export from date_from, date_to, status and payment_status parameters"""
+        date_from = cls._parse_date(params, 'date_from')
+        date_to = cls._parse_date(params, 'date_to')
+        if date_from and date_to and date_from > date_to:
+            raise ExportParamsError('date_to must not be before date_from')
+        statuses = cls._parse_choices(params, 'status', Booking.BOOKING_STATUS)
+        payment_statuses = cls._parse_choices(params, 'payment_status', Payment.PAYMENT_STATUS_CHOICES)
+        return cls(date_from, date_to, statuses, payment_statuses, **kwargs)
+
+    @staticmethod
+    def _parse_date(params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ExportParamsError(f'{name} must be a date in YYYY-MM-DD format')
+        return parsed
+
+    @staticmethod
+    def _parse_choices(params, name, choices):
+        values = [value.strip() for value in (params.get(name) or '').split(',') if value.strip()]
+        allowed = {choice for choice, _ in choices}
+        unknown = [value for value in values if value not in allowed]
+        if unknown:
+            raise ExportParamsError(f"{name} must be among: {', '.join(sorted(allowed))}")
+        return values
+
+    @staticmethod
+    def _start_of(day):
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def queryset(self):
+        # Date bounds are turned into datetimes so the created_at index applies
+        queryset = Booking.objects.all()
+        if self.date_from:
+            queryset = queryset.filter(created_at__gte=self._start_of(self.date_from))
+        if self.date_to:
+            queryset = queryset.filter(created_at__lt=self._start_of(self.date_to + timedelta(days=1)))
+        if self.statuses:
+            queryset = queryset.filter(status__in=self.statuses)
+        if self.payment_statuses:
+            queryset = queryset.filter(payment__status__in=self.payment_statuses)
+        return queryset.values_list(*(lookup for _, lookup in self.COLUMNS)).order_by('created_at', 'id')
+
+    def batches(self):
+        """Yield lists of at most batch_size row tuples"""
+        queryset = self.queryset()
+        last = None
+        exported = 0
+        while True:
+            batch = queryset
+            if last is not None:
+                batch = batch.filter(created_at__gte=last[1]).filter(
+                    Q(created_at__gt=last[1]) | Q(id__gt=last[0])
+                )
+            batch = list(batch[:self.batch_size])
+            if not batch:
+                break
+            exported += len(batch)
+            yield batch
+            last = batch[-1]
+        logger.info(f"Exported {exported} bookings")
+
+    def csv_chunks(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([name for name, _ in self.COLUMNS])
+        for batch in self.batches():
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def ndjson_chunks(self):
+        names = [name for name, _ in self.COLUMNS]
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        for batch in self.batches():
+            yield ''.join(encoder.encode(dict(zip(names, row))) + '\n' for row in batch)
+
+    def stream(self, output):
+        """Chunks of the export in output format ('csv' or 'ndjson')"""
+        if output not in self.FORMATS:
+            raise ExportParamsError(f"output must be one of: {', '.join(self.FORMATS)}")
+        return self.csv_chunks() if output == 'csv' else self.ndjson_chunks()
@@ -0,0 +1,207 @@
+# listings/services/fulltext_service.py
+
+import html
+import logging
+import re
+import uuid
+from django.db import connection, transaction
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from ..models import Listing
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query):
+    """Lower-cased words of a user query; operators and punctuation are dropped"""
+    return WORD_RE.findall((query or '').lower())
+
+
+def highlight(text, terms, max_length=None):
+    """
+    HTML-escape text and wrap words starting with any of terms in <mark>.
+
+    With max_length the text is cut to a window around the first match,
+    so long descriptions come back as a short snippet.
+    """
+    text = text or ''
+    if not terms:
+        return html.escape(text[:max_length] if max_length else text)
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE)
+
+    if max_length and len(text) > max_length:
+        match = pattern.search(text)
+        start = max(0, match.start() - max_length // 4) if match else 0
+        snippet = text[start:start + max_length]
+        prefix = '…' if start else ''
+        suffix = '…' if start + max_length < len(text) else ''
+        text = f'{prefix}{snippet}{suffix}'
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f'<mark>{html.escape(match.group(0))}</mark>')
+        position = match.end()
+    parts.append(html.escape(text[position:]))
+    return ''.join(parts)
+
+
+class LikeSearchBackend:
+    """
+    Unranked fallback for databases without a full-text backend:
+    every term must appear in the title or the description.
+    """
+
+    def install(self):
+        pass
+
+    def rebuild(self, batch_size=1000):
+        return 0
+
+    def index_listing(self, listing):
+        pass
+
+    def remove_listing(self, listing_id):
+        pass
+
+    def search(self, queryset, query):
+        for term in search_terms(query):
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteSearchBackend(LikeSearchBackend):
+    """
+    FTS5 index for SQLite (local development and tests).
+
+    The FTS rowid is derived from the listing UUID, so a listing's entry
+    is replaced by rowid instead of scanning the index for its id.
+    Queries are ranked with bm25, title matches weighted above
+    description matches.
+    """
+    table = 'listings_listing_fts'
+    title_weight = 10.0
+    description_weight = 1.0
+
+    @staticmethod
+    def rowid(listing_id):
+        if not isinstance(listing_id, uuid.UUID):
+            listing_id = uuid.UUID(str(listing_id))
+        return listing_id.int & ((1 << 63) - 1)
+
+    @staticmethod
+    def db_id(listing_id):
+        return Listing._meta.pk.get_db_prep_value(listing_id, connection)
+
+    def install(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                f"listing_id UNINDEXED, title, description, tokenize='porter unicode61')"
+            )
+
+    def rebuild(self, batch_size=1000):
+        self.install()
+        sql = f"INSERT INTO {self.table} (rowid, listing_id, title, description) VALUES (%s, %s, %s, %s)"
+        rows = Listing.objects.order_by('pk').values_list('pk', 'title', 'description')
+        written = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            pending = []
+            for listing_id, title, description in rows.iterator(chunk_size=batch_size):
+                pending.append((self.rowid(listing_id), self.db_id(listing_id), title, description))
+                if len(pending) >= batch_size:
+                    cursor.executemany(sql, pending)
+                    written += len(pending)
+                    pending = []
+            if pending:
+                cursor.executemany(sql, pending)
+                written += len(pending)
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+        return written
+
+    def index_listing(self, listing):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [self.rowid(listing.pk)])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, listing_id, title, description) VALUES (%s, %s, %s, %s)",
+                [self.rowid(listing.pk), self.db_id(listing.pk), listing.title, listing.description]
+            )
+
+    def remove_listing(self, listing_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [self.rowid(listing_id)])
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset.none()
+        # Quote every term so FTS5 query syntax in user input is inert
+        match = ' '.join(f'"{term}"' for term in terms)
+        listing_table = Listing._meta.db_table
+        return queryset.extra(
+            tables=[self.table],
+            where=[
+                f'{self.table}.listing_id = {listing_table}.{Listing._meta.pk.column}',
+                f'{self.table} MATCH %s',
+            ],
+            params=[match],
+            select={
+                'search_rank': f'-bm25({self.table}, 0, {self.title_weight}, {self.description_weight})'
+            },
+        )
+
+
+class MySQLSearchBackend(LikeSearchBackend):
+    """
+    InnoDB FULLTEXT index over title and description, maintained by MySQL
+    itself; queries use natural-language MATCH ... AGAINST relevance.
+    """
+    index_name = 'listing_fulltext'
+
+    def index_exists(self, cursor):
+        cursor.execute(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            [Listing._meta.db_table, self.index_name]
+        )
+        return cursor.fetchone() is not None
+
+    def install(self):
+        table = connection.ops.quote_name(Listing._meta.db_table)
+        with connection.cursor() as cursor:
+            if not self.index_exists(cursor):
+                cursor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {self.index_name} (title, description)")
+
+    def rebuild(self, batch_size=1000):
+        table = connection.ops.quote_name(Listing._meta.db_table)
+        with connection.cursor() as cursor:
+            if self.index_exists(cursor):
+                cursor.execute(f"ALTER TABLE {table} DROP INDEX {self.index_name}")
+        self.install()
+        return Listing.objects.count()
+
+    def search(self, queryset, query):
+        if not search_terms(query):
+            return queryset.none()
+        table = Listing._meta.db_table
+        relevance = RawSQL(
+            f"MATCH ({table}.title, {table}.description) AGAINST (%s IN NATURAL LANGUAGE MODE)",
+            [query],
+            output_field=FloatField()
+        )
+        return queryset.annotate(search_rank=relevance).filter(search_rank__gt=0)
+
+
+BACKENDS = {
+    'mysql': MySQLSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend():
+    """Return the full-text backend for the default database"""
+    return BACKENDS.get(connection.vendor, LikeSearchBackend)()
@@ -0,0 +1,216 @@
+# listings/services/geo_service.py
+
+import logging
+import math
+from django.db.models import FloatField, Q
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+from ..models import Location
+from .backfill import backfill_column
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+MAX_PRECISION = 12
+
+
+def _cell_bits(precision):
+    """(latitude bits, longitude bits) of a geohash of this precision"""
+    lat_bits = 5 * precision // 2
+    return lat_bits, 5 * precision - lat_bits
+
+
+def _cell_index(value, low, high, bits):
+    return min(int((value - low) / (high - low) * (1 << bits)), (1 << bits) - 1)
+
+
+def _interleave(lat_index, lng_index, precision):
+    lat_bits, lng_bits = _cell_bits(precision)
+    chars = []
+    value = 0
+    for bit in range(5 * precision):
+        # Even bits (counting from the most significant) are longitude
+        if bit % 2 == 0:
+            lng_bits -= 1
+            value = (value << 1) | ((lng_index >> lng_bits) & 1)
+        else:
+            lat_bits -= 1
+            value = (value << 1) | ((lat_index >> lat_bits) & 1)
+        if bit % 5 == 4:
+            chars.append(BASE32[value])
+            value = 0
+    return ''.join(chars)
+
+
+def encode(latitude, longitude, precision=MAX_PRECISION):
+    """Geohash of a point; nearby points share long prefixes"""
+    lat_bits, lng_bits = _cell_bits(precision)
+    return _interleave(
+        _cell_index(float(latitude), -90, 90, lat_bits),
+        _cell_index(float(longitude), -180, 180, lng_bits),
+        precision
+    )
+
+
+def _successor(prefix):
+    """Smallest geohash prefix sorting after every hash starting with prefix"""
+    while prefix and prefix[-1] == BASE32[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+def cover(south, west, north, east, max_cells=16):
+    """
+    Geohash ranges covering a box that does not cross the antimeridian.
+
+    Uses the finest precision whose cells overlapping the box number at
+    most max_cells, and merges cells that are adjacent in geohash order.
+    Returns a list of (start, end) pairs, end being None for "to the
+    last hash", or None when even single-character cells are too many to
+    be worth a range scan.
+    """
+    best = None
+    for precision in range(1, MAX_PRECISION + 1):
+        lat_bits, lng_bits = _cell_bits(precision)
+        rows = range(_cell_index(south, -90, 90, lat_bits), _cell_index(north, -90, 90, lat_bits) + 1)
+        columns = range(_cell_index(west, -180, 180, lng_bits), _cell_index(east, -180, 180, lng_bits) + 1)
+        if len(rows) * len(columns) > max_cells:
+            break
+        best = precision, rows, columns
+    if best is None:
+        return None
+
+    precision, rows, columns = best
+    cells = sorted(_interleave(row, column, precision) for row in rows for column in columns)
+    ranges = []
+    for cell in cells:
+        end = _successor(cell)
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1][1] = end
+        else:
+            ranges.append([cell, end])
+    return [tuple(bounds) for bounds in ranges]
+
+
+def radius_boxes(latitude, longitude, radius_km):
+    """
+    Boxes (south, west, north, east) enclosing the circle around a point,
+    split at the antimeridian.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    south, north = latitude - delta_lat, latitude + delta_lat
+    if south <= -90 or north >= 90:
+        # The circle contains a pole, so it spans every longitude
+        return [(max(south, -90), -180, min(north, 90), 180)]
+    delta_lng = delta_lat / math.cos(math.radians(max(abs(south), abs(north))))
+    if delta_lng >= 180:
+        return [(south, -180, north, 180)]
+    return split_box(south, longitude - delta_lng, north, longitude + delta_lng)
+
+
+def split_box(south, west, north, east):
+    """Normalize longitudes to [-180, 180] and split a box crossing the antimeridian"""
+    west = (west + 180) % 360 - 180
+    east = (east + 180) % 360 - 180
+    if west <= east:
+        return [(south, west, north, east)]
+    return [(south, west, north, 180), (south, -180, north, east)]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points, in kilometres"""
+    lat1, lng1, lat2, lng2 = map(math.radians, map(float, (lat1, lng1, lat2, lng2)))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoService:
+    """
+    Radius and viewport filters on Location coordinates.
+
+    Every location stores the geohash of its coordinates in an indexed
+    column. A query first turns its box into a handful of geohash prefix
+    ranges, which the B-tree index answers as range scans, then checks
+    the exact latitude/longitude bounds on those candidates; for radius
+    searches the haversine distance is only evaluated on what is left.
+    """
+
+    @staticmethod
+    def box_filter(boxes):
+        """Q matching locations inside any of boxes"""
+        condition = Q()
+        for south, west, north, east in boxes:
+            in_box = Q(latitude__gte=south, latitude__lte=north, longitude__gte=west, longitude__lte=east)
+            cells = cover(south, west, north, east)
+            if cells is not None:
+                in_cells = Q()
+                for start, end in cells:
+                    cell = Q(geohash__gte=start)
+                    if end is not None:
+                        cell &= Q(geohash__lt=end)
+                    in_cells |= cell
+                in_box &= in_cells
+            condition |= in_box
+        return condition
+
+    @staticmethod
+    def distance_expression(latitude, longitude, prefix=''):
+        """SQL haversine distance in km from a point to the row's coordinates"""
+        lat = Radians(Cast(f'{prefix}latitude', FloatField()))
+        lng = Radians(Cast(f'{prefix}longitude', FloatField()))
+        origin_lat = math.radians(latitude)
+        origin_lng = math.radians(longitude)
+        a = (
+            Power(Sin((lat - origin_lat) / 2), 2)
+            + math.cos(origin_lat) * Cos(lat) * Power(Sin((lng - origin_lng) / 2), 2)
+        )
+        return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+    @staticmethod
+    def _restrict(queryset, locations, path):
+        """
+        Filter queryset to rows whose location (through the ``path``
+        foreign key, or the row itself) is in locations. The IN sub-query
+        lets the database start from the geohash index instead of scanning
+        the outer table and joining every row to its location.
+        """
+        return queryset.filter(**{f'{path or "pk"}__in': locations.values('pk')})
+
+    @classmethod
+    def within_radius(cls, queryset, latitude, longitude, radius_km, path=None):
+        """Rows within radius_km of the point, annotated with distance_km"""
+        locations = Location.objects.filter(
+            cls.box_filter(radius_boxes(latitude, longitude, radius_km))
+        ).alias(
+            distance_km=cls.distance_expression(latitude, longitude)
+        ).filter(distance_km__lte=radius_km)
+        prefix = f'{path}__' if path else ''
+        return cls._restrict(queryset, locations, path).annotate(
+            distance_km=cls.distance_expression(latitude, longitude, prefix)
+        )
+
+    @classmethod
+    def within_box(cls, queryset, south, west, north, east, path=None):
+        """Rows inside a map viewport; west > east means it crosses the antimeridian"""
+        if west > east:
+            boxes = [(south, west, north, 180), (south, -180, north, east)]
+        else:
+            boxes = [(south, west, north, east)]
+        return cls._restrict(queryset, Location.objects.filter(cls.box_filter(boxes)), path)
+
+    @staticmethod
+    def backfill(batch_size=1000):
+        """
+        Recompute Location.geohash from the stored coordinates.
+
+        Returns the number of locations whose geohash changed.
+        """
+        updated = backfill_column(
+            Location, 'geohash', ('latitude', 'longitude'), Location.compute_geohash, batch_size
+        )
+        logger.info(f"Backfilled geohashes for {updated} locations")
+        return updated
@@ -0,0 +1,147 @@
+# listings/services/outbox_service.py
+
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from ..models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """
+    Transactional outbox for Celery tasks.
+
+    enqueue() is called inside the transaction that writes the rows a task
+    is about; the message commits or rolls back with them. Nothing talks
+    to the broker until OutboxRelay picks the message up after commit.
+    Tasks are named rather than imported, so request handlers never load
+    Celery.
+    """
+
+    @staticmethod
+    def enqueue(task_name, *args):
+        """Record a call to the named task; args must be JSON-serializable"""
+        return OutboxMessage.objects.create(task=task_name, args=list(args))
+
+
+class OutboxRelay:
+    """
+    Publish outbox messages to Celery in batches.
+
+    Each batch locks up to batch_size pending messages with
+    SELECT ... FOR UPDATE SKIP LOCKED, so several relays can run side by
+    side without publishing the same message twice. Messages are marked
+    dispatched in the transaction that published them; a relay killed
+    between publishing and commit publishes them again, so delivery is
+    at-least-once. A broker error stops the batch and leaves the rest
+    pending for the next poll.
+    """
+
+    def __init__(self, batch_size=None, interval=None, retention=None):
+        self.batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+        self.interval = interval if interval is not None else getattr(settings, 'OUTBOX_POLL_INTERVAL', 1.0)
+        self.retention = retention or getattr(settings, 'OUTBOX_RETENTION', 86400)
+
+    @staticmethod
+    def resolve(name):
+        from alx_travel_app.celery import app
+        # autodiscover_tasks() only runs when a worker starts; the relay
+        # registers the tasks it publishes itself
+        from .. import tasks  # noqa: F401
+        return app.tasks[name]
+
+    def relay_batch(self):
+        """Publish one batch of pending messages and return how many were published"""
+        from celery.exceptions import NotRegistered
+
+        published = []
+        dropped = {}
+        failure = None
+        with transaction.atomic():
+            messages = list(
+                OutboxMessage.objects.select_for_update(skip_locked=True)
+                .filter(dispatched_at__isnull=True)
+                .order_by('id')
+                .only('id', 'task', 'args')[:self.batch_size]
+            )
+            for message in messages:
+                try:
+                    self.resolve(message.task).apply_async(args=message.args)
+                except NotRegistered:
+                    # Retrying cannot help; drop it rather than block the queue
+                    logger.error(f"Dropping outbox message {message.pk}: unknown task {message.task}")
+                    dropped[message.pk] = f"Unknown task {message.task}"
+                    continue
+                except Exception as e:
+                    logger.error(f"Outbox relay stopped at message {message.pk}: {str(e)}")
+                    failure = (message.pk, str(e))
+                    break
+                published.append(message.pk)
+
+            now = timezone.now()
+            if published:
+                OutboxMessage.objects.filter(pk__in=published).update(
+                    dispatched_at=now, attempts=F('attempts') + 1, last_error=''
+                )
+            for pk, error in dropped.items():
+                OutboxMessage.objects.filter(pk=pk).update(
+                    dispatched_at=now, attempts=F('attempts') + 1, last_error=error
+                )
+            if failure:
+                OutboxMessage.objects.filter(pk=failure[0]).update(
+                    attempts=F('attempts') + 1, last_error=failure[1]
+                )
+
+        if published:
+            logger.info(f"Relayed {len(published)} outbox messages")
+        return len(published)
+
+    def drain(self):
+        """Relay until nothing is left to publish; returns the number published"""
+        total = 0
+        while published := self.relay_batch():
+            total += published
+        return total
+
+    def prune(self):
+        """Delete messages dispatched longer ago than the retention period"""
+        cutoff = timezone.now() - timedelta(seconds=self.retention)
+        deleted = 0
+        while True:
+            ids = list(
+                OutboxMessage.objects.filter(dispatched_at__lt=cutoff)
+                .values_list('pk', flat=True)[:self.batch_size]
+            )
+            if not ids:
+                return deleted
+            deleted += OutboxMessage.objects.filter(pk__in=ids).delete()[0]
+
+    def run(self):
+        """Relay forever, pruning old messages whenever the outbox is empty"""
+        while True:
+            if not self.drain():
+                self.prune()
+                time.sleep(self.interval)
+
+    @staticmethod
+    def stats(window=60):
+        """
+        Outbox health: pending depth, age of the oldest pending message
+        (lag) and messages dispatched per second over the last window
+        """
+        now = timezone.now()
+        pending = OutboxMessage.objects.filter(dispatched_at__isnull=True)
+        oldest = pending.order_by('id').values_list('created_at', flat=True).first()
+        dispatched = OutboxMessage.objects.filter(dispatched_at__gte=now - timedelta(seconds=window)).count()
+        return {
+            'depth': pending.count(),
+            'lag_seconds': round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+            'dispatched': dispatched,
+            'throughput_per_second': round(dispatched / window, 3),
+            'window_seconds': window,
+        }
@@ -1,13 +1,68 @@
 # listings/services/payment_service.py
 
+import os
+import threading
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
-class ChapaPaymentService:
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def build_session():
+    """
+    Build a keep-alive session for the Chapa API.
+
+    Connection errors are retried for every method because the request
+    never reached Chapa. Read errors and 5xx responses are only retried
+    for GET, so transaction verification is retried with backoff while
+    non-idempotent initialization is not.
+    """
+    retries = Retry(
+        total=getattr(settings, 'CHAPA_MAX_RETRIES', 3),
+        backoff_factor=getattr(settings, 'CHAPA_RETRY_BACKOFF', 0.3),
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False,
+    )
+    pool_size = getattr(settings, 'CHAPA_POOL_MAXSIZE', 20)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide Chapa session.
+
+    The session is created lazily and rebuilt after a fork, so pooled
+    sockets are never shared between pre-forked web or Celery workers.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = build_session()
+                _session_pid = pid
+    return _session
+
+
+class BaseChapaPaymentService:
+    """
+    Configuration and request/response handling shared by the sync and
+    async Chapa clients
+    """
     def __init__(self):
         self.base_url = settings.CHAPA_BASE_URL
         self.secret_key = settings.CHAPA_SECRET_KEY
@@ -15,14 +70,20 @@ class ChapaPaymentService:
             'Authorization': f'Bearer {self.secret_key}',
             'Content-Type': 'application/json'
         }
+        self.connect_timeout = getattr(settings, 'CHAPA_CONNECT_TIMEOUT', 3.05)
+        self.read_timeout = getattr(settings, 'CHAPA_READ_TIMEOUT', 30)
     
-    def initiate_payment(self, payment_data):
+    def initialize_url(self):
+        return f"{self.base_url}transaction/initialize"
+    
+    def verify_url(self, tx_ref):
+        return f"{self.base_url}transaction/verify/{tx_ref}"
+    
+    def build_payload(self, payment_data):
         """
-        Initiate payment with Chapa API
+        Build the transaction/initialize request body
         """
-        url = f"{self.base_url}transaction/initialize"
-        
-        payload = {
+        return {
             'amount': str(payment_data['amount']),
             'currency': payment_data.get('currency', 'ETB'),
             'email': payment_data['email'],
@@ -35,25 +96,51 @@ class ChapaPaymentService:
             'description': payment_data.get('description', 'Hotel Booking Payment'),
             'meta': payment_data.get('meta', {})
         }
-        
+    
+    def parse_initiate_response(self, data):
+        if data.get('status') == 'success':
+            return {
+                'success': True,
+                'data': data['data'],
+                'checkout_url': data['data']['checkout_url']
+            }
+        logger.error(f"Chapa API error: {data.get('message', 'Unknown error')}")
+        return {
+            'success': False,
+            'error': data.get('message', 'Payment initialization failed')
+        }
+    
+    def parse_verify_response(self, data):
+        if data.get('status') == 'success':
+            return {
+                'success': True,
+                'data': data['data']
+            }
+        return {
+            'success': False,
+            'error': data.get('message', 'Payment verification failed')
+        }
+
+
+class ChapaPaymentService(BaseChapaPaymentService):
+    def __init__(self):
+        super().__init__()
+        self.timeout = (self.connect_timeout, self.read_timeout)
+        self.session = get_session()
+    
+    def initiate_payment(self, payment_data):
+        """
+        Initiate payment with Chapa API
+        """
         try:
-            response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+            response = self.session.post(
+                self.initialize_url(),
+                json=self.build_payload(payment_data),
+                headers=self.headers,
+                timeout=self.timeout
+            )
             response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') == 'success':
-                return {
-                    'success': True,
-                    'data': data['data'],
-                    'checkout_url': data['data']['checkout_url']
-                }
-            else:
-                logger.error(f"Chapa API error: {data.get('message', 'Unknown error')}")
-                return {
-                    'success': False,
-                    'error': data.get('message', 'Payment initialization failed')
-                }
+            return self.parse_initiate_response(response.json())
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error during payment initiation: {str(e)}")
@@ -72,24 +159,10 @@ class ChapaPaymentService:
         """
         Verify payment status with Chapa API
         """
-        url = f"{self.base_url}transaction/verify/{tx_ref}"
-        
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(self.verify_url(tx_ref), headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') == 'success':
-                return {
-                    'success': True,
-                    'data': data['data']
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': data.get('message', 'Payment verification failed')
-                }
+            return self.parse_verify_response(response.json())
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error during payment verification: {str(e)}")
@@ -0,0 +1,116 @@
+# listings/services/reconciliation_service.py
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from ..models import Payment
+from .outbox_service import Outbox
+from .payment_service import ChapaPaymentService
+
+logger = logging.getLogger(__name__)
+
+# Chapa transaction statuses that settle a pending payment
+SETTLED_STATUSES = {
+    'success': 'completed',
+    'failed': 'failed',
+    'cancelled': 'cancelled',
+}
+
+
+class PaymentReconciler:
+    """
+    Settles payments stuck in 'pending' by verifying them with Chapa.
+
+    Pending payments are streamed in keyset-paginated batches ordered by
+    primary key (backed by the (status, id) index), each batch is
+    verified concurrently with a bounded thread pool sharing the pooled
+    Chapa session, and the results are written back with one bulk update
+    per batch.
+    """
+
+    def __init__(self, batch_size=None, concurrency=None, min_age=None):
+        self.batch_size = batch_size or getattr(settings, 'PAYMENT_RECONCILE_BATCH_SIZE', 200)
+        self.concurrency = concurrency or getattr(settings, 'PAYMENT_RECONCILE_CONCURRENCY', 10)
+        # Leave fresh checkouts alone; the customer may still be paying
+        self.min_age = min_age if min_age is not None else getattr(settings, 'PAYMENT_RECONCILE_MIN_AGE', 120)
+        self.chapa_service = ChapaPaymentService()
+
+    def pending_batches(self):
+        """Yield lists of (id, transaction_id) for pending payments, one batch at a time"""
+        cutoff = timezone.now() - timedelta(seconds=self.min_age)
+        queryset = (
+            Payment.objects.filter(status='pending', transaction_id__isnull=False, created_at__lte=cutoff)
+            .order_by('pk')
+            .values_list('pk', 'transaction_id')
+        )
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(page[:self.batch_size])
+            if not batch:
+                return
+            yield batch
+            last_pk = batch[-1][0]
+
+    def verify(self, transaction_id):
+        result = self.chapa_service.verify_payment(transaction_id)
+        if not result['success']:
+            return None
+        return result['data']
+
+    def verify_batch(self, batch):
+        """Return {payment_id: chapa_data} for payments Chapa reports as settled"""
+        transaction_ids = [transaction_id for _, transaction_id in batch]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(self.verify, transaction_ids))
+        return {
+            payment_id: data
+            for (payment_id, _), data in zip(batch, results)
+            if data and data.get('status') in SETTLED_STATUSES
+        }
+
+    def apply(self, settled):
+        """
+        Bulk-update settled payments that are still pending, queueing
+        confirmation emails for completed ones in the same transaction.
+
+        Rows locked by a concurrent verify or callback are skipped and
+        picked up on the next run. Returns the updated payments.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            payments = list(
+                Payment.objects.select_for_update(skip_locked=True)
+                .filter(pk__in=list(settled), status='pending')
+            )
+            for payment in payments:
+                data = settled[payment.pk]
+                payment.status = SETTLED_STATUSES[data['status']]
+                payment.payment_method = data.get('method') or payment.payment_method
+                payment.updated_at = now
+            Payment.objects.bulk_update(payments, ['status', 'payment_method', 'updated_at'])
+            for payment in payments:
+                if payment.status == 'completed':
+                    Outbox.enqueue('listings.tasks.send_payment_confirmation_email', payment.pk)
+        return payments
+
+    def run(self):
+        """Reconcile every eligible pending payment and return summary counts"""
+        stats = {'checked': 0, 'completed': 0, 'failed': 0, 'cancelled': 0}
+        for batch in self.pending_batches():
+            settled = self.verify_batch(batch)
+            updated = self.apply(settled) if settled else []
+            stats['checked'] += len(batch)
+
+            for payment in updated:
+                stats[payment.status] += 1
+
+        logger.info(
+            f"Reconciled pending payments: {stats['checked']} checked, "
+            f"{stats['completed']} completed, {stats['failed']} failed, "
+            f"{stats['cancelled']} cancelled"
+        )
+        return stats
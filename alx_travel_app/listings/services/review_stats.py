@@ -0,0 +1,105 @@
+# listings/services/review_stats.py
+
+import logging
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from ..models import Listing, Review
+from .cache_service import listing_cache
+
+logger = logging.getLogger(__name__)
+
+RATING_FIELDS = {rating: f'rating_{rating}_count' for rating in range(1, 6)}
+AGGREGATE_FIELDS = ['review_count', 'rating_sum', 'rating_average', *RATING_FIELDS.values()]
+
+
+def average(rating_sum, review_count):
+    if not review_count:
+        return Decimal('0.00')
+    return (Decimal(rating_sum) / review_count).quantize(Decimal('0.01'))
+
+
+class ReviewStats:
+    """
+    Denormalized review aggregates on Listing.
+
+    Each review write adjusts its listing's counters under a row lock, so
+    rating filters and sorts read plain indexed columns instead of
+    grouping the reviews table. rebuild() recomputes everything from the
+    reviews and repairs any drift.
+    """
+
+    @staticmethod
+    def apply(listing_id, added=None, removed=None):
+        """Add and/or remove one rating from a listing's aggregates"""
+        with transaction.atomic():
+            listing = (
+                Listing.objects.select_for_update()
+                .only('id', 'slug', *AGGREGATE_FIELDS)
+                .filter(pk=listing_id)
+                .first()
+            )
+            if listing is None:
+                return
+            for rating, delta in ((added, 1), (removed, -1)):
+                if rating is None:
+                    continue
+                field = RATING_FIELDS[rating]
+                listing.review_count += delta
+                listing.rating_sum += delta * rating
+                setattr(listing, field, getattr(listing, field) + delta)
+            listing.rating_average = average(listing.rating_sum, listing.review_count)
+            # A plain UPDATE: Listing.save() would load the deferred amenity
+            # fields, and only the cached detail response needs dropping
+            Listing.objects.filter(pk=listing_id).update(
+                **{field: getattr(listing, field) for field in AGGREGATE_FIELDS}
+            )
+        listing_cache.invalidate(listing.slug)
+
+    @staticmethod
+    def aggregate(listing_ids=None):
+        """Return {listing_id: aggregates} computed from the reviews table"""
+        reviews = Review.objects.all()
+        if listing_ids is not None:
+            reviews = reviews.filter(listing_id__in=listing_ids)
+        rows = reviews.values('listing_id').annotate(
+            review_count=Count('id'),
+            rating_sum=Sum('rating'),
+            **{field: Count('id', filter=Q(rating=rating)) for rating, field in RATING_FIELDS.items()}
+        )
+        return {row.pop('listing_id'): row for row in rows}
+
+    @classmethod
+    def rebuild(cls, listing_ids=None, batch_size=1000):
+        """Recompute aggregates from the reviews; returns the number of listings corrected"""
+        stats = cls.aggregate(listing_ids)
+        empty = dict.fromkeys(['review_count', 'rating_sum', *RATING_FIELDS.values()], 0)
+
+        listings = Listing.objects.only('id', 'slug', *AGGREGATE_FIELDS).order_by('pk')
+        if listing_ids is not None:
+            listings = listings.filter(pk__in=listing_ids)
+
+        stale = []
+        corrected = 0
+        for listing in listings.iterator(chunk_size=batch_size):
+            values = stats.get(listing.pk, empty)
+            values = {**values, 'rating_average': average(values['rating_sum'], values['review_count'])}
+            if any(getattr(listing, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(listing, field, value)
+                stale.append(listing)
+            if len(stale) >= batch_size:
+                corrected += cls._save(stale)
+                stale = []
+        if stale:
+            corrected += cls._save(stale)
+
+        logger.info(f"Rebuilt review aggregates, corrected {corrected} listings")
+        return corrected
+
+    @staticmethod
+    def _save(listings):
+        # bulk_update sends no signals, so drop cached detail responses here
+        Listing.objects.bulk_update(listings, AGGREGATE_FIELDS)
+        listing_cache.invalidate(*[listing.slug for listing in listings])
+        return len(listings)
@@ -0,0 +1,204 @@
+# listings/services/search_service.py
+
+import logging
+from decimal import Decimal, InvalidOperation
+from django.db.models import Exists, OuterRef
+from django.utils.dateparse import parse_date
+from ..models import CalendarNight, Listing
+from .amenity_service import AmenityService
+from .fulltext_service import get_search_backend, search_terms
+from .geo_service import GeoService
+
+logger = logging.getLogger(__name__)
+
+
+class SearchParamsError(ValueError):
+    """Raised when search query parameters are invalid"""
+
+
+# Supported values of the ``sort`` parameter
+SORT_ORDERS = {
+    'rating': ['-rating_average', '-review_count'],
+    'price': ['price_per_night'],
+    '-price': ['-price_per_night'],
+    'distance': ['distance_km'],
+}
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+
+
+class ListingSearchService:
+    """
+    Availability search over published listings.
+
+    Unavailable listings are excluded with a correlated NOT EXISTS
+    sub-query against the per-night calendar, so the database resolves
+    availability with one range probe on the unique (listing, night)
+    index instead of loading bookings per listing.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.query = (params.get('q') or '').strip()
+        self.city = (params.get('city') or '').strip()
+        self.check_in = self._parse_date('check_in')
+        self.check_out = self._parse_date('check_out')
+        self.guests = self._parse_int('guests')
+        self.min_price = self._parse_int('min_price')
+        self.max_price = self._parse_int('max_price')
+        self.listing_type = params.get('listing_type')
+        self.category = params.get('category')
+        self.min_rating = self._parse_rating('min_rating')
+        self.amenities = AmenityService.parse_filter(params.get('amenities'))
+        self.sort = params.get('sort') or None
+        self.point = self._parse_point()
+        self.radius_km = self._parse_number('radius_km', 0, MAX_RADIUS_KM)
+        self.bbox = self._parse_bbox()
+
+        if self.radius_km is None:
+            self.radius_km = DEFAULT_RADIUS_KM
+        elif self.radius_km == 0:
+            raise SearchParamsError('radius_km must be positive')
+
+        if self.sort and self.sort not in SORT_ORDERS:
+            raise SearchParamsError(f"sort must be one of: {', '.join(SORT_ORDERS)}")
+        if self.sort == 'distance' and not self.point:
+            raise SearchParamsError('sort=distance requires lat and lng')
+
+        if bool(self.check_in) != bool(self.check_out):
+            raise SearchParamsError('Both check_in and check_out are required for date search')
+        if self.check_in and self.check_in >= self.check_out:
+            raise SearchParamsError('check_out must be after check_in')
+
+    def _parse_date(self, name):
+        value = self.params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise SearchParamsError(f'{name} must be a date in YYYY-MM-DD format')
+        return parsed
+
+    def _parse_int(self, name):
+        value = self.params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            parsed = int(value)
+        except (TypeError, ValueError):
+            raise SearchParamsError(f'{name} must be an integer')
+        if parsed < 0:
+            raise SearchParamsError(f'{name} must not be negative')
+        return parsed
+
+    def _parse_rating(self, name):
+        value = self.params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            parsed = Decimal(value)
+        except InvalidOperation:
+            raise SearchParamsError(f'{name} must be a number')
+        if not parsed.is_finite():
+            raise SearchParamsError(f'{name} must be a number')
+        if not 1 <= parsed <= 5:
+            raise SearchParamsError(f'{name} must be between 1 and 5')
+        return parsed
+
+    def _parse_number(self, name, low, high):
+        value = self.params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            parsed = float(value)
+        except (TypeError, ValueError):
+            raise SearchParamsError(f'{name} must be a number')
+        if not low <= parsed <= high:
+            raise SearchParamsError(f'{name} must be between {low} and {high}')
+        return parsed
+
+    def _parse_point(self):
+        latitude = self._parse_number('lat', -90, 90)
+        longitude = self._parse_number('lng', -180, 180)
+        if (latitude is None) != (longitude is None):
+            raise SearchParamsError('Both lat and lng are required for a radius search')
+        if latitude is None:
+            return None
+        return latitude, longitude
+
+    def _parse_bbox(self):
+        value = self.params.get('bbox')
+        if not value:
+            return None
+        try:
+            south, west, north, east = (float(part) for part in value.split(','))
+        except ValueError:
+            raise SearchParamsError('bbox must be south,west,north,east')
+        if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+            raise SearchParamsError('bbox must be south,west,north,east in degrees')
+        return south, west, north, east
+
+    @staticmethod
+    def held_nights(check_in, check_out):
+        """Calendar nights of the outer listing inside [check_in, check_out)"""
+        return CalendarNight.objects.filter(
+            listing=OuterRef('pk'),
+            night__gte=check_in,
+            night__lt=check_out,
+        )
+
+    @property
+    def terms(self):
+        """Words of the text query, used for highlighting"""
+        return search_terms(self.query)
+
+    def base_queryset(self):
+        return Listing.objects.filter(status='published', is_available=True)
+
+    def search(self):
+        """Return a queryset of listings matching the search parameters"""
+        queryset = self.base_queryset()
+
+        if self.city:
+            queryset = queryset.filter(location__city=self.city)
+        if self.guests:
+            queryset = queryset.filter(max_guests__gte=self.guests)
+        if self.min_price is not None:
+            queryset = queryset.filter(price_per_night__gte=self.min_price)
+        if self.max_price is not None:
+            queryset = queryset.filter(price_per_night__lte=self.max_price)
+        if self.listing_type:
+            queryset = queryset.filter(listing_type=self.listing_type)
+        if self.category:
+            queryset = queryset.filter(category__slug=self.category)
+        if self.min_rating is not None:
+            queryset = queryset.filter(rating_average__gte=self.min_rating)
+        if self.amenities:
+            queryset = AmenityService.filter_listings(queryset, self.amenities)
+        if self.bbox:
+            queryset = GeoService.within_box(queryset, *self.bbox, path='location')
+        if self.point:
+            queryset = GeoService.within_radius(queryset, *self.point, self.radius_km, path='location')
+
+        if self.check_in:
+            nights = (self.check_out - self.check_in).days
+            queryset = queryset.filter(minimum_stay__lte=nights).exclude(
+                maximum_stay__lt=nights
+            )
+            queryset = queryset.filter(
+                ~Exists(self.held_nights(self.check_in, self.check_out))
+            )
+
+        if self.terms:
+            queryset = get_search_backend().search(queryset, self.query)
+
+        if self.sort:
+            queryset = queryset.order_by(*SORT_ORDERS[self.sort])
+        elif self.terms:
+            queryset = queryset.order_by('-search_rank', '-created_at')
+
+        return queryset.select_related('location', 'category')
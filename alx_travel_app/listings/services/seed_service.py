@@ -0,0 +1,572 @@
+# listings/services/seed_service.py
+
+import logging
+import multiprocessing
+import random
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from django.utils.text import slugify
+from ..models import Booking, CalendarNight, Favorite, Listing, Review
+from .availability_service import AvailabilityCalendar
+from .review_stats import AGGREGATE_FIELDS, RATING_FIELDS, average
+
+logger = logging.getLogger(__name__)
+
+
+class BulkSeeder:
+    """
+    Seeds users, listings, reviews, bookings and favorites for load tests.
+
+    Everything the row-by-row seed asks the database for is kept in memory
+    instead: taken usernames and slugs, reviewed (listing, user) pairs,
+    favorites, and each listing's booked nights as a bitmask over the
+    booking window. Rows are plain dicts written batch_size at a time with
+    executemany, which skips the per-object cost of bulk_create; every
+    user shares one password hash, and Faker text is drawn from small
+    pre-generated pools because generating it per row dominates the run.
+
+    Users and listings are generated in this process. Reviews, bookings
+    and favorites are generated per partition of the listings (users for
+    favorites), each from its own generator seeded from seed and the
+    partition number; every uniqueness and overlap check stays inside
+    one partition. Partitions can therefore run in worker processes,
+    which hand prepared rows back to this process for writing, and the
+    output, UUID primary keys included, is the same for any number of
+    workers.
+
+    Raw inserts skip save() and signals, so the seeder fills in what they
+    would have: amenity_flags, review aggregates and calendar nights. The
+    search index is left to rebuild_search_index. Timestamps are drawn
+    from the same generators, spread over HISTORY with reviews, bookings
+    and favorites after their listing, so created_at orderings and keyset
+    pages behave as they would on real data.
+    """
+    PASSWORD = 'testpass123'
+    POOL_SIZE = 500
+    LISTING_TYPE_WEIGHTS = {
+        'apartment': 0.3,
+        'house': 0.25,
+        'hotel': 0.15,
+        'villa': 0.1,
+        'bnb': 0.1,
+        'resort': 0.05,
+        'hostel': 0.03,
+        'other': 0.02,
+    }
+    BASE_PRICES = {
+        'hostel': (20, 80),
+        'bnb': (50, 150),
+        'apartment': (60, 200),
+        'house': (80, 300),
+        'hotel': (100, 400),
+        'villa': (200, 800),
+        'resort': (150, 600),
+        'other': (40, 250),
+    }
+    PROPERTY_ADJECTIVES = [
+        'Stunning', 'Luxurious', 'Cozy', 'Modern', 'Charming', 'Spacious',
+        'Beautiful', 'Elegant', 'Comfortable', 'Stylish', 'Peaceful', 'Unique'
+    ]
+    PROPERTY_TYPES = [
+        'Oceanview Villa', 'City Loft', 'Mountain Cabin', 'Beach House',
+        'Garden Apartment', 'Penthouse Suite', 'Country Cottage', 'Studio',
+        'Historic Home', 'Designer Flat', 'Luxury Condo', 'Family Home'
+    ]
+    SPECIAL_REQUESTS = [
+        'Early check-in requested', 'Late checkout needed', 'Celebrating anniversary',
+        'Traveling with small pet', 'Need extra towels', 'Quiet room preferred',
+        'Ground floor preferred', 'Close to elevator', 'Extra pillows needed'
+    ]
+    SENTIMENT_WORDS = ['amazing', 'fantastic', 'wonderful', 'excellent', 'perfect', 'outstanding']
+    RATINGS = [5] * 4 + [4] * 3 + [3] * 2 + [2, 1]
+    FAVORITE_COUNTS = [0, 0, 0, 1, 1, 2, 2, 3, 4, 5, 6, 7, 8]
+    # Check-in day ranges relative to today: past, current and future stays
+    BOOKING_RANGES = [(-183, -30), (-30, 30), (30, 183)]
+    MAX_NIGHTS = 14
+    # Target rows per generation partition
+    PARTITION_ROWS = 5000
+    # How far back seeded listings are created
+    HISTORY = timedelta(days=2 * 365)
+
+    def __init__(self, fake, seed=42, batch_size=5000, workers=1):
+        self.fake = fake
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.now = timezone.now()
+        self.today = date.today()
+        self.window_start = self.today + timedelta(days=self.BOOKING_RANGES[0][0])
+        self._pools = {}
+        self._statements = {}
+        self.listings = []
+        self.users = []
+
+    def pool(self, name, generate):
+        """A list of POOL_SIZE values from generate(), built on first use"""
+        if name not in self._pools:
+            self._pools[name] = [generate() for _ in range(self.POOL_SIZE)]
+        return self._pools[name]
+
+    def batched(self, rows):
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            yield batch
+
+    def _insert_statement(self, model):
+        """(INSERT sql, fields, prepared defaults) for model, built once per process"""
+        if model not in self._statements:
+            db = connections[DEFAULT_DB_ALIAS]
+            meta = model._meta
+            fields = [field for field in meta.concrete_fields if field is not meta.auto_field]
+            # Prepared once here, since most rows leave most defaults alone
+            defaults = {
+                field.attname: field.get_db_prep_save(
+                    self.now if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+                    else field.get_default(),
+                    db
+                )
+                for field in fields
+            }
+            quote = db.ops.quote_name
+            sql = (
+                f"INSERT INTO {quote(meta.db_table)} ({', '.join(quote(field.column) for field in fields)}) "
+                f"VALUES ({', '.join(['%s'] * len(fields))})"
+            )
+            self._statements[model] = (sql, fields, defaults)
+        return self._statements[model]
+
+    def prepare(self, model, rows):
+        """
+        Turn rows, dicts keyed by field attname, into INSERT parameters.
+
+        Missing fields get their default and timestamps get the seeding
+        time; auto-increment primary keys are left to the database.
+        """
+        db = connections[DEFAULT_DB_ALIAS]
+        _, fields, defaults = self._insert_statement(model)
+        return [
+            [field.get_db_prep_save(row[field.attname], db) if field.attname in row else defaults[field.attname]
+             for field in fields]
+            for row in rows
+        ]
+
+    def write(self, model, params):
+        """INSERT prepared rows batch_size at a time; returns the number written"""
+        db = connections[DEFAULT_DB_ALIAS]
+        sql = self._insert_statement(model)[0]
+        for batch in self.batched(params):
+            with db.cursor() as cursor:
+                cursor.executemany(sql, batch)
+        return len(params)
+
+    def insert(self, model, rows):
+        """prepare() and write() rows a batch at a time; returns the number written"""
+        return sum(self.write(model, self.prepare(model, batch)) for batch in self.batched(rows))
+
+    def create_users(self, count):
+        taken = set(User.objects.values_list('username', flat=True))
+        usernames = self.pool('usernames', self.fake.user_name)
+        first_names = self.pool('first_names', self.fake.first_name)
+        last_names = self.pool('last_names', self.fake.last_name)
+        password = make_password(self.PASSWORD)
+        rng = self.rng
+
+        def users():
+            for index in range(count):
+                username = rng.choice(usernames)
+                while username in taken:
+                    username = f"{rng.choice(usernames)}{index}"
+                taken.add(username)
+                yield {
+                    'username': username,
+                    'email': f"{username}@example.com",
+                    'first_name': rng.choice(first_names),
+                    'last_name': rng.choice(last_names),
+                    'password': password,
+                    'date_joined': self.now - timedelta(seconds=rng.randrange(2 * 365 * 86400)),
+                }
+
+        created = self.insert(User, users())
+        logger.info(f"Seeded {created} users")
+        return created
+
+    def _description(self):
+        fake = self.fake
+        attractions = ', '.join(
+            f"{fake.word().title()} {fake.random_element(['Museum', 'Park', 'Beach', 'Market', 'Gallery'])}"
+            for _ in range(2)
+        )
+        return ' '.join([
+            fake.text(max_nb_chars=200),
+            f"Located in the heart of {fake.city()}, this property offers {fake.sentence()}",
+            f"Perfect for {fake.random_element(['couples', 'families', 'business travelers', 'solo adventurers'])}.",
+            f"Nearby attractions include {attractions}.",
+        ])
+
+    def create_listings(self, count, categories, locations, users):
+        descriptions = self.pool('descriptions', self._description)
+        house_rules = self.pool('house_rules', lambda: self.fake.text(max_nb_chars=150))
+        words = self.pool('words', lambda: self.fake.word().title())
+        taken = set(Listing.objects.values_list('slug', flat=True))
+        taken_ids = set(Listing.objects.values_list('id', flat=True))
+        suffixes = defaultdict(int)
+        listing_types = list(self.LISTING_TYPE_WEIGHTS)
+        weights = list(self.LISTING_TYPE_WEIGHTS.values())
+        rng = self.rng
+
+        def listings():
+            for _ in range(count):
+                title = f"{rng.choice(self.PROPERTY_ADJECTIVES)} {rng.choice(self.PROPERTY_TYPES)}"
+                slug = slugify(title)
+                if slug in taken:
+                    title = f"{title} - {rng.choice(words)}"
+                    slug = slugify(title)
+                base = slug
+                while slug in taken:
+                    suffixes[base] += 1
+                    slug = f"{base}-{suffixes[base]}"
+                taken.add(slug)
+
+                listing_type = rng.choices(listing_types, weights)[0]
+                if listing_type in ['hostel', 'hotel']:
+                    max_guests, bedrooms, bathrooms = rng.randint(1, 4), rng.randint(1, 2), 1
+                elif listing_type == 'villa':
+                    max_guests, bedrooms, bathrooms = rng.randint(6, 12), rng.randint(3, 6), rng.randint(2, 4)
+                else:
+                    max_guests, bedrooms, bathrooms = rng.randint(1, 8), rng.randint(1, 4), rng.randint(1, 3)
+                amenities = rng.sample(Listing.AMENITIES, rng.randint(3, 8))
+                min_price, max_price = self.BASE_PRICES[listing_type]
+
+                yield {
+                    'id': self.new_id(rng, taken_ids),
+                    'title': title,
+                    'description': rng.choice(descriptions),
+                    'listing_type': listing_type,
+                    'status': 'published' if rng.random() < 0.8 else 'draft',
+                    'host_id': rng.choice(users),
+                    'category_id': rng.choice(categories),
+                    'location_id': rng.choice(locations),
+                    'price_per_night': Decimal(rng.randint(min_price, max_price)),
+                    'currency': rng.choice(['USD', 'EUR', 'GBP', 'JPY']),
+                    'max_guests': max_guests,
+                    'bedrooms': bedrooms,
+                    'bathrooms': bathrooms,
+                    'amenities': ', '.join(amenities),
+                    'amenity_flags': Listing.amenity_mask(amenities),
+                    'house_rules': rng.choice(house_rules),
+                    'minimum_stay': rng.randint(1, 7),
+                    'maximum_stay': rng.choice([None, 14, 30, 90]),
+                    'is_available': rng.random() < 0.9,
+                    'slug': slug,
+                    'view_count': rng.randint(0, 1000),
+                    **self.timestamps(rng),
+                }
+
+        created = self.insert(Listing, listings())
+        logger.info(f"Seeded {created} listings")
+        return created
+
+    def published_listings(self):
+        """
+        Load the published listings, with what reviews, bookings and
+        favorites need, as the listings the next steps draw from
+        """
+        # Ordered by the seeded created_at and slug rather than the pk so reruns partition alike
+        rows = Listing.objects.filter(status='published').order_by('created_at', 'slug').values(
+            'id', 'host_id', 'is_available', 'minimum_stay', 'maximum_stay', 'max_guests',
+            'price_per_night', 'created_at', *AGGREGATE_FIELDS
+        )
+        self.listings = list(rows.iterator())
+        return self.listings
+
+    def partitions(self, items, count):
+        """
+        Split count rows over partitions of items: [(partition, partitions, rows)].
+
+        The number of partitions depends only on the data, never on the
+        number of workers, so the output does too.
+        """
+        partitions = max(1, min(len(items), -(-count // self.PARTITION_ROWS)))
+        return [
+            (partition, partitions, count // partitions + (partition < count % partitions))
+            for partition in range(partitions)
+        ]
+
+    def partition_rng(self, kind, partition):
+        return random.Random(f"{self.seed}:{kind}:{partition}")
+
+    def timestamps(self, rng, after=None, before=None):
+        """
+        created_at and updated_at drawn from rng: created between after
+        (default HISTORY ago) and before (default now), updated since then
+        """
+        end = min(before or self.now, self.now)
+        start = min(after or self.now - self.HISTORY, end)
+        created = start + (end - start) * rng.random()
+        return {'created_at': created, 'updated_at': created + (self.now - created) * rng.random()}
+
+    @staticmethod
+    def new_id(rng, taken):
+        """
+        A UUID drawn from rng, so seeded rows keep their primary keys, that
+        is not in taken: reseeding with the same seed would draw the same ids
+        """
+        while True:
+            pk = uuid.UUID(int=rng.getrandbits(128), version=4)
+            if pk not in taken:
+                return pk
+
+    def run(self, method, jobs):
+        """
+        Yield getattr(self, method)(job) for each job, in job order.
+
+        With more than one worker the jobs run in forked processes, which
+        inherit the seeder (pools, listings, users, existing rows) instead
+        of having it pickled per job. At most two jobs per worker are
+        outstanding, so finished partitions never pile up in memory while
+        the writer catches up.
+        """
+        if self.workers <= 1:
+            for job in jobs:
+                yield getattr(self, method)(job)
+            return
+
+        global _worker_seeder
+        _worker_seeder = self
+        context = multiprocessing.get_context('fork')
+        try:
+            with ProcessPoolExecutor(self.workers, mp_context=context) as executor:
+                pending = deque()
+                for job in jobs:
+                    pending.append(executor.submit(_run_partition, method, job))
+                    if len(pending) >= 2 * self.workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+        finally:
+            _worker_seeder = None
+
+    def create_reviews(self, count, users):
+        """Reviews of published listings by users other than the host, one per pair"""
+        if not self.listings or not users:
+            return 0
+        self.users = users
+        self.reviewed = set(Review.objects.values_list('listing_id', 'user_id'))
+        self.pool('review_texts', lambda: self.fake.text(max_nb_chars=200))
+
+        created = 0
+        for rows, stats in self.run('review_partition', self.partitions(self.listings, count)):
+            created += self.write(Review, rows)
+            self._save_review_stats(stats)
+        logger.info(f"Seeded {created} reviews")
+        return created
+
+    def review_partition(self, job):
+        """Prepared reviews for one partition of the listings, and the listings' new aggregates"""
+        partition, partitions, count = job
+        listings = self.listings[partition::partitions]
+        users = self.users
+        texts = self._pools['review_texts']
+        rng = self.partition_rng('reviews', partition)
+        reviewed = set()
+        rows = []
+        for _ in range(count * 3):
+            if len(rows) >= count:
+                break
+            listing = rng.choice(listings)
+            user = rng.choice(users)
+            pair = (listing['id'], user)
+            if user == listing['host_id'] or pair in reviewed or pair in self.reviewed:
+                continue
+            reviewed.add(pair)
+            rating = rng.choice(self.RATINGS)
+            if rating >= 4:
+                word = rng.choice(self.SENTIMENT_WORDS)
+                title = f"{word.title()} {rng.choice(['stay', 'experience', 'place', 'property'])}!"
+                content = f"We had a {rng.choice(self.SENTIMENT_WORDS)} time at this property. {rng.choice(texts)}"
+            elif rating == 3:
+                title = f"Good {rng.choice(['stay', 'experience', 'place'])}"
+                content = f"The property was decent. {rng.choice(texts)}"
+            else:
+                title = f"Could be {rng.choice(['better', 'improved'])}"
+                content = f"The stay was okay but had some issues. {rng.choice(texts)}"
+
+            listing['review_count'] += 1
+            listing['rating_sum'] += rating
+            listing[RATING_FIELDS[rating]] += 1
+            rows.append({
+                'listing_id': listing['id'],
+                'user_id': user,
+                'rating': rating,
+                'title': title,
+                'content': content,
+                'is_verified': rng.random() < 0.7,
+                **self.timestamps(rng, after=listing['created_at']),
+            })
+
+        reviewed_listings = {row['listing_id'] for row in rows}
+        stats = [listing for listing in listings if listing['id'] in reviewed_listings]
+        return self.prepare(Review, rows), self._review_stat_params(stats)
+
+    def _review_stat_params(self, listings):
+        db = connections[DEFAULT_DB_ALIAS]
+        meta = Listing._meta
+        params = []
+        for listing in listings:
+            listing['rating_average'] = average(listing['rating_sum'], listing['review_count'])
+            params.append([
+                *(meta.get_field(name).get_db_prep_save(listing[name], db) for name in AGGREGATE_FIELDS),
+                meta.pk.get_db_prep_save(listing['id'], db),
+            ])
+        return params
+
+    def _save_review_stats(self, params):
+        """Write the aggregates counted while generating reviews, as the Review signals would have"""
+        db = connections[DEFAULT_DB_ALIAS]
+        meta = Listing._meta
+        quote = db.ops.quote_name
+        sql = (
+            f"UPDATE {quote(meta.db_table)} "
+            f"SET {', '.join(f'{quote(meta.get_field(name).column)} = %s' for name in AGGREGATE_FIELDS)} "
+            f"WHERE {quote(meta.pk.column)} = %s"
+        )
+        for batch in self.batched(params):
+            with db.cursor() as cursor:
+                cursor.executemany(sql, batch)
+
+    def _night_offset(self, day):
+        return max((day - self.window_start).days, 0)
+
+    def booked_nights(self):
+        """{listing id: bitmask of nights taken by existing bookings}, bit 0 is window_start"""
+        booked = defaultdict(int)
+        existing = Booking.objects.filter(
+            check_out_date__gt=self.window_start
+        ).values_list('listing_id', 'check_in_date', 'check_out_date')
+        for listing_id, check_in, check_out in existing.iterator():
+            start, end = self._night_offset(check_in), self._night_offset(check_out)
+            booked[listing_id] |= ((1 << (end - start)) - 1) << start
+        return booked
+
+    def create_bookings(self, count, users):
+        """
+        Non-overlapping bookings of available listings by users other than
+        the host, with calendar nights for the active ones
+        """
+        self.available = [listing for listing in self.listings if listing['is_available']]
+        if not self.available or not users:
+            return 0
+        self.users = users
+        self.booked = self.booked_nights()
+        self.booking_ids = set(Booking.objects.values_list('id', flat=True))
+
+        created = 0
+        for bookings, nights in self.run('booking_partition', self.partitions(self.available, count)):
+            created += self.write(Booking, bookings)
+            self.write(CalendarNight, nights)
+        logger.info(f"Seeded {created} bookings")
+        return created
+
+    def booking_partition(self, job):
+        """Prepared bookings and calendar nights for one partition of the available listings"""
+        partition, partitions, count = job
+        listings = self.available[partition::partitions]
+        users = self.users
+        rng = self.partition_rng('bookings', partition)
+        today = self.today
+        booked = {listing['id']: self.booked.get(listing['id'], 0) for listing in listings}
+        rows = []
+        nights = []
+        for _ in range(count * 3):
+            if len(rows) >= count:
+                break
+            listing = rng.choice(listings)
+            user = rng.choice(users)
+            if user == listing['host_id']:
+                continue
+            low, high = rng.choice(self.BOOKING_RANGES)
+            check_in = today + timedelta(days=rng.randint(low, high))
+            max_stay = min(listing['maximum_stay'] or self.MAX_NIGHTS, self.MAX_NIGHTS)
+            duration = rng.randint(listing['minimum_stay'], max_stay)
+            check_out = check_in + timedelta(days=duration)
+
+            mask = ((1 << duration) - 1) << self._night_offset(check_in)
+            if booked[listing['id']] & mask:
+                continue
+            booked[listing['id']] |= mask
+
+            if check_out < today:
+                status = 'completed' if rng.random() < 0.8 else 'cancelled'
+            elif check_in > today:
+                status = rng.choice(['pending', 'confirmed'])
+            else:
+                status = 'confirmed'
+            booking_id = self.new_id(rng, self.booking_ids)
+            rows.append({
+                'id': booking_id,
+                'listing_id': listing['id'],
+                'user_id': user,
+                'check_in_date': check_in,
+                'check_out_date': check_out,
+                'guests': rng.randint(1, min(listing['max_guests'], 6)),
+                'total_price': listing['price_per_night'] * duration,
+                'status': status,
+                'special_requests': rng.choice(self.SPECIAL_REQUESTS) if rng.random() < 0.3 else '',
+                # Booked after the listing went up and before the stay began
+                **self.timestamps(
+                    rng, after=listing['created_at'], before=self.now + timedelta(days=(check_in - today).days)
+                ),
+            })
+            if status in Booking.ACTIVE_STATUSES:
+                nights.extend(
+                    {'listing_id': listing['id'], 'booking_id': booking_id, 'night': night}
+                    for night in AvailabilityCalendar.nights(check_in, check_out)
+                )
+        return self.prepare(Booking, rows), self.prepare(CalendarNight, nights)
+
+    def create_favorites(self, users):
+        """0-8 favorites per user among published listings they do not host"""
+        if not self.listings or not users:
+            return 0
+        self.users = users
+        self.favorited = set(Favorite.objects.values_list('user_id', 'listing_id'))
+        expected = len(users) * sum(self.FAVORITE_COUNTS) // len(self.FAVORITE_COUNTS)
+
+        created = 0
+        for rows in self.run('favorite_partition', self.partitions(users, expected)):
+            created += self.write(Favorite, rows)
+        logger.info(f"Seeded {created} favorites")
+        return created
+
+    def favorite_partition(self, job):
+        """Prepared favorites for one partition of the users"""
+        partition, partitions, _ = job
+        listings = self.listings
+        rng = self.partition_rng('favorites', partition)
+        rows = []
+        for user in self.users[partition::partitions]:
+            wanted = min(rng.choice(self.FAVORITE_COUNTS), len(listings))
+            for listing in rng.sample(listings, wanted):
+                if listing['host_id'] != user and (user, listing['id']) not in self.favorited:
+                    rows.append({
+                        'user_id': user, 'listing_id': listing['id'],
+                        **self.timestamps(rng, after=listing['created_at']),
+                    })
+        return self.prepare(Favorite, rows)
+
+
+# The seeder forked workers run partitions for; set by BulkSeeder.run
+_worker_seeder = None
+
+
+def _run_partition(method, job):
+    return getattr(_worker_seeder, method)(job)
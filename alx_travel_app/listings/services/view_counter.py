@@ -0,0 +1,173 @@
+# listings/services/view_counter.py
+
+import logging
+import threading
+from collections import Counter
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Value, When
+from ..models import Listing
+
+logger = logging.getLogger(__name__)
+
+
+class RedisViewBuffer:
+    """
+    Pending view counts in a Redis hash shared by every worker.
+
+    A flush renames the live hash to a flushing hash in one atomic step,
+    so views recorded while the flush runs land in a fresh hash. Fields
+    are removed from the flushing hash as their batch is committed; a
+    flush that dies half-way is resumed by the next one.
+    """
+    pending_key = 'listing_views:pending'
+    flushing_key = 'listing_views:flushing'
+    lock_key = 'listing_views:flush_lock'
+
+    def __init__(self, url):
+        import redis
+        self.redis = redis
+        self.client = redis.Redis.from_url(url)
+
+    def add(self, listing_id, count=1):
+        self.client.hincrby(self.pending_key, str(listing_id), count)
+
+    def pending(self, listing_id):
+        field = str(listing_id)
+        pending = self.client.hget(self.pending_key, field)
+        flushing = self.client.hget(self.flushing_key, field)
+        return int(pending or 0) + int(flushing or 0)
+
+    def lock(self, timeout):
+        return self.client.lock(self.lock_key, timeout=timeout, blocking=False)
+
+    def drain(self):
+        if not self.client.exists(self.flushing_key):
+            try:
+                self.client.rename(self.pending_key, self.flushing_key)
+            except self.redis.ResponseError:
+                # Nothing has been viewed since the last flush
+                return {}
+        return {
+            field.decode(): int(count)
+            for field, count in self.client.hgetall(self.flushing_key).items()
+        }
+
+    def acknowledge(self, listing_ids):
+        if listing_ids:
+            self.client.hdel(self.flushing_key, *[str(listing_id) for listing_id in listing_ids])
+
+
+class MemoryViewBuffer:
+    """
+    Per-process buffer for tests and benchmarks.
+
+    Counts are only visible to, and flushed by, the process that recorded
+    them, so it is never picked automatically; without
+    VIEW_COUNTER_REDIS_URL views are written straight to the database.
+    """
+
+    def __init__(self):
+        self.mutex = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.counts = Counter()
+        self.flushing = Counter()
+
+    def add(self, listing_id, count=1):
+        with self.mutex:
+            self.counts[str(listing_id)] += count
+
+    def pending(self, listing_id):
+        field = str(listing_id)
+        with self.mutex:
+            return self.counts[field] + self.flushing[field]
+
+    def lock(self, timeout):
+        return self.flush_lock
+
+    def drain(self):
+        with self.mutex:
+            if not self.flushing:
+                self.flushing, self.counts = self.counts, Counter()
+            return dict(self.flushing)
+
+    def acknowledge(self, listing_ids):
+        with self.mutex:
+            for listing_id in listing_ids:
+                self.flushing.pop(str(listing_id), None)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Return the process-wide view buffer, or None when views are written straight away"""
+    global _buffer
+    url = getattr(settings, 'VIEW_COUNTER_REDIS_URL', '')
+    if not url:
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = RedisViewBuffer(url)
+    return _buffer
+
+
+class ViewCounter:
+    """
+    Buffered listing view counts.
+
+    Recording a view is a single increment in the buffer; the database
+    only sees one UPDATE per flushed batch, with each listing's pending
+    count added through an F() expression so no increment is lost to a
+    read-modify-write race. Without a buffer each view is that UPDATE.
+    """
+
+    def __init__(self, buffer=None, batch_size=None):
+        self.buffer = buffer if buffer is not None else get_buffer()
+        self.batch_size = batch_size or getattr(settings, 'VIEW_COUNTER_FLUSH_BATCH_SIZE', 500)
+
+    def record(self, listing_id, count=1):
+        if self.buffer is None:
+            Listing.objects.filter(pk=listing_id).update(view_count=F('view_count') + count)
+            return
+        self.buffer.add(listing_id, count)
+
+    def pending(self, listing_id):
+        if self.buffer is None:
+            return 0
+        return self.buffer.pending(listing_id)
+
+    def live_count(self, listing):
+        """Flushed count plus views still waiting in the buffer"""
+        return listing.view_count + self.pending(listing.pk)
+
+    def flush(self):
+        """Write buffered counts to the database and return the number of views flushed"""
+        if self.buffer is None:
+            return 0
+        lock = self.buffer.lock(timeout=300)
+        if not lock.acquire(blocking=False):
+            logger.info("View count flush already running, skipping")
+            return 0
+
+        try:
+            counts = list(self.buffer.drain().items())
+            flushed = 0
+            for start in range(0, len(counts), self.batch_size):
+                batch = counts[start:start + self.batch_size]
+                Listing.objects.filter(pk__in=[listing_id for listing_id, _ in batch]).update(
+                    view_count=F('view_count') + Case(
+                        *[When(pk=listing_id, then=Value(count)) for listing_id, count in batch],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    )
+                )
+                self.buffer.acknowledge([listing_id for listing_id, _ in batch])
+                flushed += sum(count for _, count in batch)
+        finally:
+            lock.release()
+
+        if flushed:
+            logger.info(f"Flushed {flushed} listing views for {len(counts)} listings")
+        return flushed
@@ -0,0 +1,108 @@
+# listings/services/webhook_service.py
+
+import logging
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from ..models import Payment, PaymentWebhookEvent
+from .outbox_service import Outbox
+from .payment_service import ChapaPaymentService
+from .reconciliation_service import SETTLED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookVerificationError(Exception):
+    """Raised when Chapa cannot confirm a webhook's transaction, or has not settled it yet"""
+
+
+class PaymentWebhookService:
+    """
+    Two-phase webhook handling.
+
+    record() runs in the request: it stores the delivery, together with
+    the outbox message that schedules its processing, and reports whether
+    it was new, so retried deliveries are acknowledged without further
+    work. process() runs in a worker: it
+    verifies the transaction with Chapa instead of trusting the payload
+    and settles the payment with a conditional update, so each payment
+    triggers at most one confirmation email.
+    """
+
+    @staticmethod
+    def event_key(payload):
+        """
+        The dedup key of a delivery, stored alongside its tx_ref.
+
+        The payload is unauthenticated, so the key is never built from its
+        strings: the status it reports is mapped onto the fixed
+        SETTLED_STATUSES, and anything else shares one 'pending' key. A
+        transaction can therefore record at most one event per outcome.
+        """
+        event = str(payload.get('event') or '').strip().lower()
+        reported = event.removeprefix('charge.') if event else str(payload.get('status') or '').strip().lower()
+        return f"charge.{reported if reported in SETTLED_STATUSES else 'pending'}"
+
+    @classmethod
+    def record(cls, payload):
+        """Store a delivery; return (event, created)"""
+        event = PaymentWebhookEvent(
+            tx_ref=payload['tx_ref'],
+            event=cls.event_key(payload),
+            payload=payload,
+        )
+        try:
+            with transaction.atomic():
+                event.save(force_insert=True)
+                Outbox.enqueue('listings.tasks.process_payment_webhook', event.id)
+        except IntegrityError:
+            return event, False
+        return event, True
+
+    @staticmethod
+    def claim(event_id):
+        """Mark an event processed; False if another worker already did"""
+        return bool(
+            PaymentWebhookEvent.objects.filter(pk=event_id, processed_at__isnull=True)
+            .update(processed_at=timezone.now())
+        )
+
+    @classmethod
+    def process(cls, event_id):
+        """
+        Settle the payment referenced by a recorded webhook event.
+
+        Returns the payment if this call moved it to 'completed', None
+        otherwise. Raises WebhookVerificationError when Chapa cannot be
+        reached or has not settled the transaction yet, leaving the event
+        unprocessed for a retry.
+        """
+        event = PaymentWebhookEvent.objects.only('tx_ref', 'processed_at').get(pk=event_id)
+        if event.processed_at:
+            return None
+
+        result = ChapaPaymentService().verify_payment(event.tx_ref)
+        if not result['success']:
+            raise WebhookVerificationError(result['error'])
+
+        new_status = SETTLED_STATUSES.get(result['data'].get('status'))
+        if new_status is None:
+            raise WebhookVerificationError(f"Transaction {event.tx_ref} is not settled yet")
+
+        if not cls.claim(event_id):
+            return None
+
+        with transaction.atomic():
+            updated = Payment.objects.filter(transaction_id=event.tx_ref, status='pending').update(
+                status=new_status,
+                payment_method=result['data'].get('method'),
+                updated_at=timezone.now(),
+            )
+            if not updated:
+                return None
+
+            logger.info(f"Payment {event.tx_ref} marked {new_status} via webhook")
+            if new_status != 'completed':
+                return None
+            payment = Payment.objects.only('id').get(transaction_id=event.tx_ref)
+            Outbox.enqueue('listings.tasks.send_payment_confirmation_email', payment.pk)
+        return payment
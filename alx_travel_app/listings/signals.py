@@ -0,0 +1,123 @@
+# listings/signals.py
+
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .models import Booking, Category, Listing, Location, Review
+from .services.availability_service import AvailabilityCalendar
+from .services.cache_service import category_cache, listing_cache, location_cache
+from .services.fulltext_service import get_search_backend
+from .services.review_stats import ReviewStats
+
+
+@receiver(post_save, sender=Booking)
+def sync_booking_calendar(sender, instance, raw=False, **kwargs):
+    """Hold or release calendar nights whenever a booking is saved"""
+    if raw:
+        return
+    AvailabilityCalendar.sync_booking(instance)
+
+
+@receiver(pre_save, sender=Listing)
+@receiver(pre_save, sender=Category)
+def invalidate_previous_slug(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Drop the response cached under a slug that is about to change"""
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and 'slug' not in update_fields:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+    if previous and previous != instance.slug:
+        cache = listing_cache if sender is Listing else category_cache
+        cache.invalidate(previous)
+
+
+@receiver(post_save, sender=Listing)
+def index_listing_text(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the full-text index in step with title and description"""
+    if raw:
+        return
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    get_search_backend().index_listing(instance)
+
+
+@receiver(post_delete, sender=Listing)
+def unindex_listing_text(sender, instance, **kwargs):
+    get_search_backend().remove_listing(instance.pk)
+
+
+def install_search_index(sender, using, **kwargs):
+    """Create the full-text index after migrate; connected in ListingsConfig.ready"""
+    if using != DEFAULT_DB_ALIAS:
+        return
+    get_search_backend().install()
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_delete, sender=Listing)
+def invalidate_listing(sender, instance, **kwargs):
+    listing_cache.invalidate(instance.slug)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    """Listings embed their category, so they are invalidated with it"""
+    category_cache.invalidate(instance.slug)
+    if not kwargs.get('created'):
+        listing_cache.invalidate(*instance.listings.values_list('slug', flat=True))
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location(sender, instance, **kwargs):
+    """Listings embed their location, so they are invalidated with it"""
+    location_cache.invalidate(instance.pk)
+    if not kwargs.get('created'):
+        listing_cache.invalidate(*instance.listings.values_list('slug', flat=True))
+
+
+@receiver(post_save, sender=User)
+def invalidate_hosted_listings(sender, instance, created=False, update_fields=None, **kwargs):
+    """Listings can embed their host (?include=host), so a profile edit invalidates them"""
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    listing_cache.invalidate(*instance.listings.values_list('slug', flat=True))
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the stored (listing, rating) so post_save can adjust aggregates"""
+    instance._previous_rating = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not {'listing', 'rating'} & set(update_fields):
+        return
+    instance._previous_rating = (
+        sender.objects.filter(pk=instance.pk).values_list('listing_id', 'rating').first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_review_stats(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        ReviewStats.apply(instance.listing_id, added=instance.rating)
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if previous is None or previous == (instance.listing_id, instance.rating):
+        return
+    previous_listing_id, previous_rating = previous
+    if previous_listing_id == instance.listing_id:
+        ReviewStats.apply(instance.listing_id, added=instance.rating, removed=previous_rating)
+    else:
+        ReviewStats.apply(previous_listing_id, removed=previous_rating)
+        ReviewStats.apply(instance.listing_id, added=instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_stats(sender, instance, **kwargs):
+    ReviewStats.apply(instance.listing_id, removed=instance.rating)
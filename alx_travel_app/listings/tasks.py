@@ -1,50 +1,86 @@
 # listings/tasks.py
 
-from alx_travel_app.listings.celery import shared_task
-from django.core.mail import send_mail
-from django.conf import settings
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from celery import shared_task
 import logging
 
 logger = logging.getLogger(__name__)
 
-@shared_task
-def send_payment_confirmation_email(user_email, booking_id, amount):
+# Payloads are ids only; workers load the rows they need in one query.
+# Critical and maintenance tasks are idempotent, so they are acked after
+# they run and redelivered if a worker dies mid-task. Queues and routes
+# are in settings.CELERY_TASK_ROUTES.
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=30, acks_late=True, reject_on_worker_lost=True)
+def send_payment_confirmation_email(self, payment_id):
     """
-    Send payment confirmation email to user
+    Queue a payment confirmation email for the next batched flush
     """
+    from .models import Payment
+    from .services.email_service import ConfirmationEmails
     try:
-        subject = 'Payment Confirmation - Booking Confirmed'
-        
-        # Create HTML content
-        html_message = render_to_string('emails/payment_confirmation.html', {
-            'booking_id': booking_id,
-            'amount': amount
-        })
-        
-        # Create plain text content
-        plain_message = strip_tags(html_message)
-        
-        send_mail(
-            subject,
-            plain_message,
-            settings.EMAIL_HOST_USER,
-            [user_email],
-            html_message=html_message,
-            fail_silently=False,
+        payment = Payment.objects.for_confirmation().get(pk=payment_id)
+        emails = ConfirmationEmails()
+        return emails.send(
+            emails.payment_confirmation(payment.booking.user.email, payment.booking_id, payment.amount)
         )
-        
-        logger.info(f"Payment confirmation email sent to {user_email}")
-        return True
-        
+    except Payment.DoesNotExist:
+        logger.error(f"Cannot send payment confirmation email: payment {payment_id} does not exist")
+        return False
     except Exception as e:
-        logger.error(f"Failed to send payment confirmation email: {str(e)}")
+        logger.warning(f"Retrying payment confirmation email for payment {payment_id}: {str(e)}")
+        raise self.retry(exc=e)
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=30)
+def send_booking_confirmation_email(self, booking_id):
+    """
+    Queue a booking confirmation email for the next batched flush
+    """
+    from .models import Booking
+    from .services.email_service import ConfirmationEmails
+    try:
+        booking = Booking.objects.select_related('user').only('id', 'user__id', 'user__email').get(pk=booking_id)
+        emails = ConfirmationEmails()
+        emails.send(emails.booking_confirmation(booking.user.email, booking.id))
+    except Booking.DoesNotExist:
+        logger.error(f"Cannot send booking confirmation email: booking {booking_id} does not exist")
         return False
+    except Exception as e:
+        logger.warning(f"Retrying booking confirmation email for booking {booking_id}: {str(e)}")
+        raise self.retry(exc=e)
+    return f"Confirmation email queued for {booking.user.email} for booking {booking.id}"
+
+@shared_task(acks_late=True)
+def reconcile_pending_payments():
+    """
+    Verify payments stuck in 'pending' against Chapa and settle them
+    """
+    from .services.reconciliation_service import PaymentReconciler
+    return PaymentReconciler().run()
+
+@shared_task(acks_late=True)
+def flush_listing_view_counts():
+    """
+    Write buffered listing views to Listing.view_count
+    """
+    from .services.view_counter import ViewCounter
+    return ViewCounter().flush()
 
 @shared_task
-def send_booking_confirmation_email(to_email, booking_id):
-    subject = "Booking Confirmation"
-    message = f"Your booking with ID {booking_id} has been confirmed!"
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [to_email])
-    return f"Confirmation email sent to {to_email} for booking {booking_id}"
+def flush_email_queue():
+    """
+    Send queued confirmation emails over one SMTP connection
+    """
+    from .services.email_service import ConfirmationEmails
+    return ConfirmationEmails().flush()
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=30, acks_late=True, reject_on_worker_lost=True)
+def process_payment_webhook(self, event_id):
+    """
+    Verify and apply a recorded Chapa webhook event
+    """
+    from .services.webhook_service import PaymentWebhookService, WebhookVerificationError
+    try:
+        payment = PaymentWebhookService.process(event_id)
+    except WebhookVerificationError as e:
+        raise self.retry(exc=e)
+    return payment is not None
@@ -1,6 +1,5 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from . import views
 
 # Create a router and register our viewsets with it
@@ -23,16 +22,18 @@ urlpatterns = [
     path('my-listings/', views.MyListingsView.as_view(), name='my-listings'),
     path('my-bookings/', views.MyBookingsView.as_view(), name='my-bookings'),
     path('my-favorites/', views.MyFavoritesView.as_view(), name='my-favorites'),
-
-    # Swagger URLs
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('exports/bookings/', views.ExportBookingsView.as_view(), name='export-bookings'),
+    path('outbox/stats/', views.OutboxStatsView.as_view(), name='outbox-stats'),
 
     # Payment
     path('payments/initiate/', views.initiate_payment, name='initiate_payment'),
     path('payments/verify/<str:transaction_id>/', views.verify_payment, name='verify_payment'),
     path('payments/callback/', views.payment_callback, name='payment_callback'),
     path('payments/status/<uuid:payment_id>/', views.payment_status, name='payment_status'),
+
+    # Async payment endpoints (serve under ASGI)
+    path('payments/async/initiate/', views.initiate_payment_async, name='initiate_payment_async'),
+    path('payments/async/verify/<str:transaction_id>/', views.verify_payment_async, name='verify_payment_async'),
 ]
 
 # URL patterns for the app
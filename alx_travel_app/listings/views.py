@@ -1,21 +1,105 @@
 # alx_travel_app/listings/views.py
 
-from rest_framework import status, viewsets
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action, api_view, authentication_classes, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.core.exceptions import ValidationError as DjangoValidationError
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET, require_POST
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import parse_etags
 from django.contrib.sites.shortcuts import get_current_site
-from .models import Booking, Payment
+from .models import Booking, Category, Favorite, Listing, Location, Payment, Review
+from .pagination import KeysetPagination
+from .permissions import IsAdminOrReadOnly
+from .services.amenity_service import AmenityService
+from .services.booking_service import BookingService, BookingUnavailableError
+from .services.export_service import BookingExportService, ExportParamsError
+from .services.outbox_service import Outbox, OutboxRelay
+from .services.cache_service import category_cache, listing_cache, location_cache
 from .services.payment_service import ChapaPaymentService
-from .tasks import send_payment_confirmation_email, send_booking_confirmation_email
+from .services.search_service import ListingSearchService, SearchParamsError
+from .services.view_counter import ViewCounter
+from .services.webhook_service import PaymentWebhookService
+import json
 import logging
 import uuid
-from .serializers import BookingSerializer
+from .serializers import (
+    BookingListSerializer, BookingRequestSerializer, BookingSerializer, CategorySerializer,
+    FavoriteSerializer, ListingDetailSerializer, ListingListSerializer, ListingSearchResultSerializer,
+    ListingSerializer, LocationSerializer, ReviewSerializer
+)
 
 logger = logging.getLogger(__name__)
 
+def build_payment_data(user, booking, payment, tx_ref, domain, phone_number=''):
+    """
+    Build the Chapa initialization data for a booking payment
+    """
+    return {
+        'amount': float(booking.total_price),
+        'currency': 'ETB',
+        'email': user.email,
+        'first_name': user.first_name or user.username,
+        'last_name': user.last_name or '',
+        'phone_number': phone_number,
+        'tx_ref': tx_ref,
+        'callback_url': f"{domain}/api/payments/callback/",
+        'return_url': f"{domain}/booking/success/",
+        'description': f"Booking payment for {booking.listing.title}",
+        'meta': {
+            'booking_id': str(booking.id),
+            'payment_id': str(payment.id),
+            'user_id': str(user.id)
+        }
+    }
+
+def complete_payment(payment, method):
+    """
+    Mark a verified payment completed and queue its confirmation email
+    in the same transaction.
+
+    The status moves with a conditional UPDATE, as in the webhook path, so
+    when a verify call races the webhook or another verify only the one
+    that completes the payment queues the email. Returns whether this
+    call completed it.
+    """
+    with transaction.atomic():
+        updated = Payment.objects.filter(pk=payment.pk).exclude(status='completed').update(
+            status='completed',
+            payment_method=method,
+            updated_at=timezone.now(),
+        )
+        if updated == 1:
+            Outbox.enqueue('listings.tasks.send_payment_confirmation_email', payment.pk)
+    payment.status = 'completed'
+    payment.payment_method = method
+    return updated == 1
+
+def create_pending_payment(booking):
+    """
+    Create the pending payment for a booking, or return None when a
+    concurrent request created it first
+    """
+    try:
+        with transaction.atomic():
+            return Payment.objects.create(
+                booking=booking,
+                amount=booking.total_price,
+                currency='ETB',
+                status='pending'
+            )
+    except IntegrityError:
+        logger.info(f"Payment for booking {booking.id} was created by a concurrent request")
+        return None
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def initiate_payment(request):
@@ -31,31 +115,34 @@ def initiate_payment(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get the booking
-        booking = get_object_or_404(Booking, id=booking_id, user=request.user)
+        # Get the booking with its listing title and any existing payment
+        booking = get_object_or_404(
+            Booking.objects.select_related('listing', 'payment').only(
+                'id', 'total_price', 'listing__id', 'listing__title',
+                'payment__id', 'payment__booking', 'payment__status',
+            ),
+            id=booking_id,
+            user=request.user
+        )
+        payment = getattr(booking, 'payment', None)
         
         # Check if payment already exists
-        if hasattr(booking, 'payment') and booking.payment.status != 'failed':
+        if payment is not None and payment.status != 'failed':
             return Response(
                 {'error': 'Payment already exists for this booking'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create or get payment record
-        payment, created = Payment.objects.get_or_create(
-            booking=booking,
-            defaults={
-                'amount': booking.total_price,
-                'currency': 'ETB',
-                'status': 'pending'
-            }
-        )
-        
-        if not created and payment.status == 'completed':
-            return Response(
-                {'error': 'Payment already completed for this booking'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        # Create the payment record, or retry a failed one
+        if payment is None:
+            payment = create_pending_payment(booking)
+            if payment is None:
+                return Response(
+                    {'error': 'Payment already exists for this booking'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            payment.status = 'pending'
         
         # Generate unique transaction reference
         tx_ref = f"booking_{booking.id}_{uuid.uuid4().hex[:8]}"
@@ -65,23 +152,10 @@ def initiate_payment(request):
         domain = f"http://{current_site.domain}" if request.is_secure() else f"http://{current_site.domain}"
         
         # Prepare payment data
-        payment_data = {
-            'amount': float(booking.total_price),
-            'currency': 'ETB',
-            'email': request.user.email,
-            'first_name': request.user.first_name or request.user.username,
-            'last_name': request.user.last_name or '',
-            'phone_number': request.data.get('phone_number', ''),
-            'tx_ref': tx_ref,
-            'callback_url': f"{domain}/api/payments/callback/",
-            'return_url': f"{domain}/booking/success/",
-            'description': f"Booking payment for {booking.listing.title}",
-            'meta': {
-                'booking_id': str(booking.id),
-                'payment_id': str(payment.id),
-                'user_id': str(request.user.id)
-            }
-        }
+        payment_data = build_payment_data(
+            request.user, booking, payment, tx_ref, domain,
+            request.data.get('phone_number', '')
+        )
         
         # Initialize payment with Chapa
         chapa_service = ChapaPaymentService()
@@ -91,7 +165,7 @@ def initiate_payment(request):
             # Update payment record
             payment.transaction_id = tx_ref
             payment.chapa_reference = result['data'].get('reference')
-            payment.save()
+            payment.save(update_fields=['transaction_id', 'chapa_reference', 'status', 'updated_at'])
             
             logger.info(f"Payment initiated successfully for booking {booking.id}")
             
@@ -122,11 +196,11 @@ def verify_payment(request, transaction_id):
     Verify payment status
     """
     try:
-        # Get payment record
-        payment = get_object_or_404(Payment, transaction_id=transaction_id)
+        # Get payment record with its booking owner
+        payment = get_object_or_404(Payment.objects.for_verification(), transaction_id=transaction_id)
         
         # Check if user owns this payment
-        if payment.booking.user != request.user:
+        if payment.booking.user_id != request.user.id:
             return Response(
                 {'error': 'Unauthorized'}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -149,16 +223,7 @@ def verify_payment(request, transaction_id):
             
             # Update payment status based on Chapa response
             if payment_data['status'] == 'success':
-                payment.status = 'completed'
-                payment.payment_method = payment_data.get('method')
-                payment.save()
-                
-                # Send confirmation email asynchronously
-                send_payment_confirmation_email.delay(
-                    payment.booking.user.email,
-                    payment.booking.id,
-                    str(payment.amount)
-                )
+                complete_payment(payment, payment_data.get('method'))
                 
                 logger.info(f"Payment {payment.id} verified and completed")
                 
@@ -175,7 +240,7 @@ def verify_payment(request, transaction_id):
                 })
             else:
                 payment.status = 'failed'
-                payment.save()
+                payment.save(update_fields=['status', 'updated_at'])
                 
                 return Response({
                     'success': False,
@@ -197,45 +262,31 @@ def verify_payment(request, transaction_id):
         )
 
 @api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
 def payment_callback(request):
     """
     Handle Chapa payment callback (webhook)
+    
+    The delivery is logged and acknowledged immediately; verification and
+    the payment update happen in a worker, scheduled through the outbox. Retried deliveries hit the
+    unique (tx_ref, event) key and are acknowledged without re-processing.
     """
     try:
-        # Extract callback data
-        status_data = request.data.get('status')
-        tx_ref = request.data.get('tx_ref')
+        payload = request.data.dict() if hasattr(request.data, 'dict') else dict(request.data)
+        tx_ref = payload.get('tx_ref')
         
         if not tx_ref:
             logger.warning("Callback received without tx_ref")
             return Response({'message': 'Invalid callback'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Get payment record
-        try:
-            payment = Payment.objects.get(transaction_id=tx_ref)
-        except Payment.DoesNotExist:
-            logger.warning(f"Payment not found for tx_ref: {tx_ref}")
-            return Response({'message': 'Payment not found'}, status=status.HTTP_404_NOT_FOUND)
+        event, created = PaymentWebhookService.record(payload)
         
-        # Update payment status based on callback
-        if status_data == 'success':
-            payment.status = 'completed'
-            payment.save()
-            
-            # Send confirmation email
-            send_payment_confirmation_email.delay(
-                payment.booking.user.email,
-                payment.booking.id,
-                str(payment.amount)
-            )
-            
-            logger.info(f"Payment {payment.id} completed via callback")
-        else:
-            payment.status = 'failed'
-            payment.save()
-            logger.info(f"Payment {payment.id} failed via callback")
+        if not created:
+            logger.debug(f"Duplicate callback {event.event} for tx_ref: {tx_ref}")
+            return Response({'message': 'Callback already received'}, status=status.HTTP_200_OK)
         
-        return Response({'message': 'Callback processed'}, status=status.HTTP_200_OK)
+        return Response({'message': 'Callback received'}, status=status.HTTP_200_OK)
         
     except Exception as e:
         logger.error(f"Error processing callback: {str(e)}")
@@ -251,10 +302,10 @@ def payment_status(request, payment_id):
     Get payment status
     """
     try:
-        payment = get_object_or_404(Payment, id=payment_id)
+        payment = get_object_or_404(Payment.objects.for_status(), id=payment_id)
         
         # Check if user owns this payment
-        if payment.booking.user != request.user:
+        if payment.booking.user_id != request.user.id:
             return Response(
                 {'error': 'Unauthorized'}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -277,13 +328,541 @@ def payment_status(request, payment_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-class BookingViewSet(viewsets.ModelViewSet):
-    queryset = Booking.objects.all()
+async def get_authenticated_user(request):
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+def parse_request_data(request):
+    if request.content_type == 'application/json':
+        return json.loads(request.body or b'{}')
+    return request.POST
+
+async def call_chapa_async(request, method, *args):
+    """
+    Call an AsyncChapaPaymentService method. ASGI workers share one pooled
+    session per event loop; under WSGI every request gets a loop of its
+    own, so the session is opened and closed around the call.
+    """
+    # aiohttp is only loaded by the async endpoints
+    from django.core.handlers.asgi import ASGIRequest
+    from .services.async_payment_service import AsyncChapaPaymentService, chapa_client
+    async with chapa_client(shared=isinstance(request, ASGIRequest)) as client:
+        return await getattr(AsyncChapaPaymentService(client), method)(*args)
+
+@require_POST
+async def initiate_payment_async(request):
+    """
+    Initiate payment for a booking without blocking a worker thread
+    """
+    try:
+        user = await get_authenticated_user(request)
+        if user is None:
+            return JsonResponse({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        try:
+            data = parse_request_data(request)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
+        booking_id = data.get('booking_id')
+        
+        if not booking_id:
+            return JsonResponse(
+                {'error': 'Booking ID is required'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Get the booking
+        try:
+            booking = await Booking.objects.select_related('listing').aget(id=booking_id, user=user)
+        except (Booking.DoesNotExist, DjangoValidationError):
+            return JsonResponse({'error': 'Booking not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        # Check if payment already exists
+        payment = await Payment.objects.filter(booking=booking).afirst()
+        if payment is not None and payment.status != 'failed':
+            return JsonResponse(
+                {'error': 'Payment already exists for this booking'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Create the payment record, or retry a failed one
+        if payment is None:
+            payment = await sync_to_async(create_pending_payment)(booking)
+            if payment is None:
+                return JsonResponse(
+                    {'error': 'Payment already exists for this booking'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            payment.status = 'pending'
+        
+        # Generate unique transaction reference
+        tx_ref = f"booking_{booking.id}_{uuid.uuid4().hex[:8]}"
+        
+        # Get current site domain
+        current_site = await sync_to_async(get_current_site)(request)
+        domain = f"http://{current_site.domain}"
+        
+        payment_data = build_payment_data(
+            user, booking, payment, tx_ref, domain,
+            data.get('phone_number', '')
+        )
+        
+        # Initialize payment with Chapa
+        result = await call_chapa_async(request, 'initiate_payment', payment_data)
+        
+        if result['success']:
+            payment.transaction_id = tx_ref
+            payment.chapa_reference = result['data'].get('reference')
+            await payment.asave(update_fields=['transaction_id', 'chapa_reference', 'status', 'updated_at'])
+            
+            logger.info(f"Payment initiated successfully for booking {booking.id}")
+            
+            return JsonResponse({
+                'success': True,
+                'payment_id': str(payment.id),
+                'checkout_url': result['checkout_url'],
+                'transaction_id': tx_ref
+            }, status=status.HTTP_200_OK)
+        
+        logger.error(f"Payment initiation failed for booking {booking.id}: {result['error']}")
+        return JsonResponse(
+            {'error': result['error']}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+            
+    except Exception as e:
+        logger.error(f"Error initiating payment: {str(e)}")
+        return JsonResponse(
+            {'error': 'An unexpected error occurred'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@require_GET
+async def verify_payment_async(request, transaction_id):
+    """
+    Verify payment status without blocking a worker thread
+    """
+    try:
+        user = await get_authenticated_user(request)
+        if user is None:
+            return JsonResponse({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        try:
+            payment = await Payment.objects.for_verification().aget(transaction_id=transaction_id)
+        except Payment.DoesNotExist:
+            return JsonResponse({'error': 'Payment not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        # Check if user owns this payment
+        if payment.booking.user_id != user.id:
+            return JsonResponse(
+                {'error': 'Unauthorized'}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # Skip verification if already completed
+        if payment.status == 'completed':
+            return JsonResponse({
+                'success': True,
+                'status': 'completed',
+                'message': 'Payment already verified and completed'
+            })
+        
+        # Verify with Chapa
+        result = await call_chapa_async(request, 'verify_payment', transaction_id)
+        
+        if not result['success']:
+            logger.error(f"Payment verification failed for {transaction_id}: {result['error']}")
+            return JsonResponse(
+                {'error': result['error']}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        payment_data = result['data']
+        
+        if payment_data['status'] != 'success':
+            payment.status = 'failed'
+            await payment.asave(update_fields=['status', 'updated_at'])
+            
+            return JsonResponse({
+                'success': False,
+                'status': 'failed',
+                'message': 'Payment verification failed'
+            })
+        
+        await sync_to_async(complete_payment)(payment, payment_data.get('method'))
+        
+        logger.info(f"Payment {payment.id} verified and completed")
+        
+        return JsonResponse({
+            'success': True,
+            'status': 'completed',
+            'message': 'Payment verified successfully',
+            'payment_details': {
+                'amount': str(payment.amount),
+                'currency': payment.currency,
+                'method': payment.payment_method,
+                'transaction_id': payment.transaction_id
+            }
+        })
+            
+    except Exception as e:
+        logger.error(f"Error verifying payment: {str(e)}")
+        return JsonResponse(
+            {'error': 'An unexpected error occurred'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+class CachedRetrieveMixin:
+    """
+    Serve detail reads from a ResponseCache, with ETag / If-None-Match.
+
+    Entries are shared between users, so the retrieve queryset must not
+    depend on who is asking.
+    """
+    response_cache = None
+
+    def get_cache_variant(self):
+        """Distinguishes differently shaped responses for the same object"""
+        return ''
+
+    def get_cached_entry(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        variant = self.get_cache_variant()
+        version, entry = self.response_cache.get(lookup, variant)
+        if entry is None:
+            instance = self.get_object()
+            entry = self.response_cache.set(lookup, version, self.get_serializer(instance).data, variant)
+        return entry
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, self.get_cached_entry())
+
+    def cached_response(self, request, entry):
+        if entry['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry['data'])
+        response['ETag'] = entry['etag']
+        return response
+
+class ValuesRowMixin:
+    """
+    Serve lists, and detail reads that ask for ?fields= or ?include=, from
+    values() rows with a ValuesRowSerializer; every other action keeps the
+    view's full serializer.
+    """
+    list_serializer_class = None
+
+    def get_fieldset(self):
+        """(fields, include) from the query string, or None when neither is given"""
+        if not hasattr(self, '_fieldset'):
+            params = self.request.query_params
+            self._fieldset = None
+            if params.get('fields') or params.get('include'):
+                try:
+                    self._fieldset = self.list_serializer_class.parse_fieldset(
+                        params.get('fields'), params.get('include')
+                    )
+                except ValueError as e:
+                    raise ValidationError({'error': str(e)})
+        return self._fieldset
+
+    def uses_rows(self):
+        # Plain generic list views have no action
+        action = getattr(self, 'action', 'list')
+        return action == 'list' or (action == 'retrieve' and self.get_fieldset() is not None)
+
+    def get_cache_variant(self):
+        fields, include = self.get_fieldset() or (None, ())
+        if fields is None and not include:
+            return ''
+        return f"fields={','.join(fields or ())};include={','.join(include)}"
+
+    def get_serializer_class(self):
+        if self.uses_rows():
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.uses_rows():
+            fields, include = self.get_fieldset() or (None, ())
+            kwargs.update(fields=fields, include=include)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.uses_rows():
+            fields, include = self.get_fieldset() or (None, ())
+            queryset = self.list_serializer_class.rows(queryset, fields, include)
+        return queryset
+
+class ListingViewSet(ValuesRowMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
+    serializer_class = ListingSerializer
+    list_serializer_class = ListingListSerializer
+    pagination_class = KeysetPagination
+    lookup_field = 'slug'
+    response_cache = listing_cache
+
+    def get_queryset(self):
+        if self.action in ('update', 'partial_update', 'destroy'):
+            return Listing.objects.filter(host=self.request.user)
+        queryset = Listing.objects.filter(status='published').select_related('category', 'location')
+        if self.action == 'list':
+            amenities = AmenityService.parse_filter(self.request.query_params.get('amenities'))
+            queryset = AmenityService.filter_listings(queryset, amenities)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'retrieve' and not self.uses_rows():
+            return ListingDetailSerializer
+        return super().get_serializer_class()
+
+    def perform_create(self, serializer):
+        serializer.save(host=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        entry = self.get_cached_entry()
+        ViewCounter().record(entry['data']['id'])
+        return self.cached_response(request, entry)
+
+    @action(detail=True, methods=['get'])
+    def views(self, request, slug=None):
+        """Live view count: the flushed total plus views still buffered"""
+        listing = self.get_object()
+        return Response({
+            'listing_id': str(listing.id),
+            'view_count': ViewCounter().live_count(listing)
+        })
+
+class CategoryViewSet(CachedRetrieveMixin, viewsets.ModelViewSet):
+    queryset = Category.objects.filter(is_active=True)
+    serializer_class = CategorySerializer
+    permission_classes = [IsAdminOrReadOnly]
+    lookup_field = 'slug'
+    response_cache = category_cache
+
+class LocationViewSet(CachedRetrieveMixin, viewsets.ModelViewSet):
+    queryset = Location.objects.all()
+    serializer_class = LocationSerializer
+    permission_classes = [IsAdminOrReadOnly]
+    response_cache = location_cache
+
+class ReviewViewSet(viewsets.ModelViewSet):
+    """
+    Reviews; each write and its listing aggregate update share a transaction
+    """
+    serializer_class = ReviewSerializer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        if self.action in ('update', 'partial_update', 'destroy'):
+            return Review.objects.filter(user=self.request.user)
+        return Review.objects.select_related('user')
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+class ListingReviewsView(generics.ListAPIView):
+    """
+    Reviews of a single listing
+    """
+    serializer_class = ReviewSerializer
+    pagination_class = KeysetPagination
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        return Review.objects.filter(listing_id=self.kwargs['listing_id']).select_related('user')
+
+class BookingViewSet(ValuesRowMixin, viewsets.ModelViewSet):
+    """
+    Bookings; guests only see their own, staff see every booking
+    """
     serializer_class = BookingSerializer
+    list_serializer_class = BookingListSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        if self.request.user.is_staff:
+            return Booking.objects.all()
+        return Booking.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        booking = serializer.save()
-        if booking.user and booking.user.email:
-            send_booking_confirmation_email.delay(
-                booking.user.email, booking.id
+        data = serializer.validated_data
+        try:
+            booking = BookingService.create_booking(
+                listing_id=data['listing'].pk,
+                user=self.request.user,
+                check_in_date=data['check_in_date'],
+                check_out_date=data['check_out_date'],
+                guests=data['guests'],
+                special_requests=data.get('special_requests', '')
             )
+        except DjangoValidationError as e:
+            raise ValidationError({'error': e.messages[0]})
+        serializer.instance = booking
+
+    def perform_update(self, serializer):
+        try:
+            BookingService.update_booking(serializer.instance, **serializer.validated_data)
+        except DjangoValidationError as e:
+            raise ValidationError({'error': e.messages[0]})
+
+class CreateBookingView(APIView):
+    """
+    Book a listing for the authenticated user
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, listing_id):
+        serializer = BookingRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            booking = BookingService.create_booking(
+                listing_id=listing_id,
+                user=request.user,
+                **data
+            )
+        except Listing.DoesNotExist:
+            return Response({'error': 'Listing not found'}, status=status.HTTP_404_NOT_FOUND)
+        except BookingUnavailableError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
+        except DjangoValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(f"Booking {booking.id} created for listing {listing_id}")
+
+        return Response(BookingSerializer(booking).data, status=status.HTTP_201_CREATED)
+
+class SearchListingsView(generics.ListAPIView):
+    """
+    Search available listings by city, dates, guest count, text and map area
+    """
+    serializer_class = ListingSerializer
+    permission_classes = [AllowAny]
+
+    def get_search_service(self):
+        if not hasattr(self, '_search_service'):
+            try:
+                self._search_service = ListingSearchService(self.request.query_params)
+            except SearchParamsError as e:
+                raise ValidationError({'error': str(e)})
+        return self._search_service
+
+    def get_queryset(self):
+        return self.get_search_service().search()
+
+    def get_serializer_class(self):
+        service = self.get_search_service()
+        if service.terms or service.point:
+            return ListingSearchResultSerializer
+        return ListingSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['search_terms'] = self.get_search_service().terms
+        return context
+
+class MyListingsView(ValuesRowMixin, generics.ListAPIView):
+    """
+    Listings hosted by the authenticated user, in every status
+    """
+    list_serializer_class = ListingListSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Listing.objects.filter(host=self.request.user)
+
+class MyBookingsView(ValuesRowMixin, generics.ListAPIView):
+    """
+    Bookings made by the authenticated user
+    """
+    list_serializer_class = BookingListSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Booking.objects.filter(user=self.request.user)
+
+class MyFavoritesView(generics.ListAPIView):
+    """
+    Listings favorited by the authenticated user, most recent first
+    """
+    serializer_class = FavoriteSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Favorite.objects.filter(user=self.request.user).select_related('listing')
+
+class ToggleFavoriteView(APIView):
+    """
+    Add a published listing to the user's favorites, or remove it
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, listing_id):
+        listing = get_object_or_404(Listing.objects.only('id'), pk=listing_id, status='published')
+        favorite, created = Favorite.objects.get_or_create(user=request.user, listing=listing)
+        if not created:
+            favorite.delete()
+        return Response(
+            {'listing_id': str(listing.id), 'is_favorited': created},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+class ExportBookingsView(APIView):
+    """
+    Stream every matching booking with its payment as CSV (default) or
+    NDJSON (?output=ndjson), filtered by date_from, date_to, status and
+    payment_status
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        output = request.query_params.get('output', 'csv')
+        try:
+            export = BookingExportService.from_params(request.query_params)
+            chunks = export.stream(output)
+        except ExportParamsError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(chunks, content_type=BookingExportService.FORMATS[output])
+        response['Content-Disposition'] = f'attachment; filename="bookings.{output}"'
+        return response
+
+class OutboxStatsView(APIView):
+    """
+    Outbox depth, lag of the oldest pending message and relay throughput
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(OutboxRelay.stats())
+
+# Error handlers referenced from the root URLconf
+
+def bad_request(request, exception=None):
+    return JsonResponse({'error': 'Bad request'}, status=status.HTTP_400_BAD_REQUEST)
+
+def permission_denied(request, exception=None):
+    return JsonResponse({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+def not_found(request, exception=None):
+    return JsonResponse({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+
+def server_error(request):
+    return JsonResponse({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
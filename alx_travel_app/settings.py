@@ -248,6 +248,11 @@ CHAPA_SECRET_KEY = config('CHAPA_SECRET_KEY', default='')
 CHAPA_PUBLIC_KEY = config('CHAPA_PUBLIC_KEY', default='')
 # CHAPA_BASE_URL = 'https://api.chapa.co/v1/'  # Production
 CHAPA_BASE_URL = 'https://api.chapa.co/v1/'  # Use sandbox for testing
+CHAPA_CONNECT_TIMEOUT = config('CHAPA_CONNECT_TIMEOUT', default=3.05, cast=float)
+CHAPA_READ_TIMEOUT = config('CHAPA_READ_TIMEOUT', default=30, cast=float)
+CHAPA_POOL_MAXSIZE = config('CHAPA_POOL_MAXSIZE', default=20, cast=int)
+CHAPA_MAX_RETRIES = config('CHAPA_MAX_RETRIES', default=3, cast=int)
+CHAPA_RETRY_BACKOFF = config('CHAPA_RETRY_BACKOFF', default=0.3, cast=float)
 
 # Email settings (if not already configured)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
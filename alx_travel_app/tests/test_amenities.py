@@ -0,0 +1,59 @@
+# tests/test_amenities.py
+
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from listings.models import Category, Location, Listing
+from listings.services.search_service import ListingSearchService
+
+class AmenityFlagsTestCase(TestCase):
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password='testpass123')
+        self.category = Category.objects.create(name='City', slug='city')
+        self.location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+
+    def create_listing(self, slug, amenities):
+        return Listing.objects.create(
+            title=slug.title(),
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.host,
+            category=self.category,
+            location=self.location,
+            price_per_night=100,
+            slug=slug,
+            amenities=amenities
+        )
+
+    def test_flags_follow_the_amenities_text(self):
+        listing = self.create_listing('flat', 'wifi, Pool, Rooftop')
+        self.assertEqual(listing.amenity_flags, Listing.amenity_mask(['WiFi', 'Pool']))
+
+        listing.amenities = 'Pool, Hot Tub'
+        listing.save(update_fields=['amenities'])
+        listing.refresh_from_db()
+        self.assertEqual(listing.amenity_flags, Listing.amenity_mask(['Hot Tub', 'Pool']))
+
+    def test_backfill_command_sets_flags_of_existing_listings(self):
+        listing = self.create_listing('flat', '')
+        Listing.objects.filter(pk=listing.pk).update(amenities='Kitchen, Garden')
+
+        call_command('backfill_amenities', stdout=StringIO())
+        listing.refresh_from_db()
+        self.assertEqual(listing.amenity_flags, Listing.amenity_mask(['Kitchen', 'Garden']))
+
+    def test_search_requires_every_amenity(self):
+        both = self.create_listing('both', 'WiFi, Pool, Gym')
+        self.create_listing('wifi-only', 'WiFi')
+        self.create_listing('none', '')
+
+        with CaptureQueriesContext(connection) as queries:
+            results = list(ListingSearchService({'amenities': 'pool,WiFi'}).search())
+
+        self.assertEqual(results, [both])
+        self.assertFalse(any('LIKE' in query['sql'] for query in queries.captured_queries))
+        self.assertEqual(list(ListingSearchService({'amenities': 'Pool,Sauna'}).search()), [])
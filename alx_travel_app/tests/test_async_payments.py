@@ -0,0 +1,145 @@
+# tests/test_async_payments.py
+
+import asyncio
+import threading
+from aiohttp import web
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from listings.models import Booking, Category, Listing, Location, OutboxMessage, Payment
+from listings.services import async_payment_service
+from listings.services.async_payment_service import AsyncChapaPaymentService, chapa_client
+from unittest.mock import patch
+
+class FakeChapa:
+    """Chapa stand-in served by aiohttp from its own event loop thread"""
+
+    def __init__(self):
+        self.requests = []
+        self.verify_errors = []
+        app = web.Application()
+        app.router.add_post('/transaction/initialize', self.initialize)
+        app.router.add_get('/transaction/verify/{tx_ref}', self.verify)
+        self.runner = web.AppRunner(app)
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.url = f"http://127.0.0.1:{self.runner.addresses[0][1]}/"
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+
+    async def initialize(self, request):
+        payload = await request.json()
+        self.requests.append(('initialize', request.headers['Authorization'], payload))
+        return web.json_response({
+            'status': 'success',
+            'data': {'checkout_url': f"https://checkout.chapa.test/{payload['tx_ref']}", 'reference': 'ref-1'},
+        })
+
+    async def verify(self, request):
+        tx_ref = request.match_info['tx_ref']
+        self.requests.append(('verify', request.headers['Authorization'], tx_ref))
+        if self.verify_errors:
+            return web.Response(status=self.verify_errors.pop(0))
+        return web.json_response({'status': 'success', 'data': {'status': 'success', 'method': 'telebirr', 'tx_ref': tx_ref}})
+
+class AsyncPaymentTestCase(TestCase):
+    def setUp(self):
+        self.chapa = FakeChapa()
+        self.addCleanup(self.chapa.stop)
+        gateway = override_settings(CHAPA_BASE_URL=self.chapa.url, CHAPA_SECRET_KEY='test-secret', CHAPA_RETRY_BACKOFF=0)
+        gateway.enable()
+        self.addCleanup(gateway.disable)
+
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='testpass123')
+        listing = Listing.objects.create(
+            title='Async Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.user,
+            category=Category.objects.create(name='City', slug='city'),
+            location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+            price_per_night=100,
+            slug='async-flat'
+        )
+        self.booking = Booking.objects.create(
+            listing=listing, user=self.user, check_in_date='2030-01-01',
+            check_out_date='2030-01-03', guests=1, total_price=200
+        )
+        self.client.force_login(self.user)
+
+    def call(self, method, *args):
+        async def run():
+            async with chapa_client(shared=False) as client:
+                return await getattr(AsyncChapaPaymentService(client), method)(*args)
+        return async_to_sync(run)()
+
+    def test_initiate_posts_the_payload_with_the_secret_key(self):
+        result = self.call('initiate_payment', {
+            'amount': '200.00', 'email': 'guest@example.com', 'first_name': 'Jane', 'last_name': 'Doe',
+            'tx_ref': 'tx-1', 'callback_url': 'http://testserver/cb', 'return_url': 'http://testserver/done',
+        })
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['checkout_url'], 'https://checkout.chapa.test/tx-1')
+        _, authorization, payload = self.chapa.requests[0]
+        self.assertEqual(authorization, 'Bearer test-secret')
+        self.assertEqual((payload['tx_ref'], payload['amount']), ('tx-1', '200.00'))
+
+    def test_verify_retries_gateway_errors(self):
+        self.chapa.verify_errors = [503, 502]
+        result = self.call('verify_payment', 'tx-1')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['method'], 'telebirr')
+        self.assertEqual(len(self.chapa.requests), 3)
+
+    def test_unreachable_gateway_is_reported(self):
+        self.chapa.stop()
+        result = self.call('verify_payment', 'tx-1')
+
+        self.assertFalse(result['success'])
+        self.assertIn('Network error', result['error'])
+
+    def test_retrying_a_failed_payment_resets_it_to_pending(self):
+        payment = Payment.objects.create(booking=self.booking, amount=200, status='failed', transaction_id='tx-old')
+        opened = []
+        build_client = async_payment_service.build_client
+
+        def tracked():
+            opened.append(build_client())
+            return opened[-1]
+
+        with patch('listings.services.async_payment_service.build_client', side_effect=tracked):
+            response = self.client.post(
+                '/api/payments/async/initiate/', {'booking_id': str(self.booking.id)}, content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'pending')
+        self.assertEqual(payment.transaction_id, response.json()['transaction_id'])
+        self.assertEqual(payment.chapa_reference, 'ref-1')
+        # Served through WSGI: the session is closed with its request
+        self.assertEqual(len(opened), 1)
+        self.assertTrue(opened[0].closed)
+
+    def test_verify_completes_the_payment_and_queues_the_confirmation(self):
+        payment = Payment.objects.create(booking=self.booking, amount=200, status='pending', transaction_id='tx-1')
+        response = self.client.get('/api/payments/async/verify/tx-1/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'completed')
+        payment.refresh_from_db()
+        self.assertEqual((payment.status, payment.payment_method), ('completed', 'telebirr'))
+        self.assertEqual(OutboxMessage.objects.get().args, [str(payment.pk)])
@@ -0,0 +1,105 @@
+# tests/test_availability_calendar.py
+
+from datetime import date
+from django.db import IntegrityError
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from listings.models import Category, Location, Listing, Booking, CalendarNight
+from listings.services.availability_service import AvailabilityCalendar
+from listings.services.booking_service import BookingService, BookingUnavailableError
+
+class AvailabilityCalendarTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='testpass123')
+        self.listing = Listing.objects.create(
+            title='Calendar Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.user,
+            category=Category.objects.create(name='City', slug='city'),
+            location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+            price_per_night=100,
+            slug='calendar-flat'
+        )
+
+    def book(self, check_in, check_out, status='pending'):
+        return Booking.objects.create(
+            listing=self.listing,
+            user=self.user,
+            check_in_date=check_in,
+            check_out_date=check_out,
+            guests=1,
+            total_price=100,
+            status=status
+        )
+
+    def held(self):
+        return list(CalendarNight.objects.values_list('night', flat=True))
+
+    def test_created_booking_holds_its_nights(self):
+        self.book(date(2025, 3, 1), date(2025, 3, 4))
+        self.assertEqual(self.held(), [date(2025, 3, 1), date(2025, 3, 2), date(2025, 3, 3)])
+        self.assertFalse(AvailabilityCalendar.is_available(self.listing.id, date(2025, 3, 3), date(2025, 3, 5)))
+        self.assertTrue(AvailabilityCalendar.is_available(self.listing.id, date(2025, 3, 4), date(2025, 3, 5)))
+
+    def test_cancelling_releases_nights(self):
+        booking = self.book(date(2025, 3, 1), date(2025, 3, 4))
+        booking.status = 'cancelled'
+        booking.save()
+        self.assertEqual(self.held(), [])
+
+    def test_queryset_update_syncs_the_calendar(self):
+        booking = self.book(date(2025, 3, 1), date(2025, 3, 4))
+        Booking.objects.filter(pk=booking.pk).update(status='cancelled')
+        self.assertEqual(self.held(), [])
+
+        Booking.objects.filter(pk=booking.pk).update(status='confirmed', check_out_date=date(2025, 3, 2))
+        self.assertEqual(self.held(), [date(2025, 3, 1)])
+
+    def test_reactivating_over_another_booking_is_rejected(self):
+        cancelled = self.book(date(2025, 3, 1), date(2025, 3, 4), status='cancelled')
+        self.book(date(2025, 3, 2), date(2025, 3, 3))
+
+        with self.assertRaises(BookingUnavailableError):
+            BookingService.update_booking(cancelled, status='confirmed')
+        cancelled.status = 'confirmed'
+        with self.assertRaises(IntegrityError):
+            cancelled.save()
+        with self.assertRaises(IntegrityError):
+            Booking.objects.filter(pk=cancelled.pk).update(status='confirmed')
+
+        cancelled.refresh_from_db()
+        self.assertEqual(cancelled.status, 'cancelled')
+        self.assertEqual(self.held(), [date(2025, 3, 2)])
+
+    def test_api_updates_are_checked_against_the_calendar(self):
+        booking = self.book(date(2025, 3, 1), date(2025, 3, 3))
+        self.book(date(2025, 3, 5), date(2025, 3, 7))
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f'/api/bookings/{booking.pk}/'
+
+        response = client.patch(url, {'check_out_date': '2025-03-06'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        booking.refresh_from_db()
+        self.assertEqual(booking.check_out_date, date(2025, 3, 3))
+
+        response = client.patch(url, {'check_out_date': '2025-03-05'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_price'], '400.00')
+        self.assertEqual(len(self.held()), 6)
+
+    def test_rebuild_matches_active_bookings(self):
+        self.book(date(2025, 3, 1), date(2025, 3, 3), status='confirmed')
+        self.book(date(2025, 4, 1), date(2025, 4, 2), status='completed')
+        CalendarNight.objects.all().delete()
+
+        AvailabilityCalendar.rebuild()
+
+        self.assertEqual(self.held(), [date(2025, 3, 1), date(2025, 3, 2)])
+        self.assertEqual(
+            AvailabilityCalendar.unavailable_listing_ids([self.listing.id], date(2025, 3, 2), date(2025, 3, 9)),
+            {self.listing.id}
+        )
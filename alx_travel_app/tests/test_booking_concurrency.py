@@ -0,0 +1,139 @@
+# tests/test_booking_concurrency.py
+
+import logging
+import os
+import random
+import threading
+import time
+from datetime import date, timedelta
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from listings.models import Category, Location, Listing, Booking
+from listings.services.booking_service import BookingService, BookingUnavailableError
+
+logger = logging.getLogger(__name__)
+
+def create_listing(host):
+    return Listing.objects.create(
+        title='Contended Flat',
+        description='Everyone wants to stay here',
+        listing_type='apartment',
+        status='published',
+        host=host,
+        category=Category.objects.create(name='City', slug='city'),
+        location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+        price_per_night=100,
+        max_guests=4,
+        slug='contended-flat'
+    )
+
+class BookingServiceTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='testpass123')
+        self.listing = create_listing(self.user)
+
+    def test_overlapping_booking_is_rejected(self):
+        booking = BookingService.create_booking(
+            self.listing.id, self.user, date(2025, 5, 1), date(2025, 5, 4), guests=2
+        )
+        self.assertEqual(booking.total_price, 300)
+
+        with self.assertRaises(BookingUnavailableError):
+            BookingService.create_booking(
+                self.listing.id, self.user, date(2025, 5, 3), date(2025, 5, 6), guests=2
+            )
+
+        BookingService.create_booking(
+            self.listing.id, self.user, date(2025, 5, 4), date(2025, 5, 6), guests=2
+        )
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_api_bookings_belong_to_the_requester_and_start_pending(self):
+        guest = User.objects.create_user(username='other', password='testpass123')
+        client = APIClient()
+        client.force_authenticate(guest)
+
+        response = client.post('/api/bookings/', {
+            'listing': str(self.listing.id), 'user': self.user.id, 'status': 'confirmed',
+            'check_in_date': '2025-05-01', 'check_out_date': '2025-05-03', 'guests': 2,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        booking = Booking.objects.get()
+        self.assertEqual((booking.user, booking.status, booking.total_price), (guest, 'pending', 200))
+
+        response = client.patch(f'/api/bookings/{booking.pk}/', {'status': 'confirmed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'pending')
+
+        response = client.post('/api/bookings/', {
+            'listing': str(self.listing.id), 'check_in_date': '2025-05-02',
+            'check_out_date': '2025-05-04', 'guests': 2,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+@skipUnlessDBFeature('has_select_for_update')
+class BookingConcurrencyStressTestCase(TransactionTestCase):
+    """
+    Fires concurrent booking attempts at a single listing and checks that
+    no two active bookings overlap. Set BOOKING_STRESS_THREADS to change
+    the number of concurrent requests.
+    """
+    threads = int(os.environ.get('BOOKING_STRESS_THREADS', 200))
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='testpass123')
+        self.listing = create_listing(self.user)
+
+    def attempt(self, check_in, nights, barrier, outcomes):
+        try:
+            barrier.wait()
+            BookingService.create_booking(
+                self.listing.id, self.user, check_in, check_in + timedelta(days=nights), guests=1
+            )
+            outcomes.append('booked')
+        except BookingUnavailableError:
+            outcomes.append('rejected')
+        except Exception as e:
+            outcomes.append(f'error: {e}')
+        finally:
+            connection.close()
+
+    def test_concurrent_bookings_never_overlap(self):
+        rng = random.Random(42)
+        start = date(2025, 6, 1)
+        barrier = threading.Barrier(self.threads)
+        outcomes = []
+        workers = [
+            threading.Thread(
+                target=self.attempt,
+                args=(start + timedelta(days=rng.randint(0, 60)), rng.randint(1, 5), barrier, outcomes)
+            )
+            for _ in range(self.threads)
+        ]
+
+        began = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - began
+
+        errors = [outcome for outcome in outcomes if outcome.startswith('error')]
+        self.assertEqual(errors, [])
+
+        bookings = list(
+            Booking.objects.filter(listing=self.listing).order_by('check_in_date')
+            .values_list('check_in_date', 'check_out_date')
+        )
+        for (_, previous_out), (next_in, _) in zip(bookings, bookings[1:]):
+            self.assertLessEqual(previous_out, next_in)
+        self.assertEqual(len(bookings), outcomes.count('booked'))
+
+        logger.info(
+            f"{self.threads} concurrent requests in {elapsed:.2f}s "
+            f"({self.threads / elapsed:.1f} req/s): "
+            f"{outcomes.count('booked')} booked, {outcomes.count('rejected')} rejected, 0 overlaps"
+        )
@@ -0,0 +1,83 @@
+# tests/test_booking_export.py
+
+import csv
+import io
+import json
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from listings.models import Booking, Category, Location, Listing, Payment
+from listings.services.export_service import BookingExportService
+
+class BookingExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='finance', password='testpass123', is_staff=True)
+        self.category = Category.objects.create(name='City', slug='city')
+        self.location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.listing = Listing.objects.create(
+            title='Loft',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.admin,
+            category=self.category,
+            location=self.location,
+            price_per_night=100,
+            slug='loft'
+        )
+        self.bookings = []
+        for index in range(5):
+            booking = Booking.objects.create(
+                listing=self.listing, user=self.admin,
+                check_in_date=timezone.localdate() + timedelta(days=10 * index),
+                check_out_date=timezone.localdate() + timedelta(days=10 * index + 2),
+                guests=1, total_price=200, status='confirmed' if index % 2 else 'pending'
+            )
+            self.bookings.append(booking)
+        Payment.objects.create(booking=self.bookings[1], amount=200, status='completed', transaction_id='tx-1')
+        # Two bookings on the day before, to exercise the date range
+        Booking.objects.filter(pk__in=[self.bookings[3].pk, self.bookings[4].pk]).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+
+    def read_csv(self, body):
+        return list(csv.DictReader(io.StringIO(body)))
+
+    def test_batches_cover_every_row_once_in_order(self):
+        export = BookingExportService(batch_size=2)
+        ids = [row[0] for batch in export.batches() for row in batch]
+
+        expected = Booking.objects.order_by('created_at', 'id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_csv_endpoint_streams_filtered_rows_with_payments(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('listings:export-bookings'), {'status': 'confirmed'})
+
+        self.assertTrue(response.streaming)
+        rows = self.read_csv(b''.join(response.streaming_content).decode())
+        self.assertEqual(len(rows), 2)
+        paid = next(row for row in rows if row['booking_id'] == str(self.bookings[1].id))
+        self.assertEqual((paid['payment_status'], paid['transaction_id']), ('completed', 'tx-1'))
+
+    def test_ndjson_command_filters_by_date(self):
+        out = io.StringIO()
+        today = timezone.localdate().isoformat()
+        call_command('export_bookings', output='ndjson', date_from=today, date_to=today, stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertIsNone(rows[0]['payment_id'])
+
+    def test_export_requires_staff_and_valid_filters(self):
+        self.client.force_authenticate(User.objects.create_user(username='guest'))
+        self.assertEqual(self.client.get(reverse('listings:export-bookings')).status_code, 403)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('listings:export-bookings'), {'status': 'lost'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,164 @@
+# tests/test_email_batching.py
+
+import smtplib
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+from django.contrib.auth.models import User
+from listings.models import Booking, Category, Listing, Location, Payment
+from listings.services.email_service import ConfirmationEmails, EmailDeliveryError, MemoryEmailQueue
+from listings.tasks import send_booking_confirmation_email, send_payment_confirmation_email
+from unittest.mock import patch
+
+class FlakyBackend(EmailBackend):
+    """Locmem backend that refuses one recipient and drops the connection at another"""
+    refused = 'refused@example.com'
+    disconnect = 'disconnect@example.com'
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.refused in message.to:
+                raise smtplib.SMTPRecipientsRefused({self.refused: (550, b'No such user')})
+            if self.disconnect in message.to:
+                raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return super().send_messages(messages)
+
+class DownBackend(EmailBackend):
+    """Locmem backend whose server refuses the first `refusals` connections"""
+    refusals = 0
+
+    def open(self):
+        if DownBackend.refusals:
+            DownBackend.refusals -= 1
+            raise ConnectionRefusedError('Connection refused')
+        return super().open()
+
+class EmailBatchingTestCase(TestCase):
+    def setUp(self):
+        self.queue = MemoryEmailQueue()
+        self.emails = ConfirmationEmails(queue=self.queue, batch_size=2)
+
+    def queue_payments(self, recipients):
+        for index, to in enumerate(recipients):
+            self.emails.send(self.emails.payment_confirmation(to, f'booking-{index}', '150.00'))
+
+    def test_queued_emails_are_sent_on_flush_one_connection_per_batch(self):
+        self.queue_payments([f'guest{index}@example.com' for index in range(5)])
+        self.assertEqual(len(mail.outbox), 0)
+
+        with patch('listings.services.email_service.get_connection', wraps=get_connection) as connect:
+            self.assertEqual(self.emails.flush(), 5)
+
+        self.assertEqual(connect.call_count, 3)
+        self.assertEqual([message.to for message in mail.outbox], [[f'guest{index}@example.com'] for index in range(5)])
+        self.assertEqual(self.emails.flush(), 0)
+
+    def test_payment_email_has_text_and_html_bodies(self):
+        self.queue_payments(['guest@example.com'])
+        self.emails.flush()
+
+        message = mail.outbox[0]
+        self.assertEqual(message.subject, 'Payment Confirmation - Booking Confirmed')
+        self.assertIn('booking-0', message.body)
+        self.assertNotIn('<', message.body)
+        html, mimetype = message.alternatives[0]
+        self.assertEqual(mimetype, 'text/html')
+        self.assertIn('150.00', html)
+
+    def test_refused_recipient_is_dropped_and_dropped_connection_is_retried(self):
+        self.queue_payments(['a@example.com', FlakyBackend.refused, 'b@example.com', FlakyBackend.disconnect])
+
+        with self.settings(EMAIL_BACKEND='tests.test_email_batching.FlakyBackend'):
+            self.assertEqual(self.emails.flush(), 3)
+        self.assertEqual([message.to for message in mail.outbox], [['a@example.com'], ['b@example.com']])
+
+        self.queue_payments(['c@example.com'])
+        self.assertEqual(self.emails.flush(), 1)
+        self.assertEqual(mail.outbox[-1].to, [FlakyBackend.disconnect])
+        self.assertEqual(self.emails.flush(), 1)
+        self.assertEqual(mail.outbox[-1].to, ['c@example.com'])
+
+    def test_unsendable_messages_are_dropped_without_blocking_the_queue(self):
+        self.queue_payments(['bad\naddress@example.com'])
+        self.emails.send({'kind': 'postcard', 'to': 'a@example.com'})
+        self.queue_payments(['good@example.com'])
+
+        self.assertEqual(self.emails.flush(), 3)
+        self.assertEqual([message.to for message in mail.outbox], [['good@example.com']])
+        self.assertEqual(self.emails.flush(), 0)
+
+    def create_payment(self):
+        user = User.objects.create_user(username='guest', email='guest@example.com', password='testpass123')
+        listing = Listing.objects.create(
+            title='Mail Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=user,
+            category=Category.objects.create(name='City', slug='city'),
+            location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+            price_per_night=100,
+            slug='mail-flat'
+        )
+        booking = Booking.objects.create(
+            listing=listing,
+            user=user,
+            check_in_date='2025-08-01',
+            check_out_date='2025-08-03',
+            guests=1,
+            total_price=200
+        )
+        return Payment.objects.create(booking=booking, transaction_id='tx_mail', amount=200)
+
+    def test_tasks_load_rows_by_id_and_send_immediately_without_a_queue(self):
+        payment = self.create_payment()
+        with self.assertNumQueries(1):
+            self.assertTrue(send_payment_confirmation_email(str(payment.pk)))
+        with self.assertNumQueries(1):
+            send_booking_confirmation_email(str(payment.booking_id))
+
+        self.assertEqual([message.to for message in mail.outbox], [['guest@example.com']] * 2)
+        self.assertIn('200.00', mail.outbox[0].alternatives[0][0])
+        self.assertEqual(mail.outbox[1].subject, 'Booking Confirmation')
+        self.assertIn(str(payment.booking_id), mail.outbox[1].body)
+
+    def test_tasks_queue_when_a_queue_is_configured(self):
+        payment = self.create_payment()
+        with patch('listings.services.email_service.get_queue', return_value=self.queue):
+            send_payment_confirmation_email(str(payment.pk))
+            send_booking_confirmation_email(str(payment.booking_id))
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(self.emails.flush(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_missing_rows_are_reported(self):
+        self.assertFalse(send_payment_confirmation_email('00000000-0000-0000-0000-000000000000'))
+        self.assertFalse(send_booking_confirmation_email('00000000-0000-0000-0000-000000000000'))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_emails_sent_without_a_queue_are_retried_when_the_server_is_down(self):
+        payment = self.create_payment()
+        self.addCleanup(setattr, DownBackend, 'refusals', 0)
+        with patch('listings.services.email_service.get_connection', side_effect=DownBackend):
+            DownBackend.refusals = 1
+            with self.assertRaises(EmailDeliveryError):
+                ConfirmationEmails().send(ConfirmationEmails.booking_confirmation('guest@example.com', 'b-1'))
+            self.assertEqual(len(mail.outbox), 0)
+
+            DownBackend.refusals = 2
+            self.assertTrue(send_payment_confirmation_email.apply(args=[str(payment.pk)]).get())
+            DownBackend.refusals = 2
+            send_booking_confirmation_email.apply(args=[str(payment.booking_id)]).get()
+
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_payment_email_is_retried_when_the_queue_is_unreachable(self):
+        payment = self.create_payment()
+        send = patch.object(ConfirmationEmails, 'send', side_effect=[ConnectionError('Redis is down'), True])
+        with send as mocked:
+            result = send_payment_confirmation_email.apply(args=[str(payment.pk)])
+
+        self.assertTrue(result.get())
+        self.assertEqual(mocked.call_count, 2)
@@ -0,0 +1,82 @@
+# tests/test_fulltext_search.py
+
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory
+from listings.models import Category, Location, Listing
+from listings.services.fulltext_service import highlight
+from listings.services.search_service import ListingSearchService
+from listings.views import SearchListingsView
+
+class FullTextSearchTestCase(TestCase):
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password='testpass123')
+        self.category = Category.objects.create(name='City', slug='city')
+        self.location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.villa = self.create_listing('Pool villa', 'Quiet stone house with a garden.')
+        self.loft = self.create_listing('Harbour loft', 'Bright loft, short walk to the public pool.')
+        self.cabin = self.create_listing('Forest cabin', 'Wood stove and hiking trails.')
+
+    def create_listing(self, title, description):
+        return Listing.objects.create(
+            title=title,
+            description=description,
+            listing_type='house',
+            status='published',
+            host=self.host,
+            category=self.category,
+            location=self.location,
+            price_per_night=100,
+            slug=title.lower().replace(' ', '-')
+        )
+
+    def search(self, query):
+        return list(ListingSearchService({'q': query}).search())
+
+    def test_results_are_ranked_title_first(self):
+        self.assertEqual(self.search('pools'), [self.villa, self.loft])
+        self.assertEqual(self.search('pool loft'), [self.loft])
+        self.assertEqual(self.search('sauna'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.cabin.title = 'Forest cabin with pool'
+        self.cabin.save()
+        self.assertIn(self.cabin, self.search('pool'))
+
+        self.villa.delete()
+        self.assertEqual(self.search('garden'), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('pool" OR cabin*'), [])
+        # A query without words does not filter at all
+        self.assertEqual(len(self.search('***')), 3)
+
+    def test_view_returns_highlighted_page(self):
+        request = APIRequestFactory().get('/api/search/', {'q': 'pool'})
+        response = SearchListingsView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        first = response.data['results'][0]
+        self.assertEqual(first['highlights']['title'], '<mark>Pool</mark> villa')
+        self.assertIn('search_rank', first)
+
+    def test_rebuild_command_restores_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Inspects the SQLite FTS table')
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM listings_listing_fts')
+        self.assertEqual(self.search('pool'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('pool'), [self.villa, self.loft])
+
+    def test_highlight_snippets_long_text(self):
+        text = 'word ' * 100 + 'the pool <b>' + ' word' * 100
+        snippet = highlight(text, ['pool'], max_length=60)
+
+        self.assertTrue(snippet.startswith('…') and snippet.endswith('…'))
+        self.assertIn('<mark>pool</mark> &lt;b&gt;', snippet)
@@ -0,0 +1,91 @@
+# tests/test_geo_search.py
+
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory
+from listings.models import Category, Location, Listing
+from listings.services.geo_service import cover, encode, haversine_km
+from listings.services.search_service import ListingSearchService, SearchParamsError
+from listings.views import SearchListingsView
+
+class GeoSearchTestCase(TestCase):
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password='testpass123')
+        self.category = Category.objects.create(name='City', slug='city')
+        self.bole = self.create_listing('bole', 8.9806, 38.7578)
+        self.piazza = self.create_listing('piazza', 9.0380, 38.7520)
+        self.adama = self.create_listing('adama', 8.5400, 39.2700)
+        self.fiji = self.create_listing('fiji', -16.5, 179.9)
+        self.samoa = self.create_listing('samoa', -16.0, -179.9)
+
+    def create_listing(self, name, latitude, longitude):
+        location = Location.objects.create(
+            name=name, city=name, state='State', country='Country',
+            latitude=latitude, longitude=longitude
+        )
+        return Listing.objects.create(
+            title=name.title(),
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.host,
+            category=self.category,
+            location=location,
+            price_per_night=100,
+            slug=name
+        )
+
+    def search(self, **params):
+        return list(ListingSearchService(params).search())
+
+    def test_geohash_is_kept_in_sync(self):
+        location = self.bole.location
+        self.assertEqual(location.geohash, encode(8.9806, 38.7578))
+
+        location.latitude, location.longitude = 9.0380, 38.7520
+        location.save(update_fields=['latitude', 'longitude'])
+        location.refresh_from_db()
+        self.assertEqual(location.geohash, encode(9.0380, 38.7520))
+
+    def test_radius_search_orders_by_exact_distance(self):
+        results = self.search(lat='9.0', lng='38.75', radius_km='10', sort='distance')
+
+        self.assertEqual(results, [self.bole, self.piazza])
+        self.assertAlmostEqual(results[0].distance_km, haversine_km(9.0, 38.75, 8.9806, 38.7578), places=3)
+        self.assertEqual(len(self.search(lat='9.0', lng='38.75', radius_km='100')), 3)
+
+    def test_searches_across_the_antimeridian(self):
+        self.assertEqual(
+            set(self.search(lat='-16.2', lng='180', radius_km='100')), {self.fiji, self.samoa}
+        )
+        self.assertEqual(set(self.search(bbox='-17,179,-15,-179')), {self.fiji, self.samoa})
+
+    def test_viewport_search(self):
+        self.assertEqual(set(self.search(bbox='8.9,38.7,9.1,38.8')), {self.bole, self.piazza})
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'lat': '9'}, {'lat': '91', 'lng': '0'}, {'bbox': '1,2,3'},
+                       {'sort': 'distance'}, {'lat': '9', 'lng': '38', 'radius_km': '0'}):
+            with self.assertRaises(SearchParamsError):
+                ListingSearchService(params)
+
+    def test_cover_prunes_to_few_ranges(self):
+        ranges = cover(8.98, 38.69, 9.07, 38.78)
+        self.assertLessEqual(len(ranges), 16)
+        geohash = encode(9.0, 38.75)
+        self.assertTrue(any(start <= geohash and (end is None or geohash < end) for start, end in ranges))
+
+    def test_backfill_command_sets_missing_geohashes(self):
+        Location.objects.update(geohash='')
+        call_command('backfill_geohash', stdout=StringIO())
+        self.assertEqual(Location.objects.get(pk=self.adama.location_id).geohash, encode(8.54, 39.27))
+
+    def test_view_returns_distance(self):
+        request = APIRequestFactory().get('/api/search/', {'lat': '9.0', 'lng': '38.75', 'sort': 'distance'})
+        response = SearchListingsView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertLess(response.data['results'][0]['distance_km'], 3)
@@ -0,0 +1,97 @@
+# tests/test_keyset_pagination.py
+
+import base64
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from listings.models import Booking, Category, Favorite, Location, Listing
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.host = User.objects.create_user(username='host', password='testpass123')
+        self.category = Category.objects.create(name='City', slug='city')
+        self.location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        now = timezone.now()
+        for index in range(25):
+            listing = Listing.objects.create(
+                title=f'Listing {index}',
+                description='A nice place',
+                listing_type='apartment',
+                status='published',
+                host=self.host,
+                category=self.category,
+                location=self.location,
+                price_per_night=100,
+                slug=f'listing-{index}'
+            )
+            # Groups of five share a timestamp, so the pk has to break ties
+            Listing.objects.filter(pk=listing.pk).update(created_at=now - timedelta(minutes=index // 5))
+        self.expected = list(Listing.objects.order_by('-created_at', '-pk').values_list('slug', flat=True))
+
+    def walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url = response.data['next']
+        return pages
+
+    def test_forward_and_backward_walks_are_stable(self):
+        pages = self.walk(reverse('listings:listing-list') + '?page_size=10')
+
+        self.assertEqual([len(page['results']) for page in pages], [10, 10, 5])
+        self.assertEqual([item['slug'] for page in pages for item in page['results']], self.expected)
+        self.assertEqual(pages[0]['count'], 25)
+        self.assertIsNone(pages[0]['previous'])
+
+        previous = self.client.get(pages[2]['previous']).data
+        self.assertEqual([item['slug'] for item in previous['results']], self.expected[10:20])
+        first = self.client.get(previous['previous']).data
+        self.assertEqual([item['slug'] for item in first['results']], self.expected[:10])
+        self.assertIsNone(first['previous'])
+
+    def test_deep_pages_use_a_range_instead_of_offset(self):
+        url = reverse('listings:listing-list') + '?page_size=5&count=false'
+        second_page = self.client.get(url).data['next']
+        last_page = self.walk(url)[-1]
+
+        self.assertNotIn('count', last_page)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(second_page)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(reverse('listings:listing-list') + '?cursor=bogus')
+        self.assertEqual(response.status_code, 404)
+
+        bad_pk = base64.urlsafe_b64encode(b'{"c":"2030-01-01T00:00:00+00:00","p":"garbage"}').decode()
+        for name in ('listings:listing-list', 'listings:review-list'):
+            self.assertEqual(self.client.get(reverse(name), {'cursor': bad_pk}).status_code, 404)
+
+    def test_my_endpoints_are_scoped_to_the_user(self):
+        guest = User.objects.create_user(username='guest', password='testpass123')
+        listing = Listing.objects.get(slug='listing-0')
+        Booking.objects.create(
+            listing=listing, user=guest, check_in_date='2030-01-01', check_out_date='2030-01-03',
+            guests=1, total_price=200
+        )
+        self.client.force_authenticate(guest)
+
+        self.assertEqual(self.client.get(reverse('listings:my-bookings')).data['count'], 1)
+        self.assertEqual(self.client.get(reverse('listings:my-listings')).data['count'], 0)
+
+        toggle = reverse('listings:toggle-favorite', kwargs={'listing_id': listing.pk})
+        self.assertEqual(self.client.post(toggle).status_code, 201)
+        favorites = self.client.get(reverse('listings:my-favorites')).data
+        self.assertEqual(favorites['results'][0]['listing']['slug'], 'listing-0')
+
+        self.assertFalse(self.client.post(toggle).data['is_favorited'])
+        self.assertFalse(Favorite.objects.exists())
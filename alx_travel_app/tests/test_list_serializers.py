@@ -0,0 +1,59 @@
+# tests/test_list_serializers.py
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient, APIRequestFactory
+from listings.models import Booking, Category, Location, Listing
+from listings.serializers import (
+    BookingListSerializer, BookingSerializer, ListingListSerializer, ListingSerializer
+)
+
+class ListSerializerTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.host = User.objects.create_user(username='host', password='testpass123')
+        self.category = Category.objects.create(name='City', slug='city')
+        self.location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.listing = Listing.objects.create(
+            title='Loft',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.host,
+            category=self.category,
+            location=self.location,
+            price_per_night='123.50',
+            slug='loft',
+            main_image='listings/loft.jpg'
+        )
+        self.booking = Booking.objects.create(
+            listing=self.listing, user=self.host, check_in_date='2030-01-01',
+            check_out_date='2030-01-03', guests=2, total_price='247.00'
+        )
+
+    def assertMatchesFullSerializer(self, compact_class, full_class, instance):
+        context = {'request': APIRequestFactory().get('/')}
+        rows = compact_class.rows(type(instance).objects.filter(pk=instance.pk))
+        compact = compact_class(rows, many=True, context=context).data[0]
+        full = full_class(instance, context=context).data
+
+        self.assertEqual(set(compact), set(compact_class.Meta.fields))
+        self.assertEqual(compact, {name: full[name] for name in compact})
+
+    def test_compact_rows_render_like_the_full_serializer(self):
+        self.assertMatchesFullSerializer(ListingListSerializer, ListingSerializer, self.listing)
+        self.assertMatchesFullSerializer(BookingListSerializer, BookingSerializer, self.booking)
+
+    def test_list_is_compact_and_detail_is_full(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('listings:listing-list') + '?count=false')
+        self.assertEqual(len(queries), 1)
+        item = response.data['results'][0]
+        self.assertNotIn('description', item)
+        self.assertTrue(item['main_image'].endswith('/media/listings/loft.jpg'))
+
+        detail = self.client.get(reverse('listings:listing-detail', kwargs={'slug': 'loft'}))
+        self.assertEqual(detail.data['description'], 'A nice place')
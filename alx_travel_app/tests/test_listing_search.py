@@ -0,0 +1,66 @@
+# tests/test_listing_search.py
+
+from datetime import date
+from django.test import TestCase
+from django.contrib.auth.models import User
+from listings.models import Category, Location, Listing, Booking
+from listings.services.search_service import ListingSearchService, SearchParamsError
+
+class ListingSearchServiceTestCase(TestCase):
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', password='testpass123')
+        self.category = Category.objects.create(name='Beach', slug='beach')
+        self.paris = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.rome = Location.objects.create(name='Centro', city='Rome', state='Lazio', country='Italy')
+        self.booked = self.create_listing('Booked Flat', self.paris)
+        self.free = self.create_listing('Free Flat', self.paris)
+        self.elsewhere = self.create_listing('Roman Flat', self.rome)
+        Booking.objects.create(
+            listing=self.booked,
+            user=self.host,
+            check_in_date=date(2025, 1, 1),
+            check_out_date=date(2025, 1, 5),
+            guests=2,
+            total_price=400
+        )
+
+    def create_listing(self, title, location, **kwargs):
+        defaults = {
+            'title': title,
+            'description': 'A nice place',
+            'listing_type': 'apartment',
+            'status': 'published',
+            'host': self.host,
+            'category': self.category,
+            'location': location,
+            'price_per_night': 100,
+            'max_guests': 4,
+            'slug': title.lower().replace(' ', '-'),
+        }
+        defaults.update(kwargs)
+        return Listing.objects.create(**defaults)
+
+    def search(self, **params):
+        return set(ListingSearchService(params).search())
+
+    def test_overlapping_booking_excludes_listing(self):
+        results = self.search(city='Paris', check_in='2025-01-04', check_out='2025-01-06')
+        self.assertEqual(results, {self.free})
+
+    def test_checkout_day_is_bookable(self):
+        results = self.search(city='Paris', check_in='2025-01-05', check_out='2025-01-07')
+        self.assertEqual(results, {self.booked, self.free})
+
+    def test_cancelled_booking_does_not_block(self):
+        Booking.objects.filter(listing=self.booked).update(status='cancelled')
+        results = self.search(city='Paris', check_in='2025-01-02', check_out='2025-01-03')
+        self.assertEqual(results, {self.booked, self.free})
+
+    def test_guest_count_filter(self):
+        self.create_listing('Tiny Flat', self.paris, max_guests=1)
+        results = self.search(city='Paris', guests='3')
+        self.assertEqual(results, {self.booked, self.free})
+
+    def test_invalid_date_range(self):
+        with self.assertRaises(SearchParamsError):
+            ListingSearchService({'check_in': '2025-01-05', 'check_out': '2025-01-01'})
@@ -0,0 +1,140 @@
+# tests/test_outbox.py
+
+from datetime import date, timedelta
+from django.db import transaction
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from listings.models import Category, Location, Listing, OutboxMessage
+from listings.services.booking_service import BookingService
+from listings.services.outbox_service import Outbox, OutboxRelay
+from listings.tasks import send_booking_confirmation_email
+from unittest.mock import MagicMock, patch
+
+class OutboxTestCase(TestCase):
+    def setUp(self):
+        self.guest = User.objects.create_user(username='guest', email='guest@example.com', password='testpass123')
+        self.listing = Listing.objects.create(
+            title='Outbox Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=User.objects.create_user(username='host', password='testpass123'),
+            category=Category.objects.create(name='City', slug='city'),
+            location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+            price_per_night=100,
+            slug='outbox-flat'
+        )
+        self.check_in = date.today() + timedelta(days=10)
+
+    def book(self):
+        return BookingService.create_booking(
+            listing_id=self.listing.pk, user=self.guest, check_in_date=self.check_in,
+            check_out_date=self.check_in + timedelta(days=2), guests=1
+        )
+
+    def enqueue(self, count):
+        for index in range(count):
+            Outbox.enqueue(send_booking_confirmation_email.name, f'booking-{index}')
+
+    def test_booking_request_writes_outbox_message_without_publishing(self):
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        with patch('celery.app.task.Task.apply_async') as publish:
+            response = client.post(f'/api/listings/{self.listing.pk}/book/', {
+                'check_in_date': self.check_in,
+                'check_out_date': self.check_in + timedelta(days=2),
+                'guests': 1,
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        publish.assert_not_called()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.task, send_booking_confirmation_email.name)
+        self.assertEqual(message.args, [response.data['id']])
+        self.assertIsNone(message.dispatched_at)
+
+    def test_rollback_discards_outbox_message(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.book()
+                raise RuntimeError('rolled back')
+
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_relay_publishes_in_batches_and_marks_dispatched(self):
+        self.enqueue(5)
+        task = MagicMock()
+        with patch.object(OutboxRelay, 'resolve', return_value=task):
+            relay = OutboxRelay(batch_size=2)
+            self.assertEqual(relay.relay_batch(), 2)
+            self.assertEqual(relay.drain(), 3)
+
+        self.assertEqual(
+            [call.kwargs['args'][0] for call in task.apply_async.call_args_list],
+            [f'booking-{index}' for index in range(5)]
+        )
+        self.assertFalse(OutboxMessage.objects.filter(dispatched_at__isnull=True).exists())
+
+    def test_broker_failure_leaves_the_rest_pending(self):
+        self.enqueue(3)
+        task = MagicMock()
+        task.apply_async.side_effect = [None, ConnectionError('broker down')]
+        with patch.object(OutboxRelay, 'resolve', return_value=task):
+            self.assertEqual(OutboxRelay(batch_size=10).relay_batch(), 1)
+
+        failed = OutboxMessage.objects.filter(dispatched_at__isnull=True).first()
+        self.assertEqual(OutboxMessage.objects.filter(dispatched_at__isnull=True).count(), 2)
+        self.assertEqual(failed.attempts, 1)
+        self.assertEqual(failed.last_error, 'broker down')
+
+        task.apply_async.side_effect = None
+        with patch.object(OutboxRelay, 'resolve', return_value=task):
+            self.assertEqual(OutboxRelay(batch_size=10).drain(), 2)
+        failed.refresh_from_db()
+        self.assertEqual((failed.attempts, failed.last_error), (2, ''))
+
+    def test_tasks_resolve_on_the_project_celery_app(self):
+        import alx_travel_app
+        task = OutboxRelay.resolve(send_booking_confirmation_email.name)
+        self.assertIs(task.app, alx_travel_app.celery_app)
+
+    def test_unknown_task_is_dropped(self):
+        OutboxMessage.objects.create(task='listings.tasks.no_such_task', args=[])
+        self.enqueue(1)
+        with patch('celery.app.task.Task.apply_async') as publish:
+            self.assertEqual(OutboxRelay().drain(), 1)
+
+        publish.assert_called_once()
+        dropped = OutboxMessage.objects.get(task='listings.tasks.no_such_task')
+        self.assertIsNotNone(dropped.dispatched_at)
+        self.assertIn('Unknown task', dropped.last_error)
+
+    def test_stats_report_depth_lag_and_throughput(self):
+        self.enqueue(4)
+        now = timezone.now()
+        first, second, *_ = OutboxMessage.objects.all()
+        OutboxMessage.objects.filter(pk=first.pk).update(dispatched_at=now)
+        OutboxMessage.objects.filter(pk=second.pk).update(created_at=now - timedelta(seconds=90))
+
+        stats = OutboxRelay.stats(window=60)
+        self.assertEqual(stats['depth'], 3)
+        self.assertGreaterEqual(stats['lag_seconds'], 90)
+        self.assertEqual(stats['dispatched'], 1)
+
+        admin = User.objects.create_superuser(username='admin', password='testpass123')
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        self.assertEqual(client.get('/api/outbox/stats/').status_code, 403)
+        client.force_authenticate(admin)
+        self.assertEqual(client.get('/api/outbox/stats/').data['depth'], 3)
+
+    def test_prune_deletes_old_dispatched_messages(self):
+        self.enqueue(3)
+        old, recent, _ = OutboxMessage.objects.all()
+        OutboxMessage.objects.filter(pk=old.pk).update(dispatched_at=timezone.now() - timedelta(days=2))
+        OutboxMessage.objects.filter(pk=recent.pk).update(dispatched_at=timezone.now())
+
+        self.assertEqual(OutboxRelay(retention=86400).prune(), 1)
+        self.assertEqual(OutboxMessage.objects.count(), 2)
@@ -31,7 +31,7 @@ class PaymentIntegrationTestCase(TestCase):
         )
         self.client.force_authenticate(user=self.user)
 
-    @patch('listings.services.payment_service.requests.post')
+    @patch('listings.services.payment_service.requests.Session.post')
     def test_initiate_payment_success(self, mock_post):
         # Mock successful Chapa response
         mock_response = Mock()
@@ -56,7 +56,7 @@ class PaymentIntegrationTestCase(TestCase):
         self.assertIn('checkout_url', data)
         self.assertIn('transaction_id', data)
 
-    @patch('listings.services.payment_service.requests.get')
+    @patch('listings.services.payment_service.requests.Session.get')
     def test_verify_payment_success(self, mock_get):
         # Create payment record
         payment = Payment.objects.create(
@@ -0,0 +1,104 @@
+# tests/test_payment_query_budget.py
+
+from django.db import IntegrityError
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory, force_authenticate
+from listings.models import Category, Location, Listing, Booking, OutboxMessage, Payment
+from listings.tasks import send_payment_confirmation_email
+from listings.views import create_pending_payment, initiate_payment, verify_payment, payment_status
+from unittest.mock import patch
+
+class PaymentQueryBudgetTestCase(TestCase):
+    """Pin the number of queries each payment endpoint issues"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='testpass123')
+        listing = Listing.objects.create(
+            title='Budget Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.user,
+            category=Category.objects.create(name='City', slug='city'),
+            location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+            price_per_night=100,
+            slug='budget-flat'
+        )
+        self.booking = Booking.objects.create(
+            listing=listing,
+            user=self.user,
+            check_in_date='2025-08-01',
+            check_out_date='2025-08-03',
+            guests=1,
+            total_price=200
+        )
+
+    def call(self, view, request, **kwargs):
+        force_authenticate(request, user=self.user)
+        return view(request, **kwargs)
+
+    @patch('listings.views.ChapaPaymentService.initiate_payment', return_value={
+        'success': True,
+        'checkout_url': 'https://checkout.chapa.co/test',
+        'data': {'reference': 'chapa_ref_123'}
+    })
+    def test_initiate_payment(self, mock_initiate):
+        request = self.factory.post('/api/payments/initiate/', {'booking_id': self.booking.id}, format='json')
+        # booking + payment join, payment insert in a savepoint, transaction reference update
+        with self.assertNumQueries(5):
+            response = self.call(initiate_payment, request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Payment.objects.get(booking=self.booking).chapa_reference, 'chapa_ref_123')
+
+    def test_concurrent_initiation_is_rejected(self):
+        # A concurrent request inserted the payment between the lookup and the insert
+        request = self.factory.post('/api/payments/initiate/', {'booking_id': self.booking.id}, format='json')
+        unique = IntegrityError('UNIQUE constraint failed: listings_payment.booking_id')
+        with patch.object(Payment.objects, 'create', side_effect=unique):
+            response = self.call(initiate_payment, request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Payment already exists for this booking')
+
+        Payment.objects.create(booking=self.booking, amount=200)
+        self.assertIsNone(create_pending_payment(self.booking))
+        self.assertEqual(Payment.objects.filter(booking=self.booking).count(), 1)
+
+    @patch('listings.views.ChapaPaymentService.verify_payment', return_value={
+        'success': True,
+        'data': {'status': 'success', 'method': 'card'}
+    })
+    def test_verify_pending_payment(self, mock_verify):
+        payment = Payment.objects.create(booking=self.booking, transaction_id='tx_budget', amount=200)
+        request = self.factory.get('/api/payments/verify/tx_budget/')
+        # payment + booking owner join, then status update and outbox
+        # insert in one transaction (a savepoint pair inside the test case)
+        with self.assertNumQueries(5):
+            response = self.call(verify_payment, request, transaction_id='tx_budget')
+
+        self.assertEqual(response.status_code, 200)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.task, send_payment_confirmation_email.name)
+        self.assertEqual(message.args, [str(payment.id)])
+
+    @patch('listings.views.ChapaPaymentService.verify_payment')
+    def test_verify_completed_payment(self, mock_verify):
+        Payment.objects.create(booking=self.booking, transaction_id='tx_done', amount=200, status='completed')
+        request = self.factory.get('/api/payments/verify/tx_done/')
+        with self.assertNumQueries(1):
+            response = self.call(verify_payment, request, transaction_id='tx_done')
+
+        self.assertEqual(response.status_code, 200)
+        mock_verify.assert_not_called()
+
+    def test_payment_status(self):
+        payment = Payment.objects.create(booking=self.booking, transaction_id='tx_status', amount=200)
+        request = self.factory.get(f'/api/payments/status/{payment.id}/')
+        with self.assertNumQueries(1):
+            response = self.call(payment_status, request, payment_id=payment.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'pending')
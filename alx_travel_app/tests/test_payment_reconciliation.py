@@ -0,0 +1,65 @@
+# tests/test_payment_reconciliation.py
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from listings.models import Category, Location, Listing, Booking, OutboxMessage, Payment
+from listings.services.reconciliation_service import PaymentReconciler
+from unittest.mock import patch
+
+CHAPA_STATUSES = {
+    'tx_paid': 'success',
+    'tx_declined': 'failed',
+    'tx_open': 'pending',
+}
+
+def fake_verify(self, tx_ref):
+    if tx_ref not in CHAPA_STATUSES:
+        return {'success': False, 'error': 'Transaction not found'}
+    return {'success': True, 'data': {'status': CHAPA_STATUSES[tx_ref], 'method': 'card'}}
+
+@patch('listings.services.reconciliation_service.ChapaPaymentService.verify_payment', fake_verify)
+class PaymentReconcilerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='testpass123')
+        self.listing = Listing.objects.create(
+            title='Reconciled Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.user,
+            category=Category.objects.create(name='City', slug='city'),
+            location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+            price_per_night=100,
+            slug='reconciled-flat'
+        )
+        for day, tx_ref in enumerate(['tx_paid', 'tx_declined', 'tx_open', 'tx_unknown'], start=1):
+            booking = Booking.objects.create(
+                listing=self.listing,
+                user=self.user,
+                check_in_date=f'2025-07-{day:02d}',
+                check_out_date=f'2025-07-{day + 1:02d}',
+                guests=1,
+                total_price=100
+            )
+            Payment.objects.create(booking=booking, transaction_id=tx_ref, amount=100, status='pending')
+
+    def status_of(self, tx_ref):
+        return Payment.objects.get(transaction_id=tx_ref).status
+
+    def test_settles_pending_payments_in_batches(self):
+        stats = PaymentReconciler(batch_size=3, concurrency=2, min_age=0).run()
+
+        self.assertEqual(stats, {'checked': 4, 'completed': 1, 'failed': 1, 'cancelled': 0})
+        self.assertEqual(self.status_of('tx_paid'), 'completed')
+        self.assertEqual(self.status_of('tx_declined'), 'failed')
+        self.assertEqual(self.status_of('tx_open'), 'pending')
+        self.assertEqual(self.status_of('tx_unknown'), 'pending')
+        self.assertEqual(Payment.objects.get(transaction_id='tx_paid').payment_method, 'card')
+        self.assertEqual(OutboxMessage.objects.get().args, [str(Payment.objects.get(transaction_id='tx_paid').pk)])
+
+    def test_skips_recent_payments(self):
+        stats = PaymentReconciler(min_age=3600).run()
+
+        self.assertEqual(stats['checked'], 0)
+        self.assertEqual(self.status_of('tx_paid'), 'pending')
+        self.assertFalse(OutboxMessage.objects.exists())
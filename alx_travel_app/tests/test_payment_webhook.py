@@ -0,0 +1,107 @@
+# tests/test_payment_webhook.py
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory
+from listings.models import Category, Location, Listing, Booking, OutboxMessage, Payment, PaymentWebhookEvent
+from listings.services.webhook_service import PaymentWebhookService, WebhookVerificationError
+from listings.tasks import process_payment_webhook, send_payment_confirmation_email
+from listings.views import complete_payment, payment_callback
+from unittest.mock import patch
+
+@patch('listings.services.webhook_service.ChapaPaymentService.verify_payment',
+       return_value={'success': True, 'data': {'status': 'success', 'method': 'telebirr'}})
+class PaymentWebhookTestCase(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        user = User.objects.create_user(username='guest', email='guest@example.com', password='testpass123')
+        listing = Listing.objects.create(
+            title='Webhook Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=user,
+            category=Category.objects.create(name='City', slug='city'),
+            location=Location.objects.create(name='Centre', city='Paris', state='IDF', country='France'),
+            price_per_night=100,
+            slug='webhook-flat'
+        )
+        booking = Booking.objects.create(
+            listing=listing,
+            user=user,
+            check_in_date='2025-08-01',
+            check_out_date='2025-08-03',
+            guests=1,
+            total_price=200
+        )
+        self.payment = Payment.objects.create(booking=booking, transaction_id='tx_hook', amount=200)
+
+    def deliver(self, payload):
+        request = self.factory.post('/api/payments/callback/', payload, format='json')
+        return payment_callback(request)
+
+    def test_duplicate_deliveries_are_recorded_once(self, mock_verify):
+        payload = {'event': 'charge.success', 'tx_ref': 'tx_hook', 'status': 'success'}
+        responses = [self.deliver(payload) for _ in range(3)]
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200])
+        self.assertEqual(PaymentWebhookEvent.objects.count(), 1)
+        self.assertEqual(
+            list(OutboxMessage.objects.values_list('task', flat=True)), [process_payment_webhook.name]
+        )
+        mock_verify.assert_not_called()
+
+    def test_payload_strings_cannot_bypass_deduplication(self, mock_verify):
+        variants = [
+            {'event': 'charge.success', 'tx_ref': 'tx_hook'},
+            {'event': ' Charge.SUCCESS', 'tx_ref': 'tx_hook'},
+            {'status': 'success', 'tx_ref': 'tx_hook'},
+            {'event': 'charge.whatever', 'tx_ref': 'tx_hook'},
+            {'event': 'charge.whatever-2', 'tx_ref': 'tx_hook'},
+            {'status': 'x' * 500, 'tx_ref': 'tx_hook'},
+        ]
+        for payload in variants:
+            PaymentWebhookService.record(payload)
+
+        self.assertEqual(
+            sorted(PaymentWebhookEvent.objects.values_list('event', flat=True)),
+            ['charge.pending', 'charge.success']
+        )
+
+    def test_unsettled_event_is_left_for_a_retry(self, mock_verify):
+        event, _ = PaymentWebhookService.record({'event': 'charge.success', 'tx_ref': 'tx_hook'})
+        mock_verify.return_value = {'success': True, 'data': {'status': 'pending'}}
+        with self.assertRaises(WebhookVerificationError):
+            PaymentWebhookService.process(event.id)
+        event.refresh_from_db()
+        self.assertIsNone(event.processed_at)
+
+        mock_verify.return_value = {'success': True, 'data': {'status': 'success', 'method': 'telebirr'}}
+        self.assertEqual(PaymentWebhookService.process(event.id), self.payment)
+
+    def test_processing_settles_payment_once(self, mock_verify):
+        first, _ = PaymentWebhookService.record({'event': 'charge.success', 'tx_ref': 'tx_hook'})
+        second, _ = PaymentWebhookService.record({'status': 'failed', 'tx_ref': 'tx_hook'})
+
+        self.assertEqual(PaymentWebhookService.process(first.id), self.payment)
+        self.assertIsNone(PaymentWebhookService.process(second.id))
+        self.assertIsNone(PaymentWebhookService.process(first.id))
+
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'completed')
+        self.assertEqual(self.payment.payment_method, 'telebirr')
+        self.assertEqual(
+            OutboxMessage.objects.filter(task=send_payment_confirmation_email.name).count(), 1
+        )
+
+    def test_verify_racing_the_webhook_queues_one_email(self, mock_verify):
+        # The verify view loaded the payment while it was still pending
+        stale = Payment.objects.get(pk=self.payment.pk)
+        event, _ = PaymentWebhookService.record({'event': 'charge.success', 'tx_ref': 'tx_hook'})
+        PaymentWebhookService.process(event.id)
+
+        self.assertFalse(complete_payment(stale, 'telebirr'))
+        self.assertFalse(complete_payment(stale, 'telebirr'))
+        self.assertEqual(
+            OutboxMessage.objects.filter(task=send_payment_confirmation_email.name).count(), 1
+        )
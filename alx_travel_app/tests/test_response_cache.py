@@ -0,0 +1,108 @@
+# tests/test_response_cache.py
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient, APIRequestFactory
+from listings.models import Category, Location, Listing
+from listings.views import CategoryViewSet, ListingViewSet
+from listings.services.view_counter import MemoryViewBuffer
+from unittest.mock import patch
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ResponseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Buffer view counts so cached reads stay query-free
+        buffered = patch('listings.services.view_counter.get_buffer', return_value=MemoryViewBuffer())
+        buffered.start()
+        self.addCleanup(buffered.stop)
+        self.factory = APIRequestFactory()
+        self.retrieve_listing = ListingViewSet.as_view({'get': 'retrieve'})
+        self.retrieve_category = CategoryViewSet.as_view({'get': 'retrieve'})
+        self.category = Category.objects.create(name='City', slug='city')
+        self.location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.listing = Listing.objects.create(
+            title='Cached Flat',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=User.objects.create_user(username='host', password='testpass123'),
+            category=self.category,
+            location=self.location,
+            price_per_night=100,
+            slug='cached-flat'
+        )
+
+    def get_listing(self, slug='cached-flat', **headers):
+        request = self.factory.get(f'/api/listings/{slug}/', **headers)
+        return self.retrieve_listing(request, slug=slug)
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.get_listing()
+        with self.assertNumQueries(0):
+            second = self.get_listing()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(first.data['location']['city'], 'Paris')
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.get_listing()['ETag']
+        response = self.get_listing(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.get_listing(HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_listing_save_invalidates(self):
+        etag = self.get_listing()['ETag']
+        self.listing.price_per_night = 120
+        self.listing.save()
+
+        response = self.get_listing(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['price_per_night'], '120.00')
+
+    def test_location_save_invalidates_its_listings(self):
+        self.get_listing()
+        self.location.city = 'Lyon'
+        self.location.save()
+
+        self.assertEqual(self.get_listing().data['location']['city'], 'Lyon')
+
+    def test_category_save_invalidates_itself_and_its_listings(self):
+        request = self.factory.get('/api/categories/city/')
+        self.retrieve_category(request, slug='city')
+        self.get_listing()
+        self.category.description = 'Urban stays'
+        self.category.save()
+
+        self.assertEqual(self.retrieve_category(request, slug='city').data['description'], 'Urban stays')
+        self.assertEqual(self.get_listing().data['category']['description'], 'Urban stays')
+
+    def test_slug_change_and_delete_invalidate(self):
+        self.get_listing()
+        self.listing.slug = 'renamed-flat'
+        self.listing.save()
+
+        self.assertEqual(self.get_listing().status_code, 404)
+        self.assertEqual(self.get_listing('renamed-flat').status_code, 200)
+
+        self.listing.delete()
+        self.assertEqual(self.get_listing('renamed-flat').status_code, 404)
+
+    def test_only_staff_can_change_categories_and_locations(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='guest', password='testpass123'))
+        self.assertEqual(client.get('/api/categories/city/').status_code, 200)
+        self.assertEqual(client.delete('/api/categories/city/').status_code, 403)
+        self.assertEqual(client.delete(f'/api/locations/{self.location.pk}/').status_code, 403)
+        self.assertEqual(client.post('/api/categories/', {'name': 'Beach', 'slug': 'beach'}).status_code, 403)
+        self.assertTrue(Listing.objects.filter(pk=self.listing.pk).exists())
+
+        client.force_authenticate(User.objects.create_superuser(username='admin', password='testpass123'))
+        self.assertEqual(client.post('/api/categories/', {'name': 'Beach', 'slug': 'beach'}).status_code, 201)
@@ -0,0 +1,101 @@
+# tests/test_review_stats.py
+
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from listings.models import Category, Location, Listing, Review
+from listings.services.search_service import ListingSearchService, SearchParamsError
+
+class ReviewStatsTestCase(TestCase):
+    def setUp(self):
+        host = User.objects.create_user(username='host', password='testpass123')
+        self.guests = [User.objects.create_user(username=f'guest{index}') for index in range(3)]
+        category = Category.objects.create(name='City', slug='city')
+        location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.flat, self.loft = [
+            Listing.objects.create(
+                title=title,
+                description='A nice place',
+                listing_type='apartment',
+                status='published',
+                host=host,
+                category=category,
+                location=location,
+                price_per_night=100,
+                slug=title.lower()
+            )
+            for title in ('Flat', 'Loft')
+        ]
+
+    def review(self, listing, guest, rating):
+        return Review.objects.create(listing=listing, user=guest, rating=rating, title='Stay', content='Fine')
+
+    def test_create_update_delete_maintain_aggregates(self):
+        first = self.review(self.flat, self.guests[0], 5)
+        self.review(self.flat, self.guests[1], 4)
+        self.flat.refresh_from_db()
+        self.assertEqual((self.flat.review_count, self.flat.rating_sum), (2, 9))
+        self.assertEqual(self.flat.rating_average, Decimal('4.50'))
+        self.assertEqual(self.flat.get_rating_histogram(), {1: 0, 2: 0, 3: 0, 4: 1, 5: 1})
+
+        first.rating = 2
+        first.save()
+        self.flat.refresh_from_db()
+        self.assertEqual(self.flat.rating_average, Decimal('3.00'))
+        self.assertEqual(self.flat.get_rating_histogram(), {1: 0, 2: 1, 3: 0, 4: 1, 5: 0})
+
+        first.listing = self.loft
+        first.save()
+        first.delete()
+        self.flat.refresh_from_db()
+        self.loft.refresh_from_db()
+        self.assertEqual((self.flat.review_count, self.flat.rating_average), (1, Decimal('4.00')))
+        self.assertEqual((self.loft.review_count, self.loft.rating_sum, self.loft.rating_2_count), (0, 0, 0))
+
+    def test_review_writes_read_the_listing_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.review(self.flat, self.guests[0], 5)
+
+        listing_table = connection.ops.quote_name(Listing._meta.db_table)
+        reads = [query['sql'] for query in queries.captured_queries
+                 if query['sql'].startswith('SELECT') and f'FROM {listing_table}' in query['sql']]
+        self.assertEqual(len(reads), 1)
+        self.flat.refresh_from_db()
+        self.assertEqual((self.flat.review_count, self.flat.rating_5_count), (1, 1))
+
+    def test_rebuild_command_repairs_drift(self):
+        self.review(self.flat, self.guests[0], 3)
+        self.review(self.flat, self.guests[1], 4)
+        Listing.objects.filter(pk=self.flat.pk).update(review_count=7, rating_sum=1, rating_3_count=0)
+        Listing.objects.filter(pk=self.loft.pk).update(review_count=2)
+
+        call_command('rebuild_review_stats', stdout=StringIO())
+        self.flat.refresh_from_db()
+        self.loft.refresh_from_db()
+        self.assertEqual((self.flat.review_count, self.flat.rating_sum, self.flat.rating_3_count), (2, 7, 1))
+        self.assertEqual(self.flat.rating_average, Decimal('3.50'))
+        self.assertEqual(self.loft.review_count, 0)
+
+    def test_search_filters_and_sorts_on_stored_rating(self):
+        self.review(self.flat, self.guests[0], 3)
+        self.review(self.loft, self.guests[0], 5)
+        self.review(self.loft, self.guests[1], 4)
+
+        with CaptureQueriesContext(connection) as queries:
+            by_rating = list(ListingSearchService({'sort': 'rating'}).search())
+            rated = list(ListingSearchService({'min_rating': '4'}).search())
+
+        self.assertEqual(by_rating, [self.loft, self.flat])
+        self.assertEqual(rated, [self.loft])
+        self.assertFalse(any('listings_review' in query['sql'] for query in queries.captured_queries))
+
+        for invalid in ('6', 'nan', 'sNaN', 'Infinity'):
+            with self.assertRaises(SearchParamsError):
+                ListingSearchService({'min_rating': invalid})
+        self.assertEqual(self.client.get('/api/search/', {'min_rating': 'nan'}).status_code, 400)
+        with self.assertRaises(SearchParamsError):
+            ListingSearchService({'sort': 'views'})
@@ -0,0 +1,94 @@
+# tests/test_seed.py
+
+from datetime import date
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+from django.test import TestCase
+from django.contrib.auth.models import User
+from listings.models import Booking, CalendarNight, Favorite, Listing, Review
+from listings.services.availability_service import AvailabilityCalendar
+from listings.services.seed_service import BulkSeeder
+
+class FastSeedTestCase(TestCase):
+    def seed(self, **options):
+        call_command(
+            'seed', fast=True, users=30, listings=60, reviews=150, bookings=200,
+            batch_size=7, stdout=StringIO(), **options
+        )
+
+    def test_fast_seed_inserts_consistent_rows(self):
+        self.seed()
+
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Listing.objects.count(), 60)
+        self.assertGreater(Review.objects.count(), 0)
+        self.assertGreater(Booking.objects.count(), 0)
+        self.assertFalse(Review.objects.filter(user=F('listing__host')).exists())
+        self.assertFalse(Booking.objects.filter(user=F('listing__host')).exists())
+        self.assertFalse(Favorite.objects.filter(user=F('listing__host')).exists())
+
+        users = list(User.objects.all())
+        self.assertEqual(len({user.password for user in users}), 1)
+        self.assertTrue(users[0].check_password('testpass123'))
+
+        listing = Listing.objects.exclude(amenities='').first()
+        self.assertEqual(listing.amenity_flags, Listing.amenity_mask(listing.get_amenities_list()))
+
+    def test_bookings_do_not_overlap_and_derived_data_is_rebuilt(self):
+        self.seed()
+
+        nights = {}
+        for booking in Booking.objects.all():
+            for night in AvailabilityCalendar.nights(booking.check_in_date, booking.check_out_date):
+                self.assertNotIn((booking.listing_id, night), nights)
+                nights[(booking.listing_id, night)] = booking.status
+        active = sum(1 for status in nights.values() if status in Booking.ACTIVE_STATUSES)
+        self.assertEqual(CalendarNight.objects.count(), active)
+
+        for listing in Listing.objects.filter(review_count__gt=0)[:5]:
+            self.assertEqual(listing.review_count, listing.reviews.count())
+
+    def test_timestamps_are_spread_and_follow_the_listing(self):
+        self.seed()
+
+        self.assertEqual(Listing.objects.values('created_at').distinct().count(), 60)
+        self.assertGreater(Booking.objects.values('created_at').distinct().count(), 1)
+        self.assertFalse(Listing.objects.filter(updated_at__lt=F('created_at')).exists())
+        self.assertFalse(Review.objects.filter(created_at__lt=F('listing__created_at')).exists())
+        self.assertFalse(Favorite.objects.filter(created_at__lt=F('listing__created_at')).exists())
+        self.assertFalse(
+            Booking.objects.filter(created_at__lt=F('listing__created_at'), check_in_date__gt=date.today()).exists()
+        )
+
+    def test_fast_seed_adds_to_existing_data(self):
+        self.seed()
+        self.seed()
+
+        self.assertEqual(User.objects.count(), 60)
+        self.assertEqual(Listing.objects.values('slug').distinct().count(), 120)
+
+    def snapshot(self):
+        return (
+            sorted(Review.objects.values_list('listing__slug', 'user__username', 'rating', 'title')),
+            sorted(Booking.objects.values_list('id', 'listing__slug', 'user__username', 'check_in_date', 'status')),
+            sorted(Favorite.objects.values_list('listing__slug', 'user__username')),
+            sorted(Listing.objects.values_list('id', 'slug', 'review_count', 'rating_sum')),
+            CalendarNight.objects.count(),
+        )
+
+    @mock.patch.object(BulkSeeder, 'PARTITION_ROWS', 20)
+    def test_workers_produce_the_same_rows(self):
+        self.seed()
+        single = self.snapshot()
+        Listing.objects.all().delete()
+        User.objects.all().delete()
+
+        self.seed(workers=2)
+        self.assertEqual(self.snapshot(), single)
+
+    def test_workers_require_fast_mode(self):
+        with self.assertRaises(CommandError):
+            call_command('seed', workers=2, stdout=StringIO())
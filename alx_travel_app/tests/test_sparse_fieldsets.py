@@ -0,0 +1,97 @@
+# tests/test_sparse_fieldsets.py
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from listings.models import Booking, Category, Location, Listing
+from listings.services.view_counter import MemoryViewBuffer
+from unittest.mock import patch
+
+class SparseFieldsetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Buffer view counts so cached reads stay query-free
+        buffered = patch('listings.services.view_counter.get_buffer', return_value=MemoryViewBuffer())
+        buffered.start()
+        self.addCleanup(buffered.stop)
+        self.client = APIClient()
+        self.host = User.objects.create_user(username='host', password='testpass123', email='host@example.com')
+        self.category = Category.objects.create(name='City', slug='city')
+        self.location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.listing = Listing.objects.create(
+            title='Loft',
+            description='A nice place',
+            listing_type='apartment',
+            status='published',
+            host=self.host,
+            category=self.category,
+            location=self.location,
+            price_per_night=100,
+            slug='loft'
+        )
+        self.list_url = reverse('listings:listing-list')
+        self.detail_url = reverse('listings:listing-detail', kwargs={'slug': 'loft'})
+
+    def test_list_reads_only_requested_columns_and_joins(self):
+        params = {'fields': 'title,price_per_night', 'include': 'location,category,host', 'count': 'false'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, params)
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('description', queries[0]['sql'])
+        item = response.data['results'][0]
+        self.assertEqual(set(item), {'id', 'title', 'price_per_night', 'location', 'category', 'host'})
+        self.assertEqual(item['location']['city'], 'Paris')
+        self.assertEqual(item['category']['slug'], 'city')
+        self.assertEqual(item['host'], {'id': self.host.id, 'username': 'host', 'first_name': '', 'last_name': ''})
+
+    def test_detail_variants_are_cached_separately_and_invalidated_together(self):
+        full = self.client.get(self.detail_url)
+        sparse = self.client.get(self.detail_url, {'fields': 'title', 'include': 'host'})
+
+        self.assertIn('description', full.data)
+        self.assertEqual(set(sparse.data), {'id', 'title', 'host'})
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+
+        with self.assertNumQueries(0):
+            self.client.get(self.detail_url, {'fields': 'title', 'include': 'host'})
+
+        self.host.username = 'renamed'
+        self.host.save()
+        sparse = self.client.get(self.detail_url, {'fields': 'title', 'include': 'host'})
+        self.assertEqual(sparse.data['host']['username'], 'renamed')
+
+    def test_unknown_fields_are_rejected(self):
+        self.assertEqual(self.client.get(self.list_url, {'fields': 'password'}).status_code, 400)
+        self.assertEqual(self.client.get(self.list_url, {'include': 'bookings'}).status_code, 400)
+
+    def test_bookings_embed_listing_and_user(self):
+        Booking.objects.create(
+            listing=self.listing, user=self.host, check_in_date='2030-01-01',
+            check_out_date='2030-01-03', guests=2, total_price=200
+        )
+        self.client.force_authenticate(self.host)
+        response = self.client.get(reverse('listings:my-bookings'), {'include': 'listing,user'})
+
+        item = response.data['results'][0]
+        self.assertEqual(item['listing']['slug'], 'loft')
+        self.assertEqual(item['user']['username'], 'host')
+        self.assertNotIn('email', item['user'])
+
+    def test_booking_list_is_private(self):
+        Booking.objects.create(
+            listing=self.listing, user=self.host, check_in_date='2030-01-01',
+            check_out_date='2030-01-03', guests=2, total_price=200
+        )
+        url = reverse('listings:booking-list')
+        self.assertIn(self.client.get(url, {'include': 'user'}).status_code, (401, 403))
+
+        self.client.force_authenticate(User.objects.create_user(username='other', password='testpass123'))
+        self.assertEqual(self.client.get(url, {'include': 'user'}).data['results'], [])
+
+        self.client.force_authenticate(self.host)
+        self.assertEqual(self.client.get(url, {'include': 'user'}).data['results'][0]['user']['username'], 'host')
@@ -0,0 +1,47 @@
+# tests/test_startup_profile.py
+
+import json
+from io import StringIO
+from unittest import skipUnless
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from listings.management.commands.profile_startup import package_totals, parse_importtime
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     rest_framework.settings
+import time:       300 |        420 |   rest_framework.views
+import time:        80 |        500 | rest_framework
+import time:        50 |         50 | yaml
+Some other warning on stderr
+"""
+
+class StartupProfileTestCase(SimpleTestCase):
+    def profile(self, api_docs):
+        out = StringIO()
+        call_command('profile_startup', '--api-docs', api_docs, '--json', stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_importtime_output_is_parsed_with_nesting(self):
+        imports = parse_importtime(IMPORTTIME)
+
+        self.assertEqual(imports[0], ('rest_framework.settings', 120, 120, 2))
+        self.assertEqual(imports[2], ('rest_framework', 80, 500, 0))
+        self.assertEqual(package_totals(imports), [('rest_framework', [500, 3]), ('yaml', [50, 1])])
+
+    def test_lean_start_does_not_import_doc_stacks(self):
+        lean = self.profile('off')
+        self.assertEqual(list(lean['phases']), ['settings', 'app registry', 'middleware', 'urls'])
+        self.assertEqual(lean['doc_stacks'], [])
+        self.assertNotIn('drf_spectacular', lean['packages'])
+        self.assertIn('listings', lean['packages'])
+
+        full = self.profile('on')
+        self.assertEqual(full['doc_stacks'], ['drf_yasg', 'drf_spectacular'])
+        self.assertGreater(full['module_count'], lean['module_count'])
+
+    @skipUnless(settings.API_DOCS, 'API docs are disabled')
+    def test_docs_are_routed_when_enabled(self):
+        self.assertEqual(reverse('schema-swagger-ui'), '/swagger/')
+        self.assertEqual(reverse('schema'), '/api/schema/')
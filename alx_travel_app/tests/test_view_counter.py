@@ -0,0 +1,100 @@
+# tests/test_view_counter.py
+
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory
+from listings.models import Category, Location, Listing
+from listings.services.view_counter import MemoryViewBuffer, ViewCounter
+from listings.views import ListingViewSet
+from unittest.mock import patch
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+class ViewCounterTestCase(TestCase):
+    def setUp(self):
+        host = User.objects.create_user(username='host', password='testpass123')
+        category = Category.objects.create(name='City', slug='city')
+        location = Location.objects.create(name='Centre', city='Paris', state='IDF', country='France')
+        self.listings = [
+            Listing.objects.create(
+                title=f'Flat {index}',
+                description='A nice place',
+                listing_type='apartment',
+                status='published',
+                host=host,
+                category=category,
+                location=location,
+                price_per_night=100,
+                slug=f'flat-{index}'
+            )
+            for index in range(3)
+        ]
+        self.counter = ViewCounter(buffer=MemoryViewBuffer(), batch_size=2)
+
+    def test_concurrent_views_are_not_lost(self):
+        listing = self.listings[0]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: self.counter.record(listing.pk), range(800)))
+
+        self.assertEqual(self.counter.live_count(listing), 800)
+        self.assertEqual(self.counter.flush(), 800)
+        listing.refresh_from_db()
+        self.assertEqual(listing.view_count, 800)
+        self.assertEqual(self.counter.pending(listing.pk), 0)
+
+    def test_flush_writes_each_batch_in_one_update(self):
+        for index, listing in enumerate(self.listings, start=1):
+            self.counter.record(listing.pk, count=index)
+
+        # Three listings in batches of two
+        with self.assertNumQueries(2):
+            self.assertEqual(self.counter.flush(), 6)
+        self.assertEqual(
+            list(Listing.objects.order_by('slug').values_list('view_count', flat=True)),
+            [1, 2, 3]
+        )
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_failed_flush_is_resumed(self):
+        listing = self.listings[0]
+        self.counter.record(listing.pk, count=5)
+        with patch('listings.services.view_counter.Listing.objects.filter', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.counter.flush()
+        self.counter.record(listing.pk, count=2)
+
+        self.assertEqual(self.counter.live_count(listing), 7)
+        self.assertEqual(self.counter.flush(), 5)
+        self.assertEqual(self.counter.flush(), 2)
+        listing.refresh_from_db()
+        self.assertEqual(listing.view_count, 7)
+
+    @override_settings(VIEW_COUNTER_REDIS_URL='')
+    def test_views_are_written_straight_away_without_redis(self):
+        listing = self.listings[0]
+        counter = ViewCounter()
+        self.assertIsNone(counter.buffer)
+
+        with self.assertNumQueries(1):
+            counter.record(listing.pk, count=2)
+        counter.record(listing.pk)
+
+        listing.refresh_from_db()
+        self.assertEqual(listing.view_count, 3)
+        self.assertEqual(counter.live_count(listing), 3)
+        self.assertEqual(counter.flush(), 0)
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_detail_reads_are_counted(self):
+        cache.clear()
+        factory = APIRequestFactory()
+        retrieve = ListingViewSet.as_view({'get': 'retrieve'})
+        views = ListingViewSet.as_view({'get': 'views'})
+        with patch('listings.views.ViewCounter', return_value=self.counter):
+            for _ in range(3):
+                retrieve(factory.get('/api/listings/flat-0/'), slug='flat-0')
+            response = views(factory.get('/api/listings/flat-0/views/'), slug='flat-0')
+
+        self.assertEqual(response.data['view_count'], 3)